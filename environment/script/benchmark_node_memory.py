@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import os.path
+import sys
+import tracemalloc
+import typing
+
+import docopt
+
+import adaptation_pathways as ap
+from adaptation_pathways.action import Action
+from adaptation_pathways.graph.node import ActionBegin, ActionEnd
+
+
+class UnslottedNode:
+    """
+    Node laid out like the node classes were before they used ``__slots__`` and lazy labels:
+    attributes are stored in a ``__dict__`` and the label is formatted upon construction
+    """
+
+    def __init__(self, action: Action) -> None:
+        self._label = f"[{action.name}"
+        self._action = action
+
+
+def bytes_per_node(
+    create_node: typing.Callable[[Action], typing.Any], nr_nodes: int
+) -> float:
+    action = Action("some_action_with_a_long_name")
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    nodes = [create_node(action) for _ in range(nr_nodes)]
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Don't count the list holding on to the nodes
+    nr_bytes = sum(
+        statistic.size_diff
+        for statistic in snapshot_after.compare_to(snapshot_before, "lineno")
+    ) - sys.getsizeof(nodes)
+
+    return nr_bytes / nr_nodes
+
+
+def benchmark_node_memory(nr_nodes: int) -> None:
+    def create_labelled_node(action: Action) -> ActionBegin:
+        node = ActionBegin(action)
+        _ = node.label
+        return node
+
+    reference = bytes_per_node(UnslottedNode, nr_nodes)
+
+    print(f"{'node':<30}{'bytes / node':>15}{'reduction':>12}")
+
+    for name, create_node in [
+        ("unslotted, eager label", UnslottedNode),
+        ("ActionBegin", ActionBegin),
+        ("ActionBegin, label accessed", create_labelled_node),
+        ("ActionEnd", ActionEnd),
+    ]:
+        size = bytes_per_node(create_node, nr_nodes)
+        print(f"{name:<30}{size:>15.1f}{1 - size / reference:>12.0%}")
+
+
+def main() -> None:
+    command = os.path.basename(sys.argv[0])
+    usage = f"""\
+Measure the amount of memory used per node in a graph
+
+Usage:
+    {command} [--nr_nodes=<count>]
+
+Options:
+    -h --help           Show this screen and exit
+    --version           Show version and exit
+    --nr_nodes=<count>  Number of nodes to create [default: 1000000]
+"""
+    arguments = sys.argv[1:]
+    arguments = docopt.docopt(usage, arguments, version=ap.__version__)
+
+    benchmark_node_memory(int(arguments["--nr_nodes"]))
+
+
+if __name__ == "__main__":
+    main()
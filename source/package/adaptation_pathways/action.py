@@ -19,6 +19,8 @@ class Action:
     set of pathways, and each instance has to be related to a likely different tipping point.
     """
 
+    __slots__ = ("_name",)
+
     _name: str
 
     def __init__(self, name: str) -> None:
@@ -16,6 +16,8 @@ class ActionCombination(Action):
     :param actions: Collection of at least two actions combined.
     """
 
+    __slots__ = ("_actions",)
+
     _actions: list[Action]
 
     def __init__(self, name: str, actions: list[Action]) -> None:
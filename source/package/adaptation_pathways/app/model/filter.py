@@ -1,8 +1,8 @@
 import dataclasses
 
-from action import Action
-from comparisons import NumberComparison, SequenceComparison
-from metric import Metric
+from .action import Action
+from .comparisons import NumberComparison, SequenceComparison
+from .metric import Metric
 
 
 @dataclasses.dataclass
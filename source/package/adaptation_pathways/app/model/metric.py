@@ -1,7 +1,10 @@
 # pylint: disable=too-many-return-statements
 import dataclasses
+import math
 from enum import Enum
 
+import numpy as np
+
 
 @dataclasses.dataclass
 class MetricUnit:
@@ -109,6 +112,120 @@ class MetricEffect:
             case _:
                 return value
 
+    def clamped_affine(self) -> tuple[float, float, float, float]:
+        # Scale, offset, lower bound and upper bound, such that applying the effect to a
+        # value is equal to min(max(scale * value + offset, lower), upper). A scale of zero
+        # stands for the offset, also for infinite and NaN values.
+        match self.operation:
+            case MetricOperation.ADD:
+                return 1.0, self.value, -math.inf, math.inf
+            case MetricOperation.MULTIPLY:
+                return self.value, 0.0, -math.inf, math.inf
+            case MetricOperation.MINIMUM:
+                return 1.0, 0.0, -math.inf, self.value
+            case MetricOperation.MAXIMUM:
+                return 1.0, 0.0, self.value, math.inf
+            case MetricOperation.REPLACE:
+                return 0.0, self.value, -math.inf, math.inf
+            case _:
+                return 1.0, 0.0, -math.inf, math.inf
+
+    def apply_to_range(self, low: float, high: float) -> tuple[float, float]:
+        # Smallest range containing the results of applying the effect to all values in the
+        # range passed in
+        match self.operation:
+            case MetricOperation.ADD:
+                return low + self.value, high + self.value
+            case MetricOperation.MULTIPLY:
+                low, high = low * self.value, high * self.value
+                return min(low, high), max(low, high)
+            case MetricOperation.MINIMUM:
+                return min(low, self.value), min(high, self.value)
+            case MetricOperation.MAXIMUM:
+                return max(low, self.value), max(high, self.value)
+            case MetricOperation.REPLACE:
+                return self.value, self.value
+            case _:
+                return low, high
+
+
+def apply_clamped_affine(
+    scales: np.ndarray,
+    offsets: np.ndarray,
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    values: np.ndarray,
+) -> np.ndarray:
+    """
+    Apply effects, given as returned by :meth:`MetricEffect.clamped_affine`, to values,
+    element-wise
+
+    :return: New array with the resulting values
+
+    This is the vectorized version of :meth:`MetricEffect.apply_to`. Effects with a scale of
+    zero result in their offset, clamped, for any value. This matches replacing infinite and
+    NaN values. Multiplying these values by zero results in zero, instead of NaN.
+    """
+    with np.errstate(invalid="ignore"):
+        result = scales * values
+
+    result += offsets
+    np.copyto(result, offsets, where=scales == 0)
+    np.maximum(result, lower_bounds, out=result)
+    np.minimum(result, upper_bounds, out=result)
+
+    return result
+
+
+def apply_clamped_affine_to_value(
+    effect: tuple[float, float, float, float], value: float
+) -> float:
+    """
+    Apply an effect, given as returned by :meth:`MetricEffect.clamped_affine`, to a single
+    value
+
+    This is the scalar version of :func:`apply_clamped_affine`, with the same results.
+    """
+    scale, offset, lower_bound, upper_bound = effect
+    result = offset if scale == 0 else scale * value + offset
+
+    return min(max(result, lower_bound), upper_bound)
+
+
+def compose_clamped_affine(
+    first: tuple[float, float, float, float], second: tuple[float, float, float, float]
+) -> tuple[float, float, float, float]:
+    """
+    Compose two effects, given as returned by :meth:`MetricEffect.clamped_affine`
+
+    :return: Effect equal to applying the first effect and then the second one, in the same
+        form
+
+    Chains of effects of any length can be folded into a single effect this way. Applying
+    the result can differ from applying the effects one by one by rounding errors.
+    """
+    scale_1, offset_1, lower_1, upper_1 = first
+    scale_2, offset_2, lower_2, upper_2 = second
+
+    if scale_2 == 0:
+        # The second effect results in a constant value
+        return 0.0, min(max(offset_2, lower_2), upper_2), -math.inf, math.inf
+
+    # Clamping and then scaling is equal to scaling and then clamping to the scaled bounds,
+    # which swap in case the scale is negative. Clamping twice is equal to clamping once, to
+    # the first bounds clamped to the second bounds.
+    if scale_2 > 0:
+        lower, upper = scale_2 * lower_1 + offset_2, scale_2 * upper_1 + offset_2
+    else:
+        lower, upper = scale_2 * upper_1 + offset_2, scale_2 * lower_1 + offset_2
+
+    return (
+        scale_2 * scale_1,
+        scale_2 * offset_1 + offset_2,
+        min(max(lower, lower_2), upper_2),
+        min(max(upper, lower_2), upper_2),
+    )
+
 
 class DefaultUnits:
     FORMAT_SLIDER = "n"
@@ -2,17 +2,18 @@ from .metric import Metric, MetricValue
 
 
 class Pathway:
-    id: str
+    id: int
     action_id: str
-    parent_id: str | None = None
+    parent_id: int | None = None
     metric_data: dict[str, MetricValue]
 
     def __init__(
         self,
+        pathway_id: int,
         action_id: str,
-        parent_id: str | None = None,
+        parent_id: int | None = None,
     ):
-        self.id = action_id if parent_id is None else f"{parent_id}->{action_id}"
+        self.id = pathway_id
         self.action_id = action_id
         self.parent_id = parent_id
         self.metric_data = {}
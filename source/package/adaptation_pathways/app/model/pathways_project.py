@@ -2,15 +2,204 @@
 """
 The single class that stores all data needed to work on a project
 """
+import itertools
+import math
 from json import JSONEncoder
 from typing import Iterable
 
+import numpy as np
+
 from .action import Action
-from .metric import Metric, MetricEffect, MetricOperation, MetricValue, MetricValueState
+from .metric import (
+    Metric,
+    MetricEffect,
+    MetricOperation,
+    MetricValue,
+    MetricValueState,
+    apply_clamped_affine,
+    apply_clamped_affine_to_value,
+    compose_clamped_affine,
+)
 from .pathway import Pathway
 from .scenario import Scenario
 
 
+def _depths(parent_idxs: list[int]) -> list[int]:
+    # Depth of each node in a forest, given the index of the parent of each node (-1 for
+    # roots)
+    depths = [-1] * len(parent_idxs)
+
+    for idx, parent_idx in enumerate(parent_idxs):
+        if depths[idx] >= 0:
+            continue
+
+        path = [idx]
+        idx = parent_idx
+
+        while idx >= 0 and depths[idx] < 0:  # pylint: disable=chained-comparison
+            path.append(idx)
+            idx = parent_idxs[idx]
+
+        depth = depths[idx] if idx >= 0 else -1
+
+        for path_idx in reversed(path):
+            depth += 1
+            depths[path_idx] = depth
+
+    return depths
+
+
+# Revision numbers, unique within the process
+_revisions = itertools.count(1)
+
+
+def _discard(index: dict, key, value) -> None:
+    # Remove the value from the set stored under the key, and the set itself once it is
+    # empty
+    if key in index:
+        index[key].pop(value, None)
+
+        if not index[key]:
+            del index[key]
+
+
+class _PathwayTree:
+    """
+    Relations between the pathways of a project, kept up to date while pathways are created
+    and deleted through the project
+
+    Dictionaries with values set to None are used as insertion-ordered sets.
+    """
+
+    def __init__(self, project: "PathwaysProject") -> None:
+        self.pathway_ids = project.pathway_ids
+        self.pathways_by_id = project.pathways_by_id
+        self.nr_pathways = len(project.pathway_ids)
+        self.child_ids_by_pathway_id: dict[int, dict[int, None]] = {}
+        self.pathway_ids_by_action_id: dict[str, dict[int, None]] = {}
+        self.pathway_id_by_parent_and_action_id: dict[tuple[int | None, str], int] = {}
+        self.root_ids: dict[int, None] = {}
+
+        # Revision of the pathways, changed when pathways are created or deleted, and per
+        # metric, the revision of the values of the pathways, changed when values are updated
+        self.revision = next(_revisions)
+        self.values_revision_by_metric_id: dict[str, int] = {}
+
+        # Per pathway, its number in a depth-first (pre-order) traversal of the pathways, and
+        # the largest number in its subtree. Calculated when needed after a change.
+        self._interval_by_pathway_id: dict[int, tuple[int, int]] | None = None
+
+        # Per metric and pathway, the ID of the pathway whose value the pathway's value is
+        # estimated from, if any, and the effects of the actions in between, folded into a
+        # single clamped affine function. Filled when needed, and cleared after a change.
+        self.composed_effect_by_metric_id: dict[
+            str, dict[int, tuple[int | None, tuple[float, float, float, float]]]
+        ] = {}
+
+        pathways = list(project.all_pathways)
+        pathway_ids = {pathway.id for pathway in pathways}
+
+        for pathway in pathways:
+            self.add(pathway, pathway.parent_id in pathway_ids)
+
+    def is_valid_for(self, project: "PathwaysProject") -> bool:
+        # Pathways are created and deleted through the project, which keeps the tree up to
+        # date. As a safeguard, collections of pathways that are replaced, and IDs that are
+        # added to or removed from them directly, are detected.
+        return (
+            self.pathway_ids is project.pathway_ids
+            and self.pathways_by_id is project.pathways_by_id
+            and self.nr_pathways == len(project.pathway_ids)
+        )
+
+    def add(self, pathway: Pathway, has_parent: bool) -> None:
+        # Pathways whose parent does not exist are treated as roots
+        if has_parent:
+            assert pathway.parent_id is not None
+            self.child_ids_by_pathway_id.setdefault(pathway.parent_id, {})[
+                pathway.id
+            ] = None
+        else:
+            self.root_ids[pathway.id] = None
+
+        # Children of a pathway created again are not roots anymore
+        for child_id in self.child_ids_by_pathway_id.get(pathway.id, {}):
+            self.root_ids.pop(child_id, None)
+
+        self._interval_by_pathway_id = None
+        self.composed_effect_by_metric_id.clear()
+        self.revision = next(_revisions)
+
+        self.pathway_ids_by_action_id.setdefault(pathway.action_id, {})[
+            pathway.id
+        ] = None
+        self.pathway_id_by_parent_and_action_id[
+            (pathway.parent_id, pathway.action_id)
+        ] = pathway.id
+
+    def remove(self, pathway: Pathway) -> None:
+        self.root_ids.pop(pathway.id, None)
+
+        _discard(self.child_ids_by_pathway_id, pathway.parent_id, pathway.id)
+        _discard(self.pathway_ids_by_action_id, pathway.action_id, pathway.id)
+
+        parent_and_action_id = (pathway.parent_id, pathway.action_id)
+
+        if (
+            self.pathway_id_by_parent_and_action_id.get(parent_and_action_id, None)
+            == pathway.id
+        ):
+            del self.pathway_id_by_parent_and_action_id[parent_and_action_id]
+
+        # Children of the pathway, if any, become roots
+        for child_id in self.child_ids_by_pathway_id.get(pathway.id, {}):
+            self.root_ids[child_id] = None
+
+        self._interval_by_pathway_id = None
+        self.composed_effect_by_metric_id.clear()
+        self.revision = next(_revisions)
+
+    def interval(self, pathway_id: int) -> tuple[int, int]:
+        """
+        Return the number of the pathway in a depth-first traversal, and the largest number
+        of the pathways in its subtree
+
+        A pathway is an ancestor of another pathway if the number of the latter lies in the
+        interval of the former. Numbering all pathways costs time proportional to their
+        number, once after a change.
+        """
+        if self._interval_by_pathway_id is None:
+            interval_by_pathway_id: dict[int, tuple[int, int]] = {}
+            number_by_pathway_id: dict[int, int] = {}
+
+            # Pathway IDs, and whether the pathway is entered or left
+            to_visit: list[tuple[int, bool]] = [
+                (root_id, True) for root_id in reversed(self.root_ids)
+            ]
+
+            while to_visit:
+                visited_id, enter = to_visit.pop()
+
+                if enter:
+                    number_by_pathway_id[visited_id] = len(number_by_pathway_id)
+                    to_visit.append((visited_id, False))
+                    to_visit.extend(
+                        (child_id, True)
+                        for child_id in reversed(
+                            self.child_ids_by_pathway_id.get(visited_id, {})
+                        )
+                    )
+                else:
+                    interval_by_pathway_id[visited_id] = (
+                        number_by_pathway_id[visited_id],
+                        len(number_by_pathway_id) - 1,
+                    )
+
+            self._interval_by_pathway_id = interval_by_pathway_id
+
+        return self._interval_by_pathway_id[pathway_id]
+
+
 class PathwaysProject:
     def __init__(
         self,
@@ -27,10 +216,10 @@ class PathwaysProject:
         action_ids: list[str] | None = None,
         scenarios_by_id: dict[str, Scenario] | None = None,
         scenario_ids: list[str] | None = None,
-        pathways_by_id: dict[str, Pathway] | None = None,
-        pathway_ids: list[str] | None = None,
+        pathways_by_id: dict[int, Pathway] | None = None,
+        pathway_ids: Iterable[int] | None = None,
         root_action_id: str = "",
-        root_pathway_id: str = "",
+        root_pathway_id: int | None = None,
         values_scenario_id: str | None = None,
         graph_metric_id: str | None = None,
         graph_scenario_id: str | None = None,
@@ -42,6 +231,7 @@ class PathwaysProject:
         self.start_year = start_year
         self.end_year = end_year
         self._current_id = 0
+        self._current_pathway_id = max(pathways_by_id or (), default=0)
 
         self.condition_ids = condition_ids or []
         self.conditions_by_id = conditions_by_id or {}
@@ -54,10 +244,11 @@ class PathwaysProject:
         self.action_ids = action_ids or []
         self.actions_by_id = actions_by_id or {}
 
-        self.pathway_ids = pathway_ids or []
+        # Insertion-ordered set of pathway IDs, so pathways can be deleted one at a time
+        self.pathway_ids: dict[int, None] = dict.fromkeys(pathway_ids or ())
         self.pathways_by_id = pathways_by_id or {}
 
-        self.root_pathway_id = root_pathway_id or ""
+        self.root_pathway_id = root_pathway_id
         self.root_action_id = root_action_id or ""
 
         self.values_scenario_id = values_scenario_id or "none"
@@ -65,6 +256,66 @@ class PathwaysProject:
         self.graph_scenario_id = graph_scenario_id or "none"
         self.graph_is_time = graph_is_time
 
+        # Relations between the pathways, derived from them when needed. Not saved with the
+        # project.
+        self._tree: _PathwayTree | None = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_tree"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._tree = None
+        self.migrate()
+
+    def migrate(self):
+        """
+        Update a project restored from a file saved by an earlier version
+
+        Pathways used to be identified by strings: the IDs of their actions, separated by
+        arrows. They are given integer IDs, in the order of the pathway IDs, and the IDs
+        of their parents and of the root pathway are updated accordingly.
+
+        The pathway IDs used to be stored in a list. They are stored in a dictionary, with
+        values set to None.
+
+        Projects saved by earlier versions are restored attribute by attribute, without
+        calling ``__setstate__``. Call this method after restoring them. Calling it on a
+        project that is up to date has no effect.
+        """
+        if any(isinstance(pathway_id, str) for pathway_id in self.pathways_by_id):
+            id_by_legacy_id = {
+                legacy_id: idx + 1
+                for idx, legacy_id in enumerate(
+                    dict.fromkeys([*self.pathway_ids, *self.pathways_by_id])
+                )
+            }
+
+            for pathway in self.pathways_by_id.values():
+                pathway.id = id_by_legacy_id[pathway.id]
+
+                # Parents that do not exist are treated as absent
+                pathway.parent_id = id_by_legacy_id.get(pathway.parent_id, None)
+
+            self.pathway_ids = dict.fromkeys(
+                id_by_legacy_id[pathway_id] for pathway_id in self.pathway_ids
+            )
+            self.pathways_by_id = {
+                pathway.id: pathway for pathway in self.pathways_by_id.values()
+            }
+            self.root_pathway_id = id_by_legacy_id.get(self.root_pathway_id, None)
+
+        if not isinstance(self.pathway_ids, dict):
+            self.pathway_ids = dict.fromkeys(self.pathway_ids)
+
+        self._tree = None
+        self._current_pathway_id = max(
+            getattr(self, "_current_pathway_id", 0),
+            max(self.pathways_by_id, default=0),
+        )
+
     def __hash__(self):
         return self.id.__hash__()
 
@@ -108,6 +359,10 @@ class PathwaysProject:
         self._current_id += 1
         return str(self._current_id)
 
+    def _create_pathway_id(self) -> int:
+        self._current_pathway_id += 1
+        return self._current_pathway_id
+
     def get_metric(self, metric_id: str) -> Metric | None:
         metric = self.conditions_by_id.get(metric_id, None)
         if metric is None:
@@ -177,12 +432,7 @@ class PathwaysProject:
             return None
 
         new_scenario = self.create_scenario(f"{to_copy.name}{suffix}")
-        for year_data in to_copy.yearly_data:
-            new_data = new_scenario.get_or_add_year(year_data.year)
-            for metric_id, metric_data in year_data.metric_data.items():
-                new_data.metric_data[metric_id] = MetricValue(
-                    metric_data.value, metric_data.state
-                )
+        new_scenario.copy_data_from(to_copy)
 
         return new_scenario
 
@@ -200,8 +450,19 @@ class PathwaysProject:
             self.delete_scenario(scenario_id)
 
     def update_scenario_values(self, metric_id: str):
-        for scenario in self.all_scenarios:
-            scenario.recalculate_values(metric_id)
+        self.update_all_scenario_values([metric_id])
+
+    def update_all_scenario_values(self, metric_ids: Iterable[str] | None = None):
+        """
+        Update the estimated values of all scenarios
+
+        :param metric_ids: IDs of the metrics to update the values of. Defaults to the IDs
+            of all conditions.
+        """
+        Scenario.recalculate_all_values(
+            self.all_scenarios,
+            self.condition_ids if metric_ids is None else metric_ids,
+        )
 
     def get_action(self, action_id: str) -> Action:
         return self.actions_by_id[action_id]
@@ -229,49 +490,289 @@ class PathwaysProject:
         return action
 
     def delete_actions(self, action_ids: Iterable[str]):
-        pathway_ids_to_delete: list[str] = []
+        tree = self._pathway_tree()
+        pathway_ids_to_delete: list[int] = []
 
         for action_id in action_ids:
             self.delete_action(action_id)
-            for pathway in self.all_pathways:
-                if pathway.action_id == action_id:
-                    pathway_ids_to_delete.append(pathway.id)
+            pathway_ids_to_delete.extend(
+                tree.pathway_ids_by_action_id.get(action_id, {})
+            )
 
         self.delete_pathways(pathway_ids_to_delete)
 
-    def get_pathway(self, pathway_id: str) -> Pathway | None:
+    def get_pathway(self, pathway_id: int | None) -> Pathway | None:
         if pathway_id is None:
             return None
         return self.pathways_by_id.get(pathway_id, None)
 
     def create_pathway(
-        self, action_id: str, parent_pathway_id: str | None = None
+        self, action_id: str, parent_pathway_id: int | None = None
     ) -> Pathway:
-        pathway = Pathway(action_id, parent_pathway_id)
-        self.pathways_by_id[pathway.id] = pathway
-        self.pathway_ids.append(pathway.id)
+        return self.create_pathways([(action_id, parent_pathway_id)])[0]
+
+    def create_pathways(
+        self, action_and_parent_pathway_ids: Iterable[tuple[str, int | None]]
+    ) -> list[Pathway]:
+        """
+        Create pathways, and estimate their values
+
+        :param action_and_parent_pathway_ids: Per pathway, the ID of its action and the ID of
+            its parent pathway, if any
+        :return: The pathways created
+
+        A pathway created again, with the same action and parent pathway, replaces the
+        existing pathway and keeps its ID.
+
+        Only the values of the new pathways, and of existing pathways that descend from them,
+        are calculated. Creating many pathways in one call is cheaper than calling
+        :meth:`create_pathway` for each of them.
+        """
+        tree = self._pathway_tree()
+        pathways: list[Pathway] = []
+
+        for action_id, parent_pathway_id in action_and_parent_pathway_ids:
+            pathway_id = tree.pathway_id_by_parent_and_action_id.get(
+                (parent_pathway_id, action_id), None
+            )
 
-        for metric in self.all_metrics():
-            self.update_pathway_values(metric.id)
+            if pathway_id is None:
+                pathway_id = self._create_pathway_id()
+                self.pathway_ids[pathway_id] = None
 
-        return pathway
+            pathway = Pathway(pathway_id, action_id, parent_pathway_id)
+            self.pathways_by_id[pathway.id] = pathway
+
+            # Pathways created again later in this call keep this ID as well
+            tree.pathway_id_by_parent_and_action_id[(parent_pathway_id, action_id)] = (
+                pathway_id
+            )
+            pathways.append(pathway)
+
+        for pathway in pathways:
+            tree.add(pathway, pathway.parent_id in self.pathways_by_id)
+
+        tree.nr_pathways = len(self.pathway_ids)
+        new_pathway_ids = {pathway.id for pathway in pathways}
+
+        # Updating the new pathways whose parent is not new updates all new pathways
+        self._update_subtree_values(
+            [
+                pathway
+                for pathway in pathways
+                if pathway.parent_id not in new_pathway_ids
+            ],
+            list(self.all_metrics()),
+            new_pathway_ids,
+        )
+
+        return pathways
 
     def update_pathway_values(self, metric_id: str):
         metric = self.get_metric(metric_id)
         if metric is None:
             return
 
-        updated_pathways: set[str] = set()
-        for pathway in self.all_pathways:
-            self._update_pathway_value(pathway, metric, updated_pathways)
+        self.update_all_pathway_values([metric])
+
+    def update_all_pathway_values(self, metrics: Iterable[Metric] | None = None):
+        """
+        Update the estimated values of all pathways
+
+        :param metrics: Metrics to update the values of. Defaults to all metrics.
+
+        Estimated values depend on the value of the parent pathway. Values are calculated
+        for all pathways and metrics at once, one level of the pathway tree at a time,
+        starting at the root. Pathways without a value are assigned a value of zero first.
+        """
+        metrics = list(self.all_metrics() if metrics is None else metrics)
+        pathways = list(self.all_pathways)
+        self._values_changed(metrics)
+
+        if len(metrics) == 0 or len(pathways) == 0:
+            return
+
+        idx_by_pathway_id = {pathway.id: idx for idx, pathway in enumerate(pathways)}
+        parent_idxs = [
+            (
+                idx_by_pathway_id.get(pathway.parent_id, -1)
+                if pathway.parent_id is not None
+                else -1
+            )
+            for pathway in pathways
+        ]
+
+        # Per pathway and metric: value, and whether it is an estimate
+        metric_ids = [metric.id for metric in metrics]
+        metric_id_set = set(metric_ids)
+        metric_values: list[list[MetricValue]] = []
+
+        for pathway, parent_idx in zip(pathways, parent_idxs):
+            metric_data = pathway.metric_data
+
+            # Initialize the values if there were none
+            if not metric_data.keys() >= metric_id_set:
+                state = (
+                    MetricValueState.ESTIMATE
+                    if parent_idx >= 0
+                    else MetricValueState.BASE
+                )
+
+                for metric_id in metric_ids:
+                    if metric_id not in metric_data:
+                        metric_data[metric_id] = MetricValue(0, state)
+
+            metric_values.append([metric_data[metric_id] for metric_id in metric_ids])
+
+        estimate = MetricValueState.ESTIMATE
+        values = np.array(
+            [
+                [metric_value.value for metric_value in pathway_metric_values]
+                for pathway_metric_values in metric_values
+            ],
+            dtype=np.float64,
+        ).reshape(len(pathways), len(metrics))
+        is_estimate_by_pathway = [
+            [metric_value.state is estimate for metric_value in pathway_metric_values]
+            for pathway_metric_values in metric_values
+        ]
+        is_estimate = np.array(is_estimate_by_pathway, dtype=np.bool_).reshape(
+            len(pathways), len(metrics)
+        )
+
+        # Per pathway and metric: the effect of the pathway's action, as a clamped affine
+        # function. Only the actions of pathways with estimated values are needed. Other
+        # pathways refer to the identity function (action index zero).
+        effects_by_action, action_idxs = self._clamped_affine_effects(
+            [
+                pathway.action_id if any(pathway_is_estimate) else None
+                for pathway, pathway_is_estimate in zip(
+                    pathways, is_estimate_by_pathway
+                )
+            ],
+            metrics,
+        )
+
+        depths = _depths(parent_idxs)
+
+        # Order the rows by depth, so each level of the tree is a contiguous range of rows,
+        # preceded by the levels of the parents. Pathways without a parent refer to an
+        # additional row containing zeros.
+        depths_array = np.array(depths, dtype=np.int64)
+        order = np.argsort(depths_array, kind="stable")
+        row_by_idx = np.empty_like(order)
+        row_by_idx[order] = np.arange(len(pathways))
+        parent_idxs_array = np.array(parent_idxs, dtype=np.int64)[order]
+        parent_rows = np.where(
+            parent_idxs_array >= 0, row_by_idx[parent_idxs_array], len(pathways)
+        )
+
+        values = np.concatenate((values[order], np.zeros((1, len(metrics)))))
+        is_estimate = is_estimate[order]
+        scales, offsets, lower_bounds, upper_bounds = np.moveaxis(
+            np.array(effects_by_action, dtype=np.float64)[action_idxs[order]],
+            -1,
+            0,
+        )
+        level_ends = np.searchsorted(
+            depths_array[order], np.arange(depths_array.max() + 1), side="right"
+        )
+        level_begin = 0
+
+        for level_end in level_ends.tolist():
+            level = slice(level_begin, level_end)
+            level_begin = level_end
+            np.copyto(
+                values[level],
+                apply_clamped_affine(
+                    scales[level],
+                    offsets[level],
+                    lower_bounds[level],
+                    upper_bounds[level],
+                    values[parent_rows[level]],
+                ),
+                where=is_estimate[level],
+            )
+
+        values = values[row_by_idx]
+        is_estimate = is_estimate[row_by_idx]
 
-    def _update_pathway_value(
-        self, pathway: Pathway, metric: Metric, updated_pathway_ids: set[str]
+        for pathway_metric_values, pathway_values, pathway_is_estimate in zip(
+            metric_values, values.tolist(), is_estimate.tolist()
+        ):
+            for metric_value, value, value_is_estimate in zip(
+                pathway_metric_values, pathway_values, pathway_is_estimate
+            ):
+                if value_is_estimate:
+                    metric_value.value = value
+
+    def update_action_values(
+        self, action_id: str, metrics: Iterable[Metric] | None = None
     ):
-        pathway_action = self.get_action(pathway.action_id)
-        parent = (
-            None if pathway.parent_id is None else self.get_pathway(pathway.parent_id)
+        """
+        Update the estimated values of the pathways affected by a change in the effects of
+        an action
+
+        :param action_id: ID of the action whose effects changed
+        :param metrics: Metrics whose effects changed. Defaults to all metrics.
+
+        Only the pathways containing the action, and their descendants with estimated values,
+        are updated. Propagation stops at pathways whose value is not an estimate.
+        """
+        tree = self._pathway_tree()
+        self._update_subtree_values(
+            [
+                self.pathways_by_id[pathway_id]
+                for pathway_id in tree.pathway_ids_by_action_id.get(action_id, ())
+            ],
+            list(self.all_metrics() if metrics is None else metrics),
         )
+
+    def _update_subtree_values(
+        self,
+        pathways: list[Pathway],
+        metrics: list[Metric],
+        new_pathway_ids: set[int] | None = None,
+    ):
+        # Update the values of the pathways passed in and of their descendants. Propagation
+        # stops at pathways whose value is not an estimate, except at new pathways, whose
+        # descendants may not have a value yet.
+        tree = self._pathway_tree()
+        new_pathway_ids = new_pathway_ids or set()
+        self._values_changed(metrics)
+
+        # Ancestors first. The subtrees of the pathways are visited depth-first, so each
+        # pathway is updated after its parent.
+        if len(pathways) > 1:
+            pathways = sorted(pathways, key=lambda pathway: tree.interval(pathway.id))
+
+        for metric in metrics:
+            updated_pathway_ids: set[int] = set()
+
+            for pathway in pathways:
+                pathway_ids = [pathway.id]
+
+                while pathway_ids:
+                    pathway_id = pathway_ids.pop()
+
+                    if pathway_id in updated_pathway_ids:
+                        continue
+
+                    if (
+                        self._update_pathway_value(
+                            self.pathways_by_id[pathway_id], metric
+                        )
+                        or pathway_id in new_pathway_ids
+                    ):
+                        updated_pathway_ids.add(pathway_id)
+                        pathway_ids.extend(
+                            reversed(tree.child_ids_by_pathway_id.get(pathway_id, {}))
+                        )
+
+    def _update_pathway_value(self, pathway: Pathway, metric: Metric) -> bool:
+        # Update the value of the pathway, given the value of its parent. Return whether the
+        # value is an estimate.
+        parent = self.get_pathway(pathway.parent_id)
         current_value = pathway.metric_data.get(metric.id, None)
 
         # Initialize the value if there was none
@@ -286,54 +787,240 @@ class PathwaysProject:
             )
             pathway.metric_data[metric.id] = current_value
 
-        # If we have a non-estimate value, we don't need to update anything
         if current_value.state != MetricValueState.ESTIMATE:
-            updated_pathway_ids.add(pathway.id)
-            return
+            return False
 
         base_value: float = 0
+
         if parent is not None:
             parent_value = parent.metric_data.get(metric.id, None)
 
+            if parent_value is not None:
+                base_value = parent_value.value
+
+        # Like in update_all_pathway_values, a scale of zero results in the offset, also
+        # for infinite and NaN values
+        action = self.get_action(pathway.action_id)
+        current_value.value = apply_clamped_affine_to_value(
+            action.metric_data.get(
+                metric.id, MetricEffect(0, MetricOperation.NONE)
+            ).clamped_affine(),
+            base_value,
+        )
+
+        return True
+
+    def estimate_pathway_value(
+        self, pathway: Pathway, metric: Metric, root_value: float | None = None
+    ) -> float:
+        """
+        Return the value of a pathway, as estimated from the values of its ancestors
+
+        :param pathway: Pathway to return the value of
+        :param metric: Metric to return the value of
+        :param root_value: Value to use instead of the value of the root pathway, if the
+            estimate depends on it. Allows asking what-if questions without changing and
+            updating all pathways.
+        :return: The value, equal, up to rounding, to the value
+            :meth:`update_all_pathway_values` would assign
+
+        The effects of the actions between the pathway and the nearest ancestor-or-self
+        whose value is not an estimate are folded into a single function once per pathway
+        and metric. These are remembered, for each prefix of the chain, until pathways are
+        created or deleted or their values are updated. Afterwards, estimating a value
+        takes constant time, for any root value.
+        """
+        anchor_id, effect = self._composed_effect(pathway, metric)
+        anchor = self.get_pathway(anchor_id)
+        base_value: float = 0
+
+        if anchor is not None:
+            if root_value is not None and self.get_pathway(anchor.parent_id) is None:
+                base_value = root_value
+            elif metric.id in anchor.metric_data:
+                base_value = anchor.metric_data[metric.id].value
+
+        # Like in the updates, a scale of zero results in the offset, also for infinite and
+        # NaN values
+        return apply_clamped_affine_to_value(effect, base_value)
+
+    def _composed_effect(
+        self, pathway: Pathway, metric: Metric
+    ) -> tuple[int | None, tuple[float, float, float, float]]:
+        # ID of the pathway whose value the value of the pathway passed in is estimated
+        # from, and the folded effects of the actions in between. None in case the estimate
+        # starts at zero, for a pathway without a parent whose value is an estimate.
+        composed_effect_by_pathway_id = (
+            self._pathway_tree().composed_effect_by_metric_id.setdefault(metric.id, {})
+        )
+        identity = MetricEffect(0, MetricOperation.NONE).clamped_affine()
+        estimated_pathways: list[Pathway] = []
+        current_pathway: Pathway | None = pathway
+        anchor_id: int | None = None
+        effect = identity
+
+        # Walk up to a pathway whose folded effect is known, or whose value is not an
+        # estimate
+        while current_pathway is not None:
+            if current_pathway.id in composed_effect_by_pathway_id:
+                anchor_id, effect = composed_effect_by_pathway_id[current_pathway.id]
+                break
+
+            parent = self.get_pathway(current_pathway.parent_id)
+            current_value = current_pathway.metric_data.get(metric.id, None)
+
+            # Pathways without a value are treated like in update_all_pathway_values
             if (
-                parent.id not in updated_pathway_ids
-                and parent_value is not None
-                and parent_value.is_estimate
+                current_value.is_estimate
+                if current_value is not None
+                else parent is not None
             ):
-                self._update_pathway_value(parent, metric, updated_pathway_ids)
+                estimated_pathways.append(current_pathway)
+                current_pathway = parent
+            else:
+                anchor_id = current_pathway.id
+                composed_effect_by_pathway_id[anchor_id] = (anchor_id, identity)
+                break
+
+        # Fold the effects on the way down, remembering each prefix
+        for estimated_pathway in reversed(estimated_pathways):
+            action = self.get_action(estimated_pathway.action_id)
+            effect = compose_clamped_affine(
+                effect,
+                action.metric_data.get(
+                    metric.id, MetricEffect(0, MetricOperation.NONE)
+                ).clamped_affine(),
+            )
+            composed_effect_by_pathway_id[estimated_pathway.id] = (anchor_id, effect)
 
-            if parent_value is not None:
-                base_value = parent_value.value
+        return composed_effect_by_pathway_id[pathway.id]
+
+    def _values_changed(self, metrics: Iterable[Metric]):
+        # The values, or which of them are estimates, may have changed
+        tree = self._pathway_tree()
+
+        for metric in metrics:
+            tree.composed_effect_by_metric_id.pop(metric.id, None)
+            tree.values_revision_by_metric_id[metric.id] = next(_revisions)
+
+    @property
+    def pathways_revision(self) -> int:
+        """
+        Number that changes whenever pathways are created or deleted through the project
+
+        Allows others to keep information derived from the pathways until they change.
+        """
+        return self._pathway_tree().revision
+
+    def values_revision(self, metric_id: str) -> int:
+        """
+        Return a number that changes whenever the values of the pathways for a metric are
+        updated through the project, or pathways are created or deleted
+
+        Values are edited in place. Only edits followed by one of the ``update_*`` methods
+        change the number.
+        """
+        tree = self._pathway_tree()
+
+        if metric_id not in tree.values_revision_by_metric_id:
+            tree.values_revision_by_metric_id[metric_id] = next(_revisions)
+
+        return max(tree.revision, tree.values_revision_by_metric_id[metric_id])
+
+    def _pathway_tree(self) -> _PathwayTree:
+        if self._tree is None or not self._tree.is_valid_for(self):
+            self._tree = _PathwayTree(self)
+
+        return self._tree
+
+    def _clamped_affine_effects(
+        self, action_ids: list[str | None], metrics: list[Metric]
+    ) -> tuple[list[list[tuple[float, float, float, float]]], np.ndarray]:
+        # Effects of distinct actions on the metrics, and the index of the effects of each
+        # action passed in. Index zero refers to the identity function, used for action ID
+        # None.
+        idx_by_action_id: dict[str | None, int] = {None: 0}
+        effects_by_action = [[(1.0, 0.0, -math.inf, math.inf)] * len(metrics)]
+
+        for action_id in action_ids:
+            if action_id is not None and action_id not in idx_by_action_id:
+                action = self.get_action(action_id)
+                idx_by_action_id[action_id] = len(effects_by_action)
+                effects_by_action.append(
+                    [
+                        (
+                            action.metric_data[metric.id]
+                            if metric.id in action.metric_data
+                            else MetricEffect(0, MetricOperation.NONE)
+                        ).clamped_affine()
+                        for metric in metrics
+                    ]
+                )
 
-        current_value.value = pathway_action.apply_effect(metric.id, base_value)
-        updated_pathway_ids.add(pathway.id)
+        return effects_by_action, np.array(
+            [idx_by_action_id[action_id] for action_id in action_ids], dtype=np.int64
+        )
 
-    def delete_pathway(self, pathway_id: str) -> Pathway | None:
-        pathway = self.pathways_by_id.pop(pathway_id, None)
-        self.pathway_ids.append(pathway_id)
-        return pathway
+    def delete_pathway(self, pathway_id: int) -> Pathway | None:
+        return self._delete_pathways([pathway_id])[0]
 
-    def delete_pathways(self, pathway_ids: Iterable[str]):
-        ids_to_delete: set[str] = set()
-        ids_to_delete.update(pathway_ids)
+    def delete_pathways(self, pathway_ids: Iterable[int]):
+        tree = self._pathway_tree()
+        ids_to_delete: dict[int, None] = {}
+        pathway_ids_to_visit = list(pathway_ids)
 
         # Delete any orphaned children
-        for pathway in self.all_pathways:
-            if pathway.id in ids_to_delete:
-                continue
+        while pathway_ids_to_visit:
+            pathway_id = pathway_ids_to_visit.pop()
+
+            if pathway_id not in ids_to_delete:
+                ids_to_delete[pathway_id] = None
+                pathway_ids_to_visit.extend(
+                    tree.child_ids_by_pathway_id.get(pathway_id, {})
+                )
+
+        self._delete_pathways(list(ids_to_delete))
+
+    def _delete_pathways(self, pathway_ids: list[int]) -> list[Pathway | None]:
+        tree = self._pathway_tree()
+        pathways = [
+            self.pathways_by_id.pop(pathway_id, None) for pathway_id in pathway_ids
+        ]
+
+        for pathway_id in pathway_ids:
+            self.pathway_ids.pop(pathway_id, None)
+
+        for pathway in pathways:
+            if pathway is not None:
+                tree.remove(pathway)
 
-            for ancestor in self.get_ancestors(pathway):
-                if ancestor.id in ids_to_delete:
-                    ids_to_delete.add(pathway.id)
+        tree.nr_pathways = len(self.pathway_ids)
 
-        for pathway_id in ids_to_delete:
-            self.delete_pathway(pathway_id)
+        return pathways
 
-    def get_children(self, pathway_id: str):
+    def get_children(self, pathway_id: int):
         return (
-            pathway for pathway in self.all_pathways if pathway.parent_id == pathway_id
+            self.pathways_by_id[child_id]
+            for child_id in list(
+                self._pathway_tree().child_ids_by_pathway_id.get(pathway_id, {})
+            )
         )
 
+    def is_ancestor(self, ancestor_id: int, pathway_id: int) -> bool:
+        """
+        Return whether a pathway is an ancestor of another pathway
+
+        :raises KeyError: In case one of the pathways does not exist
+
+        Except for the first call after pathways were created or deleted, this takes
+        constant time.
+        """
+        tree = self._pathway_tree()
+        ancestor_number, last_descendant_number = tree.interval(ancestor_id)
+        number, _ = tree.interval(pathway_id)
+
+        return ancestor_number < number <= last_descendant_number
+
     def get_ancestors(self, pathway: Pathway):
         if pathway.parent_id is None:
             return
@@ -354,7 +1041,22 @@ class PathwaysProject:
             else:
                 current_pathway = None
 
+    def get_pathway_path(self, pathway: Pathway) -> str:
+        """
+        Return a readable representation of the pathway: the IDs of the actions from the
+        root pathway up to and including the pathway, separated by arrows
+
+        Pathway IDs are integers, unrelated to the pathway's actions. The representation is
+        derived from the parents of the pathway when requested.
+        """
+        return "->".join(
+            ancestor.action_id
+            for ancestor in reversed(list(self.get_ancestors_and_self(pathway)))
+        )
+
 
 class PathwaysProjectEncoder(JSONEncoder):
     def default(self, o):
+        if isinstance(o, PathwaysProject):
+            return o.__getstate__()
         return o.__dict__
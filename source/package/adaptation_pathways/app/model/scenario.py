@@ -1,213 +1,568 @@
-# pylint: disable=too-many-return-statements,too-many-branches
+import weakref
+from typing import Iterable
+
+import numpy as np
+
 from .metric import MetricValue, MetricValueState
 
 
+# Codes of the states of the values stored in a scenario: the index of the state, or
+# _NO_VALUE in case there is no value
+_states = list(MetricValueState)
+_NO_VALUE = -1
+_ESTIMATE = _states.index(MetricValueState.ESTIMATE)
+
+
+def _estimate_values(
+    years: np.ndarray, values: np.ndarray, is_known: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    # Estimate the values that are not known, in each of the series of values stored one
+    # after the other. Returns a new array.
+    result = values.copy()
+    nr_values = len(values)
+    idxs = np.arange(nr_values)
+    ends = np.cumsum(lengths)
+    starts = np.repeat(ends - lengths, lengths)
+    ends = np.repeat(ends, lengths)
+
+    # Per value, the index of the nearest known value at or before it, and at or after it,
+    # in the same series. The nearest known value strictly before or after a known value
+    # is found by looking one position further.
+    previous_idxs = np.maximum.accumulate(np.where(is_known, idxs, -1))
+    next_idxs = np.minimum.accumulate(np.where(is_known, idxs, nr_values)[::-1])[::-1]
+    has_previous = previous_idxs >= starts
+    has_next = next_idxs < ends
+    previous_previous_idxs = np.concatenate(([-1], previous_idxs[:-1]))
+    next_next_idxs = np.concatenate((next_idxs[1:], [nr_values]))
+
+    is_estimate = ~is_known & (has_previous | has_next)
+
+    # Per value, the known values to interpolate or extrapolate between
+    low_idxs = np.where(has_previous, previous_idxs, next_idxs)
+    high_idxs = np.where(has_next, next_idxs, previous_idxs)
+
+    # Before the first known value: extrapolate from the first two. After the last known
+    # value: extrapolate from the last two.
+    before_first = is_estimate & ~has_previous
+    second_idxs = next_next_idxs[np.where(before_first, next_idxs, 0)]
+    has_second = before_first & (second_idxs < ends)
+    high_idxs = np.where(has_second, second_idxs, high_idxs)
+
+    after_last = is_estimate & ~has_next
+    second_last_idxs = previous_previous_idxs[np.where(after_last, previous_idxs, 0)]
+    has_second_last = after_last & (second_last_idxs >= starts)
+    low_idxs = np.where(has_second_last, second_last_idxs, low_idxs)
+
+    # Values without a second known value to extrapolate from are copied
+    interpolate = is_estimate & (low_idxs != high_idxs)
+    copy = is_estimate & (low_idxs == high_idxs)
+    result[copy] = values[low_idxs[copy]]
+
+    x = years[interpolate]
+    x_1 = years[low_idxs[interpolate]]
+    y_1 = values[low_idxs[interpolate]]
+    x_2 = years[high_idxs[interpolate]]
+    y_2 = values[high_idxs[interpolate]]
+    slope = (y_2 - y_1) / (x_2 - x_1)
+    result[interpolate] = slope * (x - x_1) + y_1
+
+    return result
+
+
 class YearDataPoint:
-    def __init__(self, year: int):
-        self.year = year
-        self.metric_data: dict[str, MetricValue] = {}
+    """
+    Values of the metrics of a scenario in a single year
+
+    This is a view on the data stored in the scenario. Changes made through it, including
+    changes to the metric values it returns, are stored in the scenario.
+
+    Projects saved before the data of scenarios was stored in arrays contain points with
+    their own year and metric values. These points are restored without a scenario, and
+    keep their data until the scenario they belong to takes it over.
+    """
+
+    def __init__(self, scenario: "Scenario", year: int):
+        self.scenario = scenario
+        self._year = year
+
+    @property
+    def year(self) -> int:
+        return self._year
+
+    @year.setter
+    def year(self, year: int):
+        if not self._is_restored():
+            self.scenario.change_year(self._year, year)
+        self._year = year
+
+    @property
+    def metric_data(self) -> dict[str, MetricValue]:
+        if self._is_restored():
+            return self._restored_metric_data
+
+        return {
+            metric_id: _YearMetricValue(self, metric_id)
+            for metric_id in self.scenario.metric_ids
+            if self.scenario.get_metric_value(self._year, metric_id) is not None
+        }
+
+    @metric_data.setter
+    def metric_data(self, metric_data: dict[str, MetricValue]):
+        assert self._is_restored()
+        self._restored_metric_data = metric_data
+
+    def _is_restored(self) -> bool:
+        # Whether the point was restored from an earlier saved project, without a scenario
+        return "scenario" not in self.__dict__
 
     def get_or_add_data(self, metric_id: str) -> MetricValue:
-        data = self.metric_data.get(metric_id, None)
-        if data is None:
-            data = MetricValue(0, MetricValueState.ESTIMATE)
-            self.metric_data[metric_id] = data
-        return data
+        if self.scenario.get_metric_value(self._year, metric_id) is None:
+            self.scenario.set_data(
+                self._year, metric_id, MetricValue(0, MetricValueState.ESTIMATE)
+            )
+        return _YearMetricValue(self, metric_id)
 
 
-class Scenario:
-    def __init__(self, scenario_id: str, name: str):
-        self.id = scenario_id
-        self.name = name
-        self.yearly_data: list[YearDataPoint] = []
+class _YearMetricValue(MetricValue):
+    # Value of a metric in a year of a scenario. Reading and assigning the value and state
+    # reads and assigns the scenario's data.
 
-    def get_or_add_year(self, year: int) -> YearDataPoint:
-        data = self.get_data(year)
-        if data is None:
-            data = YearDataPoint(year)
-            self.yearly_data.append(data)
-            self.sort_yearly_data()
+    def __init__(  # pylint: disable=super-init-not-called
+        self, point: YearDataPoint, metric_id: str
+    ):
+        self._point = point
+        self._metric_id = metric_id
 
-        return data
+    def _get(self) -> MetricValue:
+        value = self._point.scenario.get_metric_value(self._point.year, self._metric_id)
+        assert value is not None
+        return value
 
-    def get_data(self, year: int) -> YearDataPoint | None:
-        for data_point in self.yearly_data:
-            if data_point.year == year:
-                return data_point
-        return None
+    @property  # type: ignore[override]
+    def value(self) -> float:
+        return self._get().value
 
-    def set_data(self, year: int, metric_id: str, value: MetricValue):
-        data = self.get_or_add_year(year)
-        data.metric_data[metric_id] = value
+    @value.setter
+    def value(self, value: float):
+        self._point.scenario.set_data(
+            self._point.year, self._metric_id, MetricValue(value, self._get().state)
+        )
 
-    def sort_yearly_data(self):
-        self.yearly_data.sort(key=lambda point: point.year)
+    @property  # type: ignore[override]
+    def state(self) -> MetricValueState:
+        return self._get().state
 
-    def recalculate_values(self, metric_id: str):
-        for index, data in enumerate(self.yearly_data):
-            metric_value = data.get_or_add_data(metric_id)
-
-            # We only recalculate estimated values
-            if not metric_value.is_estimate:
-                continue
-
-            previous_point = self._get_previous_value(index, metric_id)
-            next_point = self._get_next_value(index, metric_id)
-
-            # If we don't have any data to interpolate, we can't recalculate
-            if previous_point is None and next_point is None:
-                continue
-
-            # If we have both a previous and next point, we can interpolate
-            if previous_point is not None and next_point is not None:
-                metric_value.value = self._estimate_value(
-                    data.year,
-                    previous_point[0],
-                    previous_point[1].value,
-                    next_point[0],
-                    next_point[1].value,
-                )
-                continue
-
-            # If we don't have a previous point, try extrapolating with the next two points
-            if next_point is not None:
-                # Check if we have a second data point
-                second_next_point = self._get_next_value(next_point[2], metric_id)
-
-                # If we don't have a second next data point, we have to use the next one as is
-                if second_next_point is None:
-                    metric_value.value = next_point[1].value
-                    continue
-
-                # Otherwise we can extrapolate
-                metric_value.value = self._estimate_value(
-                    data.year,
-                    next_point[0],
-                    next_point[1].value,
-                    second_next_point[0],
-                    second_next_point[1].value,
-                )
-                continue
+    @state.setter
+    def state(self, state: MetricValueState):
+        self._point.scenario.set_data(
+            self._point.year, self._metric_id, MetricValue(self._get().value, state)
+        )
 
-            # If we don't have a next point, try extrapolating with the previous two points
-            if previous_point is not None:
-                # Check if we have a second data point
-                second_previous_point = self._get_previous_value(
-                    previous_point[2], metric_id
-                )
 
-                # If we don't have a second next data point, we have to use the next one as is
-                if second_previous_point is None:
-                    metric_value.value = previous_point[1].value
-                    continue
-                # Otherwise we can extrapolate
-                metric_value.value = self._estimate_value(
-                    data.year,
-                    second_previous_point[0],
-                    second_previous_point[1].value,
-                    previous_point[0],
-                    previous_point[1].value,
-                )
+class Scenario:
+    """
+    Values of metrics over time
 
-    def _get_previous_value(
-        self, year_index: int, metric_id: str
-    ) -> tuple[int, MetricValue, int] | None:
-        for index in range(year_index - 1, -1, -1):
-            data = self.yearly_data[index]
-            metric_value = data.metric_data.get(metric_id, None)
-            if metric_value is not None and not metric_value.is_estimate:
-                return (data.year, metric_value, index)
-        return None
+    Years are stored sorted, in a single array. Per metric, the values and the states of
+    the values in each year are stored in arrays of the same length. Looking up a year
+    takes logarithmic time.
 
-    def _get_next_value(
-        self, year_index: int, metric_id: str
-    ) -> tuple[int, MetricValue, int] | None:
-        for index in range(year_index + 1, len(self.yearly_data)):
-            data = self.yearly_data[index]
-            metric_value = data.metric_data.get(metric_id, None)
-            if metric_value is not None and not metric_value.is_estimate:
-                return (data.year, metric_value, index)
+    A scenario copied with :meth:`copy_data_from` shares these arrays with the original,
+    until one of them changes its data.
+    """
 
-        return None
+    def __init__(self, scenario_id: str, name: str):
+        self.id = scenario_id
+        self.name = name
+        self._years = np.empty(0, dtype=np.int64)
+        self._values_by_metric_id: dict[str, np.ndarray] = {}
+        self._states_by_metric_id: dict[str, np.ndarray] = {}
+
+        # Whether the arrays may be shared with other scenarios
+        self._shares_data = False
+
+    @property
+    def years(self) -> np.ndarray:
+        """
+        Years for which the scenario contains data, sorted
+
+        The array returned must not be changed.
+        """
+        return self._years
+
+    @property
+    def metric_ids(self) -> list[str]:
+        return list(self._values_by_metric_id)
+
+    @property
+    def yearly_data(self) -> list[YearDataPoint]:
+        """
+        Views on the data of each year, sorted by year
+
+        Adding or removing points to or from the list returned does not change the scenario.
+        """
+        return [YearDataPoint(self, year) for year in self._years.tolist()]
+
+    @yearly_data.setter
+    def yearly_data(self, points: list[YearDataPoint]):
+        # Replace the data by the data of the points passed in. Projects saved before the
+        # data of scenarios was stored in arrays are restored by assigning the points saved
+        # with them.
+        value_by_metric_id_by_year = [
+            (
+                point.year,
+                {
+                    metric_id: MetricValue(metric_value.value, metric_value.state)
+                    for metric_id, metric_value in point.metric_data.items()
+                },
+            )
+            for point in points
+        ]
 
-    def _estimate_value(
-        self, x: float, x_1: float, y_1: float, x_2: float, y_2: float
-    ) -> float:
-        slope = (y_2 - y_1) / (x_2 - x_1)
-        return slope * (x - x_1) + y_1
+        self._years = np.empty(0, dtype=np.int64)
+        self._values_by_metric_id = {}
+        self._states_by_metric_id = {}
+        self._shares_data = False
+        self._changed()
 
-    def estimate_tipping_point(self, metric_id: str, metric_value: float) -> float:
-        if len(self.yearly_data) == 0:
-            return 0
+        for year, value_by_metric_id in value_by_metric_id_by_year:
+            self.get_or_add_year(year)
+
+            for metric_id, metric_value in value_by_metric_id.items():
+                self.set_data(year, metric_id, metric_value)
 
-        if len(self.yearly_data) == 1:
-            return self.yearly_data[0].year
+    def year_index(self, year: int) -> int | None:
+        idx = int(np.searchsorted(self._years, year))
 
-        # Find the global min and max to establish the bounds
-        global_min: tuple[float, float] = (0, 0)
-        has_global_min = False
-        global_max: tuple[float, float] = (0, 0)
-        has_global_max = False
+        if idx < len(self._years) and self._years[idx] == year:
+            return idx
 
-        for year_data in self.yearly_data:
-            year_value = year_data.metric_data.get(metric_id, None)
-            if year_value is None:
-                continue
+        return None
 
-            if not has_global_min or year_value.value < global_min[1]:
-                has_global_min = True
-                global_min = (year_data.year, year_value.value)
+    def get_or_add_year(self, year: int) -> YearDataPoint:
+        if self.year_index(year) is None:
+            self._insert_year(
+                year,
+                {metric_id: 0.0 for metric_id in self._values_by_metric_id},
+                {metric_id: _NO_VALUE for metric_id in self._states_by_metric_id},
+            )
 
-            if not has_global_max or year_value.value > global_max[1]:
-                has_global_max = True
-                global_max = (year_data.year, year_value.value)
+        return YearDataPoint(self, year)
 
-        # That means we don't have any valid data points for this metric
-        if not has_global_min or not has_global_max:
-            return 0
+    def get_data(self, year: int) -> YearDataPoint | None:
+        if self.year_index(year) is None:
+            return None
+        return YearDataPoint(self, year)
 
-        if metric_value <= global_min[1]:
-            return global_min[0]
+    def get_metric_value(self, year: int, metric_id: str) -> MetricValue | None:
+        idx = self.year_index(year)
 
-        if metric_value >= global_max[1]:
-            return global_max[0]
+        if idx is None or metric_id not in self._states_by_metric_id:
+            return None
 
-        for index, year_data in enumerate(self.yearly_data):
-            if index + 1 >= len(self.yearly_data):
-                continue
+        state = int(self._states_by_metric_id[metric_id][idx])
 
-            year_value = year_data.metric_data.get(metric_id, None)
-            if year_value is None:
-                continue
+        if state == _NO_VALUE:
+            return None
 
-            next_year_data = self.yearly_data[index + 1]
-            next_year_value = next_year_data.metric_data.get(metric_id, None)
+        return MetricValue(
+            float(self._values_by_metric_id[metric_id][idx]), _states[state]
+        )
 
-            if next_year_value is None:
-                continue
+    def set_data(self, year: int, metric_id: str, value: MetricValue):
+        self.get_or_add_year(year)
+        self._own_data()
+        values, states = self._column(metric_id)
+        idx = self.year_index(year)
+        values[idx] = value.value
+        states[idx] = _states.index(value.state)
+        self._changed()
+
+    def remove_year(self, year: int) -> bool:
+        """
+        Remove the data of a year
+
+        :return: Whether the scenario contained data for the year
+        """
+        idx = self.year_index(year)
+
+        if idx is None:
+            return False
+
+        self._years = np.delete(self._years, idx)
+
+        for columns in (self._values_by_metric_id, self._states_by_metric_id):
+            for metric_id, column in columns.items():
+                columns[metric_id] = np.delete(column, idx)
+
+        self._changed()
+
+        return True
+
+    def change_year(self, year: int, new_year: int):
+        """
+        Move the data of a year to another year, keeping the years sorted
+        """
+        idx = self.year_index(year)
+
+        if idx is None or new_year == year:
+            return
+
+        value_by_metric_id = {
+            metric_id: float(values[idx])
+            for metric_id, values in self._values_by_metric_id.items()
+        }
+        state_by_metric_id = {
+            metric_id: int(states[idx])
+            for metric_id, states in self._states_by_metric_id.items()
+        }
+        self.remove_year(year)
+        self._insert_year(new_year, value_by_metric_id, state_by_metric_id)
+
+    def copy_data_from(self, scenario: "Scenario"):
+        """
+        Replace the data of this scenario by the data of the scenario passed in
+
+        The data is not copied until one of the scenarios changes it.
+        """
+        self._years = scenario._years
+        self._values_by_metric_id = dict(scenario._values_by_metric_id)
+        self._states_by_metric_id = dict(scenario._states_by_metric_id)
+        self._shares_data = True
+        scenario._shares_data = True
+        self._changed()
+
+    def _own_data(self):
+        # Copy the arrays before they are changed, in case they are shared
+        if self._shares_data:
+            self._years = self._years.copy()
+
+            for columns in (self._values_by_metric_id, self._states_by_metric_id):
+                for metric_id, column in columns.items():
+                    columns[metric_id] = column.copy()
+
+            self._shares_data = False
+
+    def _column(self, metric_id: str) -> tuple[np.ndarray, np.ndarray]:
+        # Values and states of the metric, added in case the metric has no data yet
+        if metric_id not in self._values_by_metric_id:
+            self._values_by_metric_id[metric_id] = np.zeros(
+                len(self._years), dtype=np.float64
+            )
+            self._states_by_metric_id[metric_id] = np.full(
+                len(self._years), _NO_VALUE, dtype=np.int8
+            )
 
-            min_year, min_value, max_year, max_value = (
-                (
-                    year_data.year,
-                    year_value.value,
-                    next_year_data.year,
-                    next_year_value.value,
-                )
-                if year_value.value <= next_year_value.value
-                else (
-                    next_year_data.year,
-                    next_year_value.value,
-                    year_data.year,
-                    year_value.value,
+        return (
+            self._values_by_metric_id[metric_id],
+            self._states_by_metric_id[metric_id],
+        )
+
+    def _insert_year(
+        self,
+        year: int,
+        value_by_metric_id: dict[str, float],
+        state_by_metric_id: dict[str, int],
+    ):
+        # Insert a year at its sorted position. All arrays are replaced by new ones.
+        idx = int(np.searchsorted(self._years, year))
+        self._years = np.insert(self._years, idx, year)
+
+        for metric_id, values in self._values_by_metric_id.items():
+            self._values_by_metric_id[metric_id] = np.insert(
+                values, idx, value_by_metric_id[metric_id]
+            )
+
+        for metric_id, states in self._states_by_metric_id.items():
+            self._states_by_metric_id[metric_id] = np.insert(
+                states, idx, state_by_metric_id[metric_id]
+            )
+
+        self._changed()
+
+    def recalculate_values(self, metric_id: str):
+        Scenario.recalculate_all_values([self], [metric_id])
+
+    @staticmethod
+    def recalculate_all_values(
+        scenarios: Iterable["Scenario"], metric_ids: Iterable[str]
+    ):
+        """
+        Recalculate the estimated values of the metrics passed in, in all scenarios passed in
+
+        Years without a value are assigned an estimated value. Estimated values are
+        interpolated between the nearest years whose value is not estimated. Before the
+        first and after the last of these years, values are extrapolated from the two
+        nearest ones, or copied in case there is only one.
+
+        All values are calculated in one go.
+        """
+        metric_ids = list(metric_ids)
+        columns: list[tuple[np.ndarray, np.ndarray]] = []
+        years: list[np.ndarray] = []
+
+        for scenario in scenarios:
+            scenario._own_data()
+            scenario._changed()
+
+            for metric_id in metric_ids:
+                values, states = scenario._column(metric_id)
+                states[states == _NO_VALUE] = _ESTIMATE
+                columns.append((values, states))
+                years.append(scenario._years)
+
+        if not columns:
+            return
+
+        new_values = _estimate_values(
+            np.concatenate(years),
+            np.concatenate([values for values, _ in columns]),
+            np.concatenate([states != _ESTIMATE for _, states in columns]),
+            np.array([len(values) for values, _ in columns], dtype=np.int64),
+        )
+        offset = 0
+
+        for values, _ in columns:
+            values[:] = new_values[offset : offset + len(values)]
+            offset += len(values)
+
+    def estimate_tipping_point(self, metric_id: str, metric_value: float) -> float:
+        return float(
+            self.estimate_tipping_points(metric_id, np.array([metric_value]))[0]
+        )
+
+    def estimate_tipping_points(
+        self, metric_id: str, metric_values: np.ndarray
+    ) -> np.ndarray:
+        """
+        Estimate the years in which the metric reaches each of the values passed in
+
+        :return: New array with a year per value
+
+        Values at or beyond the smallest or largest value of the metric are mapped to the
+        year of that value. Other values are interpolated linearly in the first segment
+        between two consecutive years that contains them. Zero is returned in case there is
+        no data to estimate from.
+
+        What is needed to find the segments is calculated once after the scenario changed,
+        per metric. Finding the segment of each value then takes logarithmic time.
+        """
+        metric_values = np.asarray(metric_values, dtype=np.float64)
+
+        if len(self._years) == 1:
+            return np.full(len(metric_values), float(self._years[0]))
+
+        lookup_by_metric_id = _tipping_point_lookups_by_scenario.setdefault(self, {})
+        lookup = lookup_by_metric_id.get(metric_id, None)
+
+        if lookup is None:
+            lookup = _TippingPointLookup(
+                self._years,
+                self._values_by_metric_id.get(metric_id, np.zeros(len(self._years))),
+                self._states_by_metric_id.get(
+                    metric_id, np.full(len(self._years), _NO_VALUE)
                 )
+                != _NO_VALUE,
             )
+            lookup_by_metric_id[metric_id] = lookup
+
+        return lookup.estimate(metric_values)
+
+    def _changed(self):
+        # Forget what was calculated from the data
+        _tipping_point_lookups_by_scenario.pop(self, None)
+
+
+class _TippingPointLookup:
+    # Per metric of a scenario, the years and values needed to map metric values to years
+
+    def __init__(self, years: np.ndarray, values: np.ndarray, has_value: np.ndarray):
+        self.years = years.astype(np.float64)
+        self.values = values.copy()
+        value_idxs = np.flatnonzero(has_value)
+
+        # Index of the first smallest and first largest value
+        self.min_idx: int | None = None
+        self.max_idx: int | None = None
+
+        if len(value_idxs) > 0:
+            self.min_idx = int(value_idxs[np.argmin(self.values[value_idxs])])
+            self.max_idx = int(value_idxs[np.argmax(self.values[value_idxs])])
+
+        # Segments connect consecutive years that both have a value. Per run of connected
+        # segments: the index of its first year, and per segment, the largest and the
+        # negated smallest value of the run up to and including the segment. Both are
+        # sorted. Within a run, the first segment containing a value is the first one at
+        # which both the largest value is at least and the smallest value is at most that
+        # value.
+        self.runs: list[tuple[int, np.ndarray, np.ndarray]] = []
+        segment_idxs = np.flatnonzero(has_value[:-1] & has_value[1:])
+
+        for run_idxs in np.split(
+            segment_idxs, np.flatnonzero(np.diff(segment_idxs) != 1) + 1
+        ):
+            if len(run_idxs) > 0:
+                first_idx, last_idx = int(run_idxs[0]), int(run_idxs[-1])
+                run_values = self.values[first_idx : last_idx + 2]
+                self.runs.append(
+                    (
+                        first_idx,
+                        np.maximum.accumulate(run_values)[1:],
+                        -np.minimum.accumulate(run_values)[1:],
+                    )
+                )
+
+    def estimate(self, metric_values: np.ndarray) -> np.ndarray:
+        result = np.zeros(len(metric_values))
 
-            if metric_value < min_value or metric_value > max_value:
-                continue
+        if self.min_idx is None or self.max_idx is None:
+            return result
 
-            return self._estimate_value(
-                metric_value, min_value, float(min_year), max_value, float(max_year)
+        # Index of the first year of the first segment containing each value
+        nr_years = len(self.years)
+        idxs = np.full(len(metric_values), nr_years)
+
+        for first_idx, max_values, negated_min_values in self.runs:
+            run_idxs = np.maximum(
+                np.searchsorted(max_values, metric_values, side="left"),
+                np.searchsorted(negated_min_values, -metric_values, side="left"),
+            )
+            idxs = np.where(
+                run_idxs < len(max_values),
+                np.minimum(idxs, first_idx + run_idxs),
+                idxs,
             )
 
-        # We should never get here, but just in case
-        return 0
+        found = idxs < nr_years
+        idxs = idxs[found]
+        value_1, value_2 = self.values[idxs], self.values[idxs + 1]
+        year_1, year_2 = self.years[idxs], self.years[idxs + 1]
+        is_increasing = value_1 <= value_2
+        min_value = np.where(is_increasing, value_1, value_2)
+        max_value = np.where(is_increasing, value_2, value_1)
+        min_year = np.where(is_increasing, year_1, year_2)
+        max_year = np.where(is_increasing, year_2, year_1)
+
+        # Segments along which the value does not change map to their first year
+        is_flat = min_value == max_value
+        min_value = np.where(is_flat, 0, min_value)
+        max_value = np.where(is_flat, 1, max_value)
+        slope = (max_year - min_year) / (max_value - min_value)
+        result[found] = np.where(
+            is_flat, min_year, slope * (metric_values[found] - min_value) + min_year
+        )
+
+        result = np.where(
+            metric_values >= self.values[self.max_idx], self.years[self.max_idx], result
+        )
+        result = np.where(
+            metric_values <= self.values[self.min_idx], self.years[self.min_idx], result
+        )
+
+        return result
+
+
+# Not part of the scenarios themselves, to keep it out of saved projects
+_tipping_point_lookups_by_scenario: weakref.WeakKeyDictionary[
+    Scenario, dict[str, _TippingPointLookup]
+] = weakref.WeakKeyDictionary()
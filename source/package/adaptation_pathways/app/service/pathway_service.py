@@ -1,23 +1,607 @@
-# pylint: disable=unused-argument
+# pylint: disable=too-many-return-statements
 """
 Handles communication between the front-end app and backend code related to Pathways
 """
 
-from model.action import Action
-from model.filter import ActionFilter, GenerationConstraints, MetricFilter
-from model.metric import Metric, MetricEstimate
-from model.pathway import Pathway
+import itertools
+import typing
+import weakref
+
+import numpy as np
+
+from ..model.action import Action
+from ..model.comparisons import NumberComparison, SequenceComparison
+from ..model.filter import ActionFilter, GenerationConstraints, MetricFilter
+from ..model.metric import Metric, MetricValue, MetricValueState
+from ..model.pathway import Pathway
+from ..model.pathways_project import PathwaysProject
+
+
+def _sequence_starts_with(
+    action_ids: list[str], filter_action_ids: list[str], in_order: bool
+) -> bool:
+    head = action_ids[: len(filter_action_ids)]
+
+    if in_order:
+        return head == filter_action_ids
+
+    return len(head) == len(filter_action_ids) and set(head) == set(filter_action_ids)
+
+
+def _sequence_contains(
+    action_ids: list[str], filter_action_ids: list[str], in_order: bool
+) -> bool:
+    if in_order:
+        # Filter actions must occur as a subsequence
+        remaining_action_ids = iter(action_ids)
+        return all(action_id in remaining_action_ids for action_id in filter_action_ids)
+
+    return set(filter_action_ids).issubset(action_ids)
+
+
+def _sequence_matches(action_ids: list[str], action_filter: ActionFilter) -> bool:
+    """
+    Return whether a sequence of actions matches an action filter
+
+    :param action_ids: IDs of the actions in the sequence, excluding the current situation
+    """
+    filter_action_ids = [action.id for action in action_filter.actions]
+    in_order = action_filter.actions_in_order
+
+    match action_filter.relation:
+        case SequenceComparison.STARTS_WITH:
+            return _sequence_starts_with(action_ids, filter_action_ids, in_order)
+        case SequenceComparison.DOESNT_START_WITH:
+            return not _sequence_starts_with(action_ids, filter_action_ids, in_order)
+        case SequenceComparison.CONTAINS:
+            return _sequence_contains(action_ids, filter_action_ids, in_order)
+        case SequenceComparison.DOESNT_CONTAIN:
+            return not _sequence_contains(action_ids, filter_action_ids, in_order)
+        case SequenceComparison.ENDS_WITH:
+            return _sequence_starts_with(
+                action_ids[::-1], filter_action_ids[::-1], in_order
+            )
+        case SequenceComparison.DOESNT_END_WITH:
+            return not _sequence_starts_with(
+                action_ids[::-1], filter_action_ids[::-1], in_order
+            )
+
+    raise ValueError(f"Unsupported sequence comparison: {action_filter.relation}")
+
+
+def _sequence_can_match(
+    action_ids: list[str], action_filter: ActionFilter, nr_actions_to_add: int
+) -> bool:
+    """
+    Return whether a sequence of actions, or a sequence starting with it, can match an action
+    filter
+
+    :param action_ids: IDs of the actions in the sequence, excluding the current situation
+    :param nr_actions_to_add: Maximum number of actions that can still be added to the
+        sequence. Actions occur at most once in a sequence.
+
+    A return value of True does not imply that a matching sequence exists.
+    """
+    filter_action_ids = [action.id for action in action_filter.actions]
+    nr_filter_actions = len(filter_action_ids)
+    in_order = action_filter.actions_in_order
+
+    match action_filter.relation:
+        case SequenceComparison.STARTS_WITH:
+            head = action_ids[:nr_filter_actions]
+            return len(action_ids) + nr_actions_to_add >= nr_filter_actions and (
+                head == filter_action_ids[: len(head)]
+                if in_order
+                else set(head).issubset(filter_action_ids)
+            )
+        case SequenceComparison.DOESNT_START_WITH:
+            # Once the head of the sequence is complete, it does not change anymore
+            return len(action_ids) < nr_filter_actions or _sequence_matches(
+                action_ids, action_filter
+            )
+        case SequenceComparison.CONTAINS:
+            if in_order:
+                # Number of filter actions matched in order. Filter actions following these
+                # must still be added, and cannot be part of the sequence already.
+                nr_matched = 0
+
+                for action_id in action_ids:
+                    if (
+                        nr_matched < nr_filter_actions
+                        and action_id == filter_action_ids[nr_matched]
+                    ):
+                        nr_matched += 1
+
+                missing_action_ids = filter_action_ids[nr_matched:]
+
+                if not set(missing_action_ids).isdisjoint(action_ids):
+                    return False
+            else:
+                missing_action_ids = list(set(filter_action_ids).difference(action_ids))
+
+            return len(missing_action_ids) <= nr_actions_to_add
+        case SequenceComparison.DOESNT_CONTAIN:
+            # Once a sequence contains the filter actions, all sequences starting with it do
+            return _sequence_matches(action_ids, action_filter)
+        case SequenceComparison.ENDS_WITH:
+            return len(action_ids) + nr_actions_to_add >= nr_filter_actions
+        case SequenceComparison.DOESNT_END_WITH:
+            return True
+
+    raise ValueError(f"Unsupported sequence comparison: {action_filter.relation}")
+
+
+def _range_can_match(low: float, high: float, metric_filter: MetricFilter) -> bool:
+    """
+    Return whether a value in the range [low, high] can match a metric filter
+    """
+    value = metric_filter.value
+
+    match metric_filter.relation:
+        case NumberComparison.EQUAL:
+            return low <= value <= high
+        case NumberComparison.DOESNT_EQUAL:
+            return not low == high == value
+        case NumberComparison.LESS_THAN:
+            return low < value
+        case NumberComparison.LESS_THAN_OR_EQUAL:
+            return low <= value
+        case NumberComparison.GREATER_THAN:
+            return high > value
+        case NumberComparison.GREATER_THAN_OR_EQUAL:
+            return high >= value
+
+    raise ValueError(f"Unsupported number comparison: {metric_filter.relation}")
+
+
+def _value_matches(value: float, metric_filter: MetricFilter) -> bool:
+    return _range_can_match(value, value, metric_filter)
+
+
+def _reachable_range(
+    value: float, metric_id: str, actions: list[Action], nr_actions_to_add: int
+) -> tuple[float, float]:
+    """
+    Return a range containing all values a metric can attain when adding at most
+    ``nr_actions_to_add`` of the actions passed in to a sequence
+
+    The range returned can be larger than the smallest range containing these values.
+    """
+    effects = [
+        action.metric_data[metric_id]
+        for action in actions
+        if metric_id in action.metric_data
+    ]
+    low = high = value
+
+    for _ in range(nr_actions_to_add):
+        new_low, new_high = low, high
+
+        for effect in effects:
+            effect_low, effect_high = effect.apply_to_range(low, high)
+            new_low = min(new_low, effect_low)
+            new_high = max(new_high, effect_high)
+
+        if (new_low, new_high) == (low, high):
+            break
+
+        low, high = new_low, new_high
+
+    return low, high
+
+
+def _generate_pathways(
+    current_situation: Action,
+    all_actions: list[Action],
+    all_metrics: list[Metric],
+    constraints: GenerationConstraints,
+) -> typing.Iterator[Pathway]:
+    # pylint: disable=too-many-locals, too-many-statements
+    actions = [action for action in all_actions if action.id != current_situation.id]
+    max_sequence_length = len(actions)
+
+    if constraints.max_sequence_length is not None:
+        max_sequence_length = min(max_sequence_length, constraints.max_sequence_length)
+
+    metric_ids = list(
+        dict.fromkeys(
+            [metric.id for metric in all_metrics]
+            + [
+                metric_filter.metric.id
+                for metric_filter in constraints.metric_constraints
+            ]
+        )
+    )
+
+    # State of the sequence currently visited, per action added: pathway, actions that
+    # can still be added, and metric values
+    action_ids: list[str] = []
+    pathways: list[Pathway] = []
+    actions_to_visit: list[typing.Iterator[Action]] = []
+    values: list[dict[str, float]] = []
+
+    # Generated pathways are numbered in the order in which they are visited
+    pathway_ids = itertools.count(1)
+
+    # Pathways in the current sequence that have been yielded already. These always form
+    # a prefix of the sequence.
+    nr_pathways_yielded = 0
+
+    def is_viable(value_by_metric_id: dict[str, float]) -> bool:
+        nr_actions_to_add = max_sequence_length - len(action_ids)
+
+        if not all(
+            _sequence_can_match(action_ids, action_filter, nr_actions_to_add)
+            for action_filter in constraints.action_constraints
+        ):
+            return False
+
+        if constraints.metric_constraints:
+            used_action_ids = set(action_ids)
+            remaining_actions = [
+                action for action in actions if action.id not in used_action_ids
+            ]
+
+            for metric_filter in constraints.metric_constraints:
+                if not _range_can_match(
+                    *_reachable_range(
+                        value_by_metric_id[metric_filter.metric.id],
+                        metric_filter.metric.id,
+                        remaining_actions,
+                        nr_actions_to_add,
+                    ),
+                    metric_filter,
+                ):
+                    return False
+
+        return True
+
+    def is_admissible(value_by_metric_id: dict[str, float]) -> bool:
+        return all(
+            _sequence_matches(action_ids, action_filter)
+            for action_filter in constraints.action_constraints
+        ) and all(
+            _value_matches(value_by_metric_id[metric_filter.metric.id], metric_filter)
+            for metric_filter in constraints.metric_constraints
+        )
+
+    def push(pathway: Pathway, value_by_metric_id: dict[str, float]) -> None:
+        pathways.append(pathway)
+        values.append(value_by_metric_id)
+        actions_to_visit.append(
+            iter(actions if len(action_ids) < max_sequence_length else ())
+        )
+
+    def pop() -> None:
+        nonlocal nr_pathways_yielded
+
+        if action_ids:
+            action_ids.pop()
+
+        pathways.pop()
+        values.pop()
+        actions_to_visit.pop()
+        nr_pathways_yielded = min(nr_pathways_yielded, len(pathways))
+
+    # The current situation is the base of the metric values estimated
+    value_by_metric_id = {metric_id: 0.0 for metric_id in metric_ids}
+
+    if not is_viable(value_by_metric_id):
+        return
+
+    root = Pathway(next(pathway_ids), current_situation.id)
+    root.metric_data = {
+        metric.id: MetricValue(0.0, MetricValueState.BASE) for metric in all_metrics
+    }
+    push(root, value_by_metric_id)
+
+    if is_admissible(value_by_metric_id):
+        yield root
+        nr_pathways_yielded = 1
+
+    while actions_to_visit:
+        action = next(actions_to_visit[-1], None)
+
+        if action is None:
+            pop()
+            continue
+
+        if action.id in action_ids:
+            continue
+
+        parent_value_by_metric_id = values[-1]
+        value_by_metric_id = {
+            metric_id: action.apply_effect(metric_id, value)
+            for metric_id, value in parent_value_by_metric_id.items()
+        }
+        action_ids.append(action.id)
+
+        if not is_viable(value_by_metric_id):
+            action_ids.pop()
+            continue
+
+        pathway = Pathway(next(pathway_ids), action.id, pathways[-1].id)
+        pathway.metric_data = {
+            metric.id: MetricValue(
+                value_by_metric_id[metric.id], MetricValueState.ESTIMATE
+            )
+            for metric in all_metrics
+        }
+        push(pathway, value_by_metric_id)
+
+        if is_admissible(value_by_metric_id):
+            # Yield the ancestors not yielded yet first, so the parent of each pathway
+            # yielded precedes it
+            yield from pathways[nr_pathways_yielded:]
+            nr_pathways_yielded = len(pathways)
+
+
+_relation_by_negated_relation = {
+    SequenceComparison.DOESNT_START_WITH: SequenceComparison.STARTS_WITH,
+    SequenceComparison.DOESNT_CONTAIN: SequenceComparison.CONTAINS,
+    SequenceComparison.DOESNT_END_WITH: SequenceComparison.ENDS_WITH,
+}
+
+
+class _PathwayIndex:
+    """
+    Indexes of the pathways of a project, for answering filter queries
+
+    The sequence of actions of each pathway is determined once. Pathways are indexed by the
+    actions they contain and by their first and last action. Metric values are stored sorted,
+    per metric. These are sorted again after the project reports a change in the values.
+    """
+
+    def __init__(self, project: PathwaysProject) -> None:
+        self.revision = project.pathways_revision
+        self.pathways = list(project.all_pathways)
+        self.action_ids_by_pathway: list[list[str]] = []
+        self.idxs_by_action_id: dict[str, set[int]] = {}
+        self.idxs_by_first_action_id: dict[str, set[int]] = {}
+        self.idxs_by_last_action_id: dict[str, set[int]] = {}
+
+        # Per metric: revision of the values when sorted, and the indices of pathways having
+        # a value, together with these values, sorted by value
+        self.sorted_values_by_metric_id: dict[
+            str, tuple[int, np.ndarray, np.ndarray]
+        ] = {}
+
+        pathway_by_id = {pathway.id: pathway for pathway in self.pathways}
+        action_ids_by_pathway_id: dict[int, list[str]] = {}
+
+        def action_ids(pathway: Pathway) -> list[str]:
+            # Actions following the root pathway's action (the current situation)
+            chain: list[Pathway] = []
+
+            while pathway.id not in action_ids_by_pathway_id:
+                chain.append(pathway)
+
+                if pathway.parent_id is None or pathway.parent_id not in pathway_by_id:
+                    action_ids_by_pathway_id[pathway.id] = (
+                        [] if pathway.parent_id is None else [pathway.action_id]
+                    )
+                    chain.pop()
+                    break
+
+                pathway = pathway_by_id[pathway.parent_id]
+
+            result = action_ids_by_pathway_id[pathway.id]
+
+            for descendant in reversed(chain):
+                result = result + [descendant.action_id]
+                action_ids_by_pathway_id[descendant.id] = result
+
+            return result
+
+        for idx, pathway in enumerate(self.pathways):
+            pathway_action_ids = action_ids(pathway)
+            self.action_ids_by_pathway.append(pathway_action_ids)
+
+            for action_id in pathway_action_ids:
+                self.idxs_by_action_id.setdefault(action_id, set()).add(idx)
+
+            if pathway_action_ids:
+                self.idxs_by_first_action_id.setdefault(
+                    pathway_action_ids[0], set()
+                ).add(idx)
+                self.idxs_by_last_action_id.setdefault(
+                    pathway_action_ids[-1], set()
+                ).add(idx)
+
+    def is_valid_for(self, project: PathwaysProject) -> bool:
+        return self.revision == project.pathways_revision
+
+    def _sorted_values(
+        self, project: PathwaysProject, metric_id: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        revision = project.values_revision(metric_id)
+        sorted_values = self.sorted_values_by_metric_id.get(metric_id, None)
+
+        if sorted_values is None or sorted_values[0] != revision:
+            values: list[float | None] = []
+
+            for pathway in self.pathways:
+                metric_value = pathway.metric_data.get(metric_id, None)
+                values.append(None if metric_value is None else metric_value.value)
+
+            idxs = np.array(
+                [idx for idx, value in enumerate(values) if value is not None],
+                dtype=np.int64,
+            )
+            values_array = np.array(
+                [value for value in values if value is not None], dtype=np.float64
+            )
+            order = np.argsort(values_array, kind="stable")
+            sorted_values = (revision, values_array[order], idxs[order])
+            self.sorted_values_by_metric_id[metric_id] = sorted_values
+
+        return sorted_values[1], sorted_values[2]
+
+    def _select_by_metric(
+        self, project: PathwaysProject, metric_filter: MetricFilter
+    ) -> set[int]:
+        values, idxs = self._sorted_values(project, metric_filter.metric.id)
+        value = metric_filter.value
+        begin = np.searchsorted(values, value, side="left")
+        end = np.searchsorted(values, value, side="right")
+
+        match metric_filter.relation:
+            case NumberComparison.EQUAL:
+                selection = idxs[begin:end]
+            case NumberComparison.DOESNT_EQUAL:
+                selection = np.concatenate((idxs[:begin], idxs[end:]))
+            case NumberComparison.LESS_THAN:
+                selection = idxs[:begin]
+            case NumberComparison.LESS_THAN_OR_EQUAL:
+                selection = idxs[:end]
+            case NumberComparison.GREATER_THAN:
+                selection = idxs[end:]
+            case NumberComparison.GREATER_THAN_OR_EQUAL:
+                selection = idxs[begin:]
+            case _:
+                raise ValueError(
+                    f"Unsupported number comparison: {metric_filter.relation}"
+                )
+
+        return set(selection.tolist())
+
+    def _select_by_actions(
+        self,
+        relation: SequenceComparison,
+        action_filter: ActionFilter,
+        candidate_idxs: set[int] | None,
+    ) -> set[int] | None:
+        # Candidates matching the filter, given a relation that is not a negation. Candidates
+        # None stands for all pathways.
+        filter_action_ids = [action.id for action in action_filter.actions]
+
+        if not filter_action_ids:
+            return candidate_idxs
+
+        match relation:
+            case SequenceComparison.CONTAINS:
+                # Pathways containing all filter actions, starting with the smallest set
+                idx_sets = sorted(
+                    (
+                        self.idxs_by_action_id.get(action_id, set())
+                        for action_id in filter_action_ids
+                    ),
+                    key=len,
+                )
+
+                if candidate_idxs is not None:
+                    idx_sets.insert(0, candidate_idxs)
+
+                idxs = set(idx_sets[0]).intersection(*idx_sets[1:])
+            case SequenceComparison.STARTS_WITH | SequenceComparison.ENDS_WITH:
+                # Pathways starting (ending) with the first (last) filter action, or with
+                # any of the filter actions in case their order does not matter
+                if relation == SequenceComparison.STARTS_WITH:
+                    idxs_by_action_id = self.idxs_by_first_action_id
+                    action_ids = filter_action_ids[:1]
+                else:
+                    idxs_by_action_id = self.idxs_by_last_action_id
+                    action_ids = filter_action_ids[-1:]
+
+                if not action_filter.actions_in_order:
+                    action_ids = filter_action_ids
+
+                idxs = set()
+
+                for action_id in action_ids:
+                    action_idxs = idxs_by_action_id.get(action_id, set())
+                    idxs |= (
+                        action_idxs
+                        if candidate_idxs is None
+                        else candidate_idxs & action_idxs
+                    )
+            case _:
+                raise ValueError(f"Unsupported sequence comparison: {relation}")
+
+        # Only the pathways found in the index are checked in full
+        action_filter = ActionFilter(
+            relation, action_filter.actions, action_filter.actions_in_order
+        )
+
+        return {
+            idx
+            for idx in idxs
+            if _sequence_matches(self.action_ids_by_pathway[idx], action_filter)
+        }
+
+    def filter(
+        self,
+        project: PathwaysProject,
+        action_filters: list[ActionFilter],
+        metric_filters: list[MetricFilter],
+    ) -> list[Pathway]:
+        # Selected pathways, None standing for all pathways. Narrowing down the selection
+        # only visits the pathways found in the index.
+        idxs: set[int] | None = None
+
+        for metric_filter in metric_filters:
+            selected_idxs = self._select_by_metric(project, metric_filter)
+            idxs = selected_idxs if idxs is None else idxs & selected_idxs
+
+        for action_filter in action_filters:
+            if action_filter.relation in _relation_by_negated_relation:
+                matching_idxs = self._select_by_actions(
+                    _relation_by_negated_relation[action_filter.relation],
+                    action_filter,
+                    idxs,
+                )
+
+                if matching_idxs is None:
+                    idxs = set()
+                else:
+                    if idxs is None:
+                        idxs = set(range(len(self.pathways)))
+
+                    idxs -= matching_idxs
+            else:
+                idxs = self._select_by_actions(
+                    action_filter.relation, action_filter, idxs
+                )
+
+        if idxs is None:
+            return list(self.pathways)
+
+        return [self.pathways[idx] for idx in sorted(idxs)]
+
+
+# Not part of the project itself, to keep it out of saved projects
+_pathway_index_by_project: weakref.WeakKeyDictionary[PathwaysProject, _PathwayIndex] = (
+    weakref.WeakKeyDictionary()
+)
 
 
 class PathwayService:
     @staticmethod
     def filter_pathways(
-        all_pathways: list[Pathway],
+        project: PathwaysProject,
         action_filters: list[ActionFilter],
         metric_filters: list[MetricFilter],
     ) -> list[Pathway]:
-        # Replace with actual filtering code
-        return all_pathways
+        """
+        Return the pathways of a project that satisfy all filters passed in
+
+        :param project: Project containing the pathways to filter. Action filters apply to
+            the actions following the root pathway's action.
+        :return: Pathways selected, in the order of the project. Pathways without a value
+            for the metric of a metric filter are not selected.
+
+        The pathways of a project are indexed upon the first call. The index is reused until
+        pathways are created or deleted. Values are sorted again, per metric, after they are
+        updated through the project. Filters are answered by looking up the pathways they
+        select, without visiting the other pathways.
+        """
+        index = _pathway_index_by_project.get(project, None)
+
+        if index is None or not index.is_valid_for(project):
+            index = _PathwayIndex(project)
+            _pathway_index_by_project[project] = index
+
+        return index.filter(project, action_filters, metric_filters)
 
     @staticmethod
     def generate_pathways(
@@ -25,7 +609,23 @@ class PathwayService:
         all_actions: list[Action],
         all_metrics: list[Metric],
         constraints: GenerationConstraints,
-    ) -> list[Pathway]:
-        # Generate all pathways that don't violate the provided constraints
-        # Estimate a value for each metric based on its Metric.estimate method
-        return []
+    ) -> typing.Iterator[Pathway]:
+        """
+        Generate all pathways that don't violate the constraints passed in
+
+        :param current_situation: Action all pathways start with
+        :param all_actions: Actions to generate sequences of. Each action occurs at most
+            once in a pathway.
+        :param all_metrics: Metrics to estimate a value for, per pathway
+        :param constraints: Constraints pathways must satisfy. Action filters and the maximum
+            sequence length apply to the actions following the current situation.
+        :return: Iterator over the pathways, generated lazily. The parent of each pathway
+            precedes it. Pathways that only lead to admissible pathways are also generated.
+
+        Metric values are estimated along each sequence of actions, starting from a value of
+        zero for the current situation. Sequences are extended depth-first. A sequence is not
+        extended anymore as soon as no sequence starting with it can satisfy the constraints.
+        """
+        return _generate_pathways(
+            current_situation, all_actions, all_metrics, constraints
+        )
@@ -2,21 +2,23 @@
 """
 Methods for drawing charts and graphs
 """
+import weakref
 from typing import Any
 
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
 from adaptation_pathways.action import Action
-from adaptation_pathways.alias import Sequence, TippingPointByAction
+from adaptation_pathways.alias import TippingPointByAction
 from adaptation_pathways.app.model.pathway import Pathway
 from adaptation_pathways.app.model.pathways_project import PathwaysProject
 from adaptation_pathways.app.model.scenario import Scenario
 from adaptation_pathways.graph import (
+    PathwayMapUpdater,
     SequenceGraph,
-    sequence_graph_to_pathway_map,
     verify_tipping_points,
 )
 from adaptation_pathways.graph.node.action import Action as ActionNode
@@ -27,13 +29,85 @@ from adaptation_pathways.plot.util import init_axes
 matplotlib.use("svg")
 
 
+class _MetroMap:
+    """
+    Sequence graph and pathway map of a project, kept up to date between draws
+
+    Only the pathways added or removed since the previous draw result in changes to the
+    pathway map.
+    """
+
+    sequence_graph: SequenceGraph
+    updater: PathwayMapUpdater
+    action_node_by_pathway_id: dict[int, ActionNode]
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self.sequence_graph = SequenceGraph()
+        self.updater = PathwayMapUpdater(self.sequence_graph)
+        self.action_node_by_pathway_id = {}
+
+    def update(self, project: PathwaysProject) -> None:
+        pathways = list(project.all_pathways)
+        pathway_ids = {pathway.id for pathway in pathways}
+
+        # Node labels are formatted from action names once, and the pathway map indexes
+        # nodes by action name. Start over in case an action was renamed.
+        for pathway in pathways:
+            known_node = self.action_node_by_pathway_id.get(pathway.id, None)
+
+            if (
+                known_node is not None
+                and known_node.action.name != project.get_action(pathway.action_id).name
+            ):
+                self.updater.close()
+                self._reset()
+                break
+
+        for pathway_id in [
+            pathway_id
+            for pathway_id in self.action_node_by_pathway_id
+            if pathway_id not in pathway_ids
+        ]:
+            removed_node = self.action_node_by_pathway_id.pop(pathway_id)
+
+            if removed_node in self.sequence_graph:
+                self.sequence_graph.remove_action(removed_node)
+
+        new_pathways: list[Pathway] = []
+
+        # Create action node for each new pathway
+        for pathway in pathways:
+            if pathway.id not in self.action_node_by_pathway_id:
+                self.action_node_by_pathway_id[pathway.id] = ActionNode(
+                    Action(project.get_action(pathway.action_id).name)
+                )
+                new_pathways.append(pathway)
+
+        # Populate sequences
+        for pathway in new_pathways:
+            if pathway.parent_id is None:
+                continue
+
+            self.sequence_graph.add_sequence(
+                self.action_node_by_pathway_id[pathway.parent_id],
+                self.action_node_by_pathway_id[pathway.id],
+            )
+
+
+_metro_map_by_project: weakref.WeakKeyDictionary[PathwaysProject, _MetroMap] = (
+    weakref.WeakKeyDictionary()
+)
+
+
 class PlottingService:
     @staticmethod
     def draw_metro_map(
         project: PathwaysProject, for_export=False
     ) -> tuple[Figure, Axes]:
 
-        action_nodes: dict[str, ActionNode] = {}
         tipping_points: TippingPointByAction = {}
         action_colors: dict[str, str] = {}
         root_pathway = project.root_pathway
@@ -42,43 +116,47 @@ class PlottingService:
             None if not project.graph_is_time else project.graph_scenario
         )
 
-        def get_tipping_point(pathway: Pathway) -> float:
+        def get_metric_value(pathway: Pathway) -> float | None:
             metric_value = pathway.metric_data.get(metric.id, None)
             if metric_value is None:
                 metric_value = root_pathway.metric_data.get(metric.id, None)
 
             if metric_value is None:
-                return 0
-
-            if scenario is not None:
-                return scenario.estimate_tipping_point(metric.id, metric_value.value)
+                return None
 
             return metric_value.value
 
-        # Create action node for each pathway
-        for pathway in project.all_pathways:
-            pathway_action = project.get_action(pathway.action_id)
-            action = Action(pathway_action.name)
-            action_node = ActionNode(action)
-            action_nodes[pathway.id] = action_node
-            action_colors[action.name] = pathway_action.color
-            tipping_points[action] = get_tipping_point(pathway)
+        metro_map = _metro_map_by_project.get(project, None)
 
-        # Populate sequences
-        sequence_graph = SequenceGraph()
-        sequences: list[Sequence] = []
+        if metro_map is None:
+            metro_map = _MetroMap()
+            _metro_map_by_project[project] = metro_map
 
-        for pathway in project.all_pathways:
-            if pathway.parent_id is None:
-                continue
+        metro_map.update(project)
+
+        pathways = list(project.all_pathways)
+
+        # Pathways without a value have a tipping point of zero. All tipping points are
+        # estimated in one go.
+        values = [get_metric_value(pathway) for pathway in pathways]
+        has_value = np.array([value is not None for value in values], dtype=bool)
+        metric_values = np.array(
+            [0.0 if value is None else value for value in values], dtype=np.float64
+        )
+
+        if scenario is not None:
+            metric_values = scenario.estimate_tipping_points(metric.id, metric_values)
 
-            action_node = action_nodes[pathway.id]
-            parent_action_node = action_nodes[pathway.parent_id]
-            sequence_graph.add_sequence(parent_action_node, action_node)
-            sequences.append((parent_action_node.action, action_node.action))
+        for pathway, tipping_point in zip(
+            pathways, np.where(has_value, metric_values, 0).tolist()
+        ):
+            project_action = project.get_action(pathway.action_id)
+            map_action = metro_map.action_node_by_pathway_id[pathway.id].action
+            action_colors[map_action.name] = project_action.color
+            tipping_points[map_action] = tipping_point
 
         # Mostly copied from plot_pathway_map.py
-        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+        pathway_map = metro_map.updater.pathway_map
 
         verify_tipping_points(pathway_map, tipping_points)
 
@@ -1,19 +1,29 @@
 import base64
 
 import jsonpickle
+import jsonpickle.ext.numpy as jsonpickle_numpy
 
 from ..model.pathways_project import PathwaysProject
 
 
+# Scenarios store their data in NumPy arrays
+jsonpickle_numpy.register_handlers()
+
+
 class ProjectService:
     @staticmethod
     def to_json(project: PathwaysProject) -> str:
-        text: str = jsonpickle.encode(project)
+        # Keys that are not strings, like pathway IDs, are stored as such
+        text: str = jsonpickle.encode(project, keys=True)
         return text
 
     @staticmethod
     def from_json(project_json: str) -> PathwaysProject:
-        project = jsonpickle.decode(project_json)
+        project = jsonpickle.decode(project_json, keys=True)
+
+        # Projects saved by earlier versions are restored without calling __setstate__
+        project.migrate()
+
         return project
 
     @staticmethod
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 
 from ..graph import SequenceGraph, sequence_graph_to_pathway_map, verify_tipping_points
 from ..io import read_dataset
+from ..io.cache import cache_key, read_pathway_map, write_pathway_map
 from ..plot.bar_plot import plot_bars
 from ..plot.util import init_axes, save_plot
 from ..version import __version__ as version
@@ -20,6 +21,7 @@ def plot_bars_(
     *,
     arguments,
     legend_arguments,
+    cache_directory: str | None = None,
 ) -> int:
 
     # pylint: disable-next=unused-variable
@@ -27,10 +29,24 @@ def plot_bars_(
         basename_pathname
     )
 
-    sequence_graph = SequenceGraph(sequences)
-    pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+    key = cache_key(sequences, tipping_point_by_action)
+    cached = (
+        read_pathway_map(cache_directory, key, sequences)
+        if cache_directory is not None
+        else None
+    )
+
+    if cached is not None:
+        # The tipping points are part of the key, and have been verified already
+        pathway_map = cached[0]
+    else:
+        sequence_graph = SequenceGraph(sequences)
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
 
-    verify_tipping_points(pathway_map, tipping_point_by_action)
+        verify_tipping_points(pathway_map, tipping_point_by_action)
+
+        if cache_directory is not None:
+            write_pathway_map(cache_directory, key, sequences, pathway_map)
 
     _, axes = plt.subplots(layout="constrained")
     init_axes(axes)
@@ -77,7 +93,8 @@ Plot bars
 
 Usage:
     {command} [--title=<title>] [--x_label=<label>] [--show_legend]
-        [--stack_bars] <basename> <plot>
+        [--stack_bars] [--cache=<directory>]
+        [--sample=<count> [--seed=<seed>]] <basename> <plot>
 
 Arguments:
     basename           Either, the name without postfix and extension of text
@@ -90,6 +107,14 @@ Arguments:
 Options:
     -h --help          Show this screen and exit
     --version          Show version and exit
+    --cache=<directory>
+                       Directory for storing the pathway map. When plotting
+                       a dataset again, with the same tipping points, it is
+                       read from it instead of being recalculated.
+    --sample=<count>   Plot a uniform random sample of this number of
+                       pathways, instead of all pathways
+    --seed=<seed>      Seed of the random number generator used for
+                       sampling pathways
     --show_legend      Show legend
     --stack_bars       Stack bars
     --title=<title>    Title
@@ -111,10 +136,17 @@ Examples:
     x_label = arguments["--x_label"] if arguments["--x_label"] is not None else ""
     show_legend = arguments["--show_legend"]
     stack_bars = arguments["--stack_bars"]
+    cache_directory = arguments["--cache"]
+    sample_size = (
+        int(arguments["--sample"]) if arguments["--sample"] is not None else None
+    )
+    sample_seed = int(arguments["--seed"]) if arguments["--seed"] is not None else None
 
     plot_arguments: dict[str, typing.Any] = {
         "title": title,
         "x_label": x_label,
+        "sample_seed": sample_seed,
+        "sample_size": sample_size,
         "show_legend": show_legend,
         "stack_bars": stack_bars,
     }
@@ -133,4 +165,5 @@ Examples:
         plot_pathname,
         arguments=plot_arguments,
         legend_arguments=legend_arguments,
+        cache_directory=cache_directory,
     )
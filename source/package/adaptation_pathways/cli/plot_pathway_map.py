@@ -7,7 +7,8 @@ import matplotlib.pyplot as plt
 
 from ..graph import SequenceGraph, sequence_graph_to_pathway_map, verify_tipping_points
 from ..io import read_dataset
-from ..plot.pathway_map import plot_classic_pathway_map
+from ..io.cache import cache_key, read_pathway_map, write_pathway_map
+from ..plot.pathway_map import classic_pathway_map_layout, plot_classic_pathway_map
 from ..plot.util import init_axes, save_plot
 from ..version import __version__ as version
 from .main import main_function
@@ -20,6 +21,7 @@ def plot_map(
     *,
     arguments,
     legend_arguments,
+    cache_directory: str | None = None,
 ) -> int:
 
     # pylint: disable-next=unused-variable
@@ -27,10 +29,43 @@ def plot_map(
         basename_pathname
     )
 
-    sequence_graph = SequenceGraph(sequences)
-    pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+    layout_arguments = {
+        "level_by_action_name": arguments.get("level_by_action_name", None),
+        "overlapping_lines_spread": arguments["overlapping_lines_spread"],
+    }
+    key = cache_key(
+        sequences, tipping_point_by_action, layout="classic", **layout_arguments
+    )
+    cached = (
+        read_pathway_map(cache_directory, key, sequences)
+        if cache_directory is not None
+        else None
+    )
 
-    verify_tipping_points(pathway_map, tipping_point_by_action)
+    if cached is not None and cached[1] is not None:
+        # The tipping points are part of the key, and have been verified already
+        pathway_map, position_by_node, y_coordinate_by_action_name = cached
+    else:
+        sequence_graph = SequenceGraph(sequences)
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+
+        verify_tipping_points(pathway_map, tipping_point_by_action)
+
+        position_by_node, y_coordinate_by_action_name = classic_pathway_map_layout(
+            pathway_map,
+            tipping_point_by_action=tipping_point_by_action,
+            **layout_arguments,
+        )
+
+        if cache_directory is not None:
+            write_pathway_map(
+                cache_directory,
+                key,
+                sequences,
+                pathway_map,
+                position_by_node=position_by_node,
+                y_coordinate_by_action_name=y_coordinate_by_action_name,
+            )
 
     _, axes = plt.subplots(layout="constrained")
     init_axes(axes)
@@ -38,6 +73,11 @@ def plot_map(
     arguments["colour_by_action_name"] = colour_by_action_name
     arguments["tipping_point_by_action"] = tipping_point_by_action
 
+    if arguments.get("sample_size", None) is None:
+        # The layout of all pathways cannot be reused when plotting a sample of them
+        arguments["position_by_node"] = position_by_node
+        arguments["y_coordinate_by_action_name"] = y_coordinate_by_action_name
+
     # TODO Doc this:
     # from svg_pltmarker import get_marker_from_svg
 
@@ -83,7 +123,8 @@ Plot pathway map
 
 Usage:
     {command} [--title=<title>] [--x_label=<label>] [--show_legend]
-        [--overshoot] [--spread=<spread>] <basename> <plot>
+        [--overshoot] [--spread=<spread>] [--cache=<directory>]
+        [--sample=<count> [--seed=<seed>]] <basename> <plot>
 
 Arguments:
     basename           Either, the name without postfix and extension of text
@@ -96,8 +137,17 @@ Arguments:
 Options:
     -h --help          Show this screen and exit
     --version          Show version and exit
+    --cache=<directory>
+                       Directory for storing the pathway map and its layout.
+                       When plotting a dataset again, with the same tipping
+                       points and spread, they are read from it instead of
+                       being recalculated.
     --overshoot        Show tipping points as overshoots, extending a little
                        bit beyond the actual point
+    --sample=<count>   Plot a uniform random sample of this number of
+                       pathways, instead of all pathways
+    --seed=<seed>      Seed of the random number generator used for
+                       sampling pathways
     --show_legend      Show legend
     --spread=<spread>  Separate overlapping lines by a percentage [0, 1] of
                        the data range. A value of 0.01 means 1% of the
@@ -127,10 +177,17 @@ Examples:
     show_legend = arguments["--show_legend"]
     overshoot = arguments["--overshoot"]
     overlapping_lines_spread: tuple[float, float] = parse_spread(arguments["--spread"])
+    cache_directory = arguments["--cache"]
+    sample_size = (
+        int(arguments["--sample"]) if arguments["--sample"] is not None else None
+    )
+    sample_seed = int(arguments["--seed"]) if arguments["--seed"] is not None else None
 
     plot_arguments: dict[str, typing.Any] = {
         "title": title,
         "x_label": x_label,
+        "sample_seed": sample_seed,
+        "sample_size": sample_size,
         "show_legend": show_legend,
         "overlapping_lines_spread": overlapping_lines_spread,
     }
@@ -151,4 +208,5 @@ Examples:
         plot_pathname,
         arguments=plot_arguments,
         legend_arguments=legend_arguments,
+        cache_directory=cache_directory,
     )
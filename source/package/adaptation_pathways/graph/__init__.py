@@ -8,6 +8,13 @@ from .convert import (
     sequence_graph_to_pathway_graph,
     sequence_graph_to_pathway_map,
 )
+from .directed_graph import CacheStatistics, GraphBackend
 from .pathway_graph import PathwayGraph
-from .pathway_map import PathwayMap, tipping_point_range, verify_tipping_points
-from .sequence_graph import SequenceGraph
+from .pathway_map import (
+    PathwayMap,
+    sample_pathway_map,
+    tipping_point_range,
+    verify_tipping_points,
+)
+from .pathway_map_updater import PathwayMapUpdater
+from .sequence_graph import SequenceGraph, SequenceGraphChange
@@ -0,0 +1,203 @@
+import typing
+
+import networkx as nx
+import numpy as np
+
+
+class CompactGraph:
+    """
+    Read-only directed graph whose structure is stored in integer arrays
+
+    :param nodes: Collection of nodes. The position of a node in this collection is its index.
+    :param successor_idxs: For each node, the indices of the nodes it points to
+
+    Edges are stored in compressed sparse row (CSR) format, once for the successors of each node
+    and once for the predecessors of each node. Per node only a single entry in a dictionary
+    is needed, for translating the node into its index. This is much more compact than the
+    dictionaries of dictionaries used by ``nx.DiGraph``.
+
+    The part of the ``nx.DiGraph`` API that is needed for querying a graph is supported. Graphs
+    cannot be changed once created. Use :meth:`to_networkx` to obtain a mutable copy.
+    """
+
+    _nodes: list[typing.Any]
+    _idx_by_node: dict[typing.Any, int]
+    _successor_offsets: np.ndarray
+    _successor_idxs: np.ndarray
+    _predecessor_offsets: np.ndarray
+    _predecessor_idxs: np.ndarray
+
+    def __init__(
+        self,
+        nodes: typing.Iterable[typing.Any],
+        successor_idxs: typing.Iterable[typing.Iterable[int]],
+    ) -> None:
+        self._nodes = list(nodes)
+        self._idx_by_node = {node: idx for idx, node in enumerate(self._nodes)}
+
+        if len(self._idx_by_node) != len(self._nodes):
+            raise ValueError("Nodes must be unique")
+
+        nr_nodes = len(self._nodes)
+        successor_idxs_ = [list(idxs) for idxs in successor_idxs]
+
+        if len(successor_idxs_) != nr_nodes:
+            raise ValueError(
+                f"Expected successors for {nr_nodes} nodes, got {len(successor_idxs_)}"
+            )
+
+        self._successor_offsets, self._successor_idxs = _to_csr(successor_idxs_)
+
+        if len(self._successor_idxs) > 0 and (
+            self._successor_idxs.min() < 0 or self._successor_idxs.max() >= nr_nodes
+        ):
+            raise ValueError("Successor indices must refer to existing nodes")
+
+        # Predecessors, in order of increasing index of the node they are pointed to from
+        predecessor_idxs: list[list[int]] = [[] for _ in range(nr_nodes)]
+
+        for from_idx, to_idxs in enumerate(successor_idxs_):
+            for to_idx in to_idxs:
+                predecessor_idxs[to_idx].append(from_idx)
+
+        self._predecessor_offsets, self._predecessor_idxs = _to_csr(predecessor_idxs)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> "CompactGraph":
+        """
+        Create a compact graph containing the same nodes and edges as the graph passed in
+
+        The order of the nodes and the order of the successors of each node are preserved.
+        """
+        idx_by_node = {node: idx for idx, node in enumerate(graph.nodes)}
+
+        return cls(
+            graph.nodes,
+            (
+                [idx_by_node[to_node] for to_node in graph.adj[from_node]]
+                for from_node in graph.nodes
+            ),
+        )
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Create a ``nx.DiGraph`` containing the same nodes and edges as this graph
+
+        The order of the nodes and the order of the successors of each node are preserved.
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._nodes)
+        graph.add_edges_from(self.edges())
+
+        return graph
+
+    def __contains__(self, node) -> bool:
+        return node in self._idx_by_node
+
+    @property
+    def nodes(self) -> list[typing.Any]:
+        """
+        :return: All nodes, ordered by index
+        """
+        return self._nodes
+
+    def number_of_nodes(self) -> int:
+        return len(self._nodes)
+
+    def number_of_edges(self) -> int:
+        return len(self._successor_idxs)
+
+    def index(self, node) -> int:
+        """
+        :return: Index of the node passed in
+        :raises KeyError: In case the node is not part of the graph
+        """
+        return self._idx_by_node[node]
+
+    def successor_idxs(self, idx: int) -> np.ndarray:
+        """
+        :return: Indices of the nodes that the node with the index passed in points to
+        """
+        return self._successor_idxs[
+            self._successor_offsets[idx] : self._successor_offsets[idx + 1]
+        ]
+
+    def predecessor_idxs(self, idx: int) -> np.ndarray:
+        """
+        :return: Indices of the nodes that point to the node with the index passed in
+        """
+        return self._predecessor_idxs[
+            self._predecessor_offsets[idx] : self._predecessor_offsets[idx + 1]
+        ]
+
+    def has_edge(self, from_node, to_node) -> bool:
+        return (
+            from_node in self._idx_by_node
+            and to_node in self._idx_by_node
+            and self.index(to_node) in self.successor_idxs(self.index(from_node))
+        )
+
+    def successors(self, node) -> list[typing.Any]:
+        return [self._nodes[idx] for idx in self.successor_idxs(self.index(node))]
+
+    def predecessors(self, node) -> list[typing.Any]:
+        return [self._nodes[idx] for idx in self.predecessor_idxs(self.index(node))]
+
+    def in_degrees(self) -> np.ndarray:
+        """
+        :return: For each node, the number of edges pointing to it
+        """
+        return np.diff(self._predecessor_offsets)
+
+    def out_degrees(self) -> np.ndarray:
+        """
+        :return: For each node, the number of edges pointing from it
+        """
+        return np.diff(self._successor_offsets)
+
+    def in_degree(self, node) -> int:
+        idx = self.index(node)
+        return int(self._predecessor_offsets[idx + 1] - self._predecessor_offsets[idx])
+
+    def out_degree(self, node) -> int:
+        idx = self.index(node)
+        return int(self._successor_offsets[idx + 1] - self._successor_offsets[idx])
+
+    def edges(self) -> typing.Iterator[tuple[typing.Any, typing.Any]]:
+        """
+        :return: Iterator over all edges, ordered by index of the from-node
+        """
+        nodes = self._nodes
+
+        for from_idx, from_node in enumerate(nodes):
+            for to_idx in self.successor_idxs(from_idx):
+                yield from_node, nodes[to_idx]
+
+    def nbytes(self) -> int:
+        """
+        :return: Number of bytes used by the arrays storing the edges
+        """
+        return (
+            self._successor_offsets.nbytes
+            + self._successor_idxs.nbytes
+            + self._predecessor_offsets.nbytes
+            + self._predecessor_idxs.nbytes
+        )
+
+
+def _to_csr(idxs_by_row: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    # Smallest integer type that can store the indices
+    idx_type = np.int32 if len(idxs_by_row) < np.iinfo(np.int32).max else np.int64
+
+    offsets = np.zeros(len(idxs_by_row) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(
+        np.fromiter(
+            (len(idxs) for idxs in idxs_by_row), dtype=np.int64, count=len(idxs_by_row)
+        )
+    )
+
+    idxs = np.fromiter(
+        (idx for row in idxs_by_row for idx in row), dtype=idx_type, count=offsets[-1]
+    )
+
+    return offsets, idxs
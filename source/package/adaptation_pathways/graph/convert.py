@@ -1,72 +1,147 @@
+import typing
+
+from ..action import Action
 from .node import ActionBegin, ActionEnd, ActionPeriod
 from .node.action import Action as ActionNode
 from .pathway_graph import ActionConversion, PathwayGraph
 from .pathway_map import PathwayMap
 from .sequence_graph import SequenceGraph
+from .traversal import depth_first
 
 
 def sequence_graph_to_pathway_graph(sequence_graph: SequenceGraph) -> PathwayGraph:
     """
     Convert a sequence graph to a pathway graph
     """
+    pathway_graph = PathwayGraph()
 
     def visit_graph(
-        sequence_graph: SequenceGraph,
-        pathway_graph: PathwayGraph,
-        from_action: ActionNode,
-        new_from_action: ActionPeriod,
-    ) -> None:
+        node: tuple[ActionNode, ActionPeriod],
+    ) -> typing.Iterator[tuple[ActionNode, ActionPeriod]]:
+        from_action, new_from_action = node
+
         for to_action in sequence_graph.to_actions(from_action):
             new_to_action = ActionPeriod(to_action.action)
             pathway_graph.add_conversion(new_from_action, new_to_action)
-            visit_graph(sequence_graph, pathway_graph, to_action, new_to_action)
-
-    pathway_graph = PathwayGraph()
+            yield to_action, new_to_action
 
     if sequence_graph.nr_actions() > 0:
         from_action = sequence_graph.root_node
         assert isinstance(from_action, ActionNode), from_action
         new_from_action = ActionPeriod(from_action.action)
 
-        visit_graph(sequence_graph, pathway_graph, from_action, new_from_action)
+        depth_first((from_action, new_from_action), visit_graph)
 
     return pathway_graph
 
 
-def pathway_graph_to_pathway_map(pathway_graph: PathwayGraph) -> PathwayMap:
+def _add_pathway_tree(
+    pathway_map: PathwayMap,
+    root_node: typing.Any,
+    to_nodes: typing.Callable[[typing.Any], typing.Iterable[typing.Any]],
+    from_end: ActionEnd | None = None,
+) -> list[tuple[typing.Any, ActionBegin]]:
+    # Add a period for each route from the root node to each node reachable from it. Routes
+    # sharing a prefix share the periods and conversions of this prefix. In case from_end is
+    # passed in, the period of the root node continues from it. Returns the nodes visited,
+    # together with the begin of the period added for them.
+    result: list[tuple[typing.Any, ActionBegin]] = []
+
+    def visit(
+        node: tuple[typing.Any, ActionEnd | None],
+    ) -> typing.Iterator[tuple[typing.Any, ActionEnd | None]]:
+        from_node, from_end = node
+        begin = ActionBegin(from_node.action)
+        end = ActionEnd(from_node.action)
+
+        if from_end is not None:
+            pathway_map.add_conversion(from_end, begin)
+
+        pathway_map.add_period(begin, end)
+        result.append((from_node, begin))
+
+        for to_node in to_nodes(from_node):
+            yield to_node, end
+
+    root: tuple[typing.Any, ActionEnd | None] = (root_node, from_end)
+
+    depth_first(root, visit)
+
+    return result
+
+
+def pathway_graph_to_pathway_map(
+    pathway_graph: PathwayGraph, *, shared_prefixes: bool = False
+) -> PathwayMap:
     """
     Convert a pathway graph to a pathway map
+
+    :param shared_prefixes: Whether pathways share the nodes of the sequence of actions they
+        start with. By default, each pathway is stored separately.
     """
     pathway_map = PathwayMap()
 
-    if pathway_graph.nr_nodes() > 0:
+    if shared_prefixes:
+        if pathway_graph.nr_nodes() > 0:
+            _add_pathway_tree(
+                pathway_map,
+                pathway_graph.root_node,
+                lambda action_period: [
+                    pathway_graph.to_action_period(conversion)
+                    for conversion in pathway_graph.to_conversions(action_period)
+                ],
+            )
+    else:
         # For each individual path, add a graph to the pathway map
-        for path in pathway_graph.all_paths():
-            action_period = path[0]
-            begin = ActionBegin(action_period.action)
-            end = ActionEnd(action_period.action)
-            pathway_map.add_period(begin, end)
-
-            for action_conversion_idx in range(1, len(path), 2):
-                action_conversion = path[action_conversion_idx]
-                action_period = path[action_conversion_idx + 1]
-                assert isinstance(action_conversion, ActionConversion)
-                assert isinstance(action_period, ActionPeriod)
-
-                begin = ActionBegin(action_period.action)
-                pathway_map.add_conversion(end, begin)
-                end = ActionEnd(action_period.action)
-                pathway_map.add_period(begin, end)
-
-    # print(pathway_map)
+        for path in pathway_graph.iter_paths():
+            assert all(isinstance(node, ActionPeriod) for node in path[::2])
+            assert all(isinstance(node, ActionConversion) for node in path[1::2])
+
+            pathway_map.add_pathway(action_period.action for action_period in path[::2])
+
     return pathway_map
 
 
-def sequence_graph_to_pathway_map(sequence_graph: SequenceGraph) -> PathwayMap:
+def sequence_graph_to_pathway_map(
+    sequence_graph: SequenceGraph,
+    *,
+    shared_prefixes: bool = False,
+) -> PathwayMap:
     """
     Convert a sequence graph to a pathway map
 
-    This function calls :func:`sequence_graph_to_pathway_graph` and
-    :func:`pathway_graph_to_pathway_map` in turn.
+    :param shared_prefixes: Whether pathways share the nodes of the sequence of actions they
+        start with. By default, each pathway is stored separately.
+
+    The result is the same as calling :func:`sequence_graph_to_pathway_graph` and
+    :func:`pathway_graph_to_pathway_map` in turn, but no intermediate pathway graph is created.
+    Each sequence of actions from the root action to a leaf action is added to the pathway map
+    as soon as the depth-first traversal of the sequence graph reaches the leaf action.
     """
-    return pathway_graph_to_pathway_map(sequence_graph_to_pathway_graph(sequence_graph))
+    pathway_map = PathwayMap()
+
+    if sequence_graph.nr_actions() > 0:
+        from_action = sequence_graph.root_node
+        assert isinstance(from_action, ActionNode), from_action
+
+        if shared_prefixes:
+            if sequence_graph.nr_to_actions(from_action) > 0:
+                _add_pathway_tree(pathway_map, from_action, sequence_graph.to_actions)
+        else:
+            actions: list[Action] = []
+
+            def visit(from_action: ActionNode) -> list[ActionNode]:
+                actions.append(from_action.action)
+                to_actions = sequence_graph.to_actions(from_action)
+
+                if len(to_actions) == 0 and len(actions) > 1:
+                    pathway_map.add_pathway(actions)
+
+                return to_actions
+
+            def leave(_: ActionNode) -> None:
+                actions.pop()
+
+            depth_first(from_action, visit, leave)
+
+    return pathway_map
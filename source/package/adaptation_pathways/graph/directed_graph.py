@@ -1,30 +1,166 @@
+import concurrent.futures
+import dataclasses
+import enum
+import random
 import typing
 
 import networkx as nx
+import numpy as np
+
+from .compact_graph import CompactGraph
+
+
+GraphBackend = enum.Enum("GraphBackend", ["NETWORKX", "COMPACT"])
+"""
+Representations a directed graph can use to store its nodes and edges
+
+- ``NETWORKX``: Mutable ``nx.DiGraph`` (default)
+- ``COMPACT``: Read-only :class:`CompactGraph`, using much less memory for large graphs
+"""
+
+
+@dataclasses.dataclass
+class CacheStatistics:
+    """
+    Statistics about the use of the cache of structural queries of a graph
+
+    :param hits: Number of queries answered from the cache
+    :param misses: Number of queries for which the result had to be (re)calculated
+    """
+
+    hits: int = 0
+    misses: int = 0
 
 
 class DirectedGraph:
     """
     Base class for specialized directed graphs.
+
+    By default, nodes and edges are stored in an ``nx.DiGraph``. Large graphs that are not
+    changed anymore can be converted to a compact representation, using
+    :meth:`set_backend`. All queries keep working, but the graph cannot be changed anymore
+    until it is converted back.
+
+    The results of structural queries (root nodes, leaf nodes, paths, ...) are cached. Each
+    change to the graph increments its :attr:`version`, invalidating all cached results.
     """
 
-    _graph: nx.DiGraph
+    _graph: nx.DiGraph | CompactGraph
+    _version: int
+    _cache: dict[str, tuple[int, typing.Any]]
+    _cache_statistics: CacheStatistics
 
     def __init__(self) -> None:
         self._graph = nx.DiGraph()
+        self._version = 0
+        self._cache = {}
+        self._cache_statistics = CacheStatistics()
 
     def __str__(self) -> str:
-        return "\n".join(nx.generate_network_text(self._graph))
+        return "\n".join(nx.generate_network_text(self.graph))
+
+    def __contains__(self, node) -> bool:
+        return node in self._graph
 
     @property
     def graph(self) -> nx.DiGraph:
         """
         :return: The layered directed graph instance
 
-        Try not to use it -- it should be an implementation detail as much as possible.
+        Try not to use it -- it should be an implementation detail as much as possible. Changes
+        made to the graph returned are not noticed by the cache of structural queries.
+
+        In case the compact backend is used, a new ``nx.DiGraph`` is created on each call.
+        Changes made to it do not affect this graph.
+        """
+        if isinstance(self._graph, CompactGraph):
+            return self._graph.to_networkx()
+
+        return self._graph
+
+    @property
+    def backend(self) -> GraphBackend:
+        """
+        :return: The backend used to store the nodes and edges
+        """
+        return (
+            GraphBackend.COMPACT
+            if isinstance(self._graph, CompactGraph)
+            else GraphBackend.NETWORKX
+        )
+
+    def set_backend(self, backend: GraphBackend) -> None:
         """
+        Convert the graph's nodes and edges to the backend passed in
+
+        The order of the nodes and edges is preserved. Converting to the backend already in
+        use is a no-op.
+        """
+        if backend != self.backend:
+            if backend == GraphBackend.COMPACT:
+                self._graph = CompactGraph.from_networkx(self._graph)
+            else:
+                assert isinstance(self._graph, CompactGraph)
+                self._graph = self._graph.to_networkx()
+
+    @property
+    def version(self) -> int:
+        """
+        :return: Number of changes made to the graph since it was created
+        """
+        return self._version
+
+    @property
+    def cache_statistics(self) -> CacheStatistics:
+        """
+        :return: Statistics about the use of the cache of structural queries
+        """
+        return self._cache_statistics
+
+    def _cached(
+        self, key: str, calculate: typing.Callable[[], typing.Any]
+    ) -> typing.Any:
+        # Return the result of a structural query, identified by key. The result is only
+        # (re)calculated when not present in the cache, or when the graph changed since
+        # it was calculated.
+        entry = self._cache.get(key)
+
+        if entry is not None and entry[0] == self._version:
+            self._cache_statistics.hits += 1
+            return entry[1]
+
+        self._cache_statistics.misses += 1
+        result = calculate()
+        self._cache[key] = (self._version, result)
+
+        return result
+
+    def _mutable_graph(self) -> nx.DiGraph:
+        if isinstance(self._graph, CompactGraph):
+            raise RuntimeError(
+                "The graph uses the compact backend, which is read-only. Convert it to the "
+                "networkx backend before changing it."
+            )
+
+        self._version += 1
+
         return self._graph
 
+    def _add_node(self, node) -> None:
+        self._mutable_graph().add_node(node)
+
+    def _add_edge(self, from_node, to_node) -> None:
+        self._mutable_graph().add_edge(from_node, to_node)
+
+    def _add_edges(self, edges: typing.Iterable[tuple[typing.Any, typing.Any]]) -> None:
+        self._mutable_graph().add_edges_from(edges)
+
+    def _remove_edge(self, from_node, to_node) -> None:
+        self._mutable_graph().remove_edge(from_node, to_node)
+
+    def _remove_nodes(self, nodes: typing.Iterable[typing.Any]) -> None:
+        self._mutable_graph().remove_nodes_from(nodes)
+
     # def is_empty(self) -> bool:
     #     """
     #     :return: Whether or not the tree is empty
@@ -35,60 +171,383 @@ class DirectedGraph:
         """
         :return: Number of nodes
         """
-        return len(self._graph.nodes)
+        return self._graph.number_of_nodes()
 
     def nr_edges(self) -> int:
         """
         :return: Number of edges
         """
-        return len(self._graph.edges)
+        return self._graph.number_of_edges()
+
+    def nodes(self) -> list[typing.Any]:
+        """
+        :return: Collection of all nodes, in insertion order
+        """
+        return list(self._graph.nodes)
+
+    def edges(self) -> list[tuple[typing.Any, typing.Any]]:
+        """
+        :return: Collection of all edges, grouped by from-node
+        """
+        return list(self._graph.edges())
+
+    def has_edge(self, from_node, to_node) -> bool:
+        """
+        :return: Whether or not the graph contains an edge between the nodes passed in
+        """
+        return self._graph.has_edge(from_node, to_node)
 
     def all_to_nodes(self, from_node):
-        # Use shortest_path to find all nodes reachable from the node passed in
-        graph = self._graph.subgraph(nx.shortest_path(self._graph, from_node))
+        """
+        :return: Collection of all nodes reachable from the node passed in, in breadth-first
+            order
+        """
+        visited = {from_node}
+        result = [from_node]
+        idx = 0
 
-        # Remove the from_node itself before returning the result
-        result = list(graph.nodes)
-        result.remove(from_node)
+        while idx < len(result):
+            for to_node in self._graph.successors(result[idx]):
+                if to_node not in visited:
+                    visited.add(to_node)
+                    result.append(to_node)
+            idx += 1
 
-        return result
+        # Remove the from_node itself before returning the result
+        return result[1:]
 
     def to_nodes(self, from_node) -> list[typing.Any]:
         """
         :return: Collection of nodes that start at the node passed in
         """
-        return list(self._graph.adj[from_node])
+        return list(self._graph.successors(from_node))
 
-    def from_nodes(self, to_node):
+    def nr_to_nodes(self, from_node) -> int:
+        """
+        :return: Number of nodes that start at the node passed in (out-degree)
+        """
+        return self._graph.out_degree(from_node)
+
+    def from_nodes(self, to_node) -> list[typing.Any]:
         """
         :return: Collection of nodes that end at the node passed in
+
+        Both backends maintain an index of the predecessors of each node, so the cost of this
+        call does not depend on the size of the graph.
+        """
+        return list(self._graph.predecessors(to_node))
+
+    def predecessors_of(
+        self, to_nodes: typing.Iterable[typing.Any]
+    ) -> list[list[typing.Any]]:
+        """
+        :return: For each of the nodes passed in, the collection of nodes that end at it
+        """
+        predecessors = self._graph.predecessors
+
+        return [list(predecessors(to_node)) for to_node in to_nodes]
+
+    def nr_from_nodes(self, to_node) -> int:
+        """
+        :return: Number of nodes that end at the node passed in (in-degree)
         """
-        # TODO Can this be done more efficiently?
-        return [node for node in self._graph.nodes() if to_node in self.to_nodes(node)]
+        return self._graph.in_degree(to_node)
+
+    def _root_nodes(self) -> tuple[typing.Any, ...]:
+        return self._cached("root_nodes", self._calculate_root_nodes)
+
+    def _calculate_root_nodes(self) -> tuple[typing.Any, ...]:
+        if isinstance(self._graph, CompactGraph):
+            nodes = self._graph.nodes
+            return tuple(
+                nodes[idx] for idx in (self._graph.in_degrees() == 0).nonzero()[0]
+            )
+
+        return tuple(node for node, degree in self._graph.in_degree() if degree == 0)
 
-    def leaf_nodes(self) -> typing.Iterable[typing.Any]:
+    def leaf_nodes(self) -> tuple[typing.Any, ...]:
         """
-        :Return: Iterable for iterating over all leaf nodes
+        :Return: All leaf nodes
+
+        The leaf nodes are cached. The cached tuple is returned.
         """
-        return [
+        return self._cached("leaf_nodes", self._calculate_leaf_nodes)
+
+    def _calculate_leaf_nodes(self) -> tuple[typing.Any, ...]:
+        if isinstance(self._graph, CompactGraph):
+            nodes = self._graph.nodes
+            is_leaf = (self._graph.in_degrees() != 0) & (self._graph.out_degrees() == 0)
+            return tuple(nodes[idx] for idx in is_leaf.nonzero()[0])
+
+        return tuple(
             node
             for node in self._graph.nodes()
             if self._graph.in_degree(node) != 0 and self._graph.out_degree(node) == 0
-        ]
+        )
 
-    def all_paths(self) -> list[list[typing.Any]]:
-        result = []
+    def iter_paths(
+        self, *, workers: int | None = None
+    ) -> typing.Iterator[list[typing.Any]]:
+        """
+        :param workers: Number of processes to enumerate paths with. By default, paths are
+            enumerated in the current process.
+        :return: Iterator over all paths from a root node to a leaf node
+
+        Paths are generated one at a time, in depth-first order. Only the path currently being
+        generated is kept in memory.
 
+        In case multiple workers are used, the paths starting with different prefixes are
+        enumerated in parallel, in a process pool. The paths are yielded in the same order as
+        when enumerating them in the current process.
+        """
         if self.nr_nodes() > 0:
-            graph = self._graph
+            leaf_nodes = self._cached("leaf_node_set", lambda: set(self.leaf_nodes()))
+
+            if workers is not None and workers > 1:
+                yield from self._iter_paths_in_parallel(leaf_nodes, workers)
+            else:
+                for root_node in self._root_nodes():
+                    yield from _simple_paths(
+                        self._graph.successors, [root_node], leaf_nodes
+                    )
+
+    def _iter_paths_in_parallel(
+        self, leaf_nodes: set[typing.Any], workers: int
+    ) -> typing.Iterator[list[typing.Any]]:
+        # Nodes are passed to the workers as indices, so they don't need to be picklable
+        nodes = self.nodes()
+        idx_by_node = {node: idx for idx, node in enumerate(nodes)}
+        successor_idxs = [
+            [idx_by_node[to_node] for to_node in self._graph.successors(node)]
+            for node in nodes
+        ]
+        leaf_idxs = {idx_by_node[node] for node in leaf_nodes}
+
+        # Split the work in more tasks than there are workers, to balance the load
+        prefixes = _path_prefixes(
+            [[idx_by_node[node]] for node in self._root_nodes()],
+            successor_idxs,
+            leaf_idxs,
+            4 * workers,
+        )
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_path_worker,
+            initargs=(successor_idxs, leaf_idxs),
+        ) as executor:
+            # Results are returned in the order of the prefixes
+            for offsets, path_idxs in executor.map(_enumerate_path_idxs, prefixes):
+                path_idxs_list = path_idxs.tolist()
+
+                for begin, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+                    yield [nodes[idx] for idx in path_idxs_list[begin:end]]
+
+    def all_paths(
+        self, *, workers: int | None = None
+    ) -> tuple[tuple[typing.Any, ...], ...]:
+        """
+        :param workers: Number of processes to enumerate paths with, see :meth:`iter_paths`
+        :return: All paths from a root node to a leaf node
+
+        Prefer :meth:`iter_paths` or :meth:`count_paths` for large graphs. The paths are
+        cached. The cached tuple of paths is returned.
+        """
+        return self._cached(
+            "all_paths",
+            lambda: tuple(tuple(path) for path in self.iter_paths(workers=workers)),
+        )
+
+    def count_paths(self) -> int:
+        """
+        :return: Number of paths from a root node to a leaf node
+
+        The paths are counted without enumerating them, by visiting each node and edge once.
+
+        :raises ValueError: In case the graph contains a cycle
+        """
+        return self._cached("count_paths", self._calculate_count_paths)
+
+    def _calculate_count_paths(self) -> int:
+        nr_paths_by_node = self._nr_paths_by_node()
+
+        return sum(nr_paths_by_node[root_node] for root_node in self._root_nodes())
+
+    def _nr_paths_by_node(self) -> dict[typing.Any, int]:
+        # Per node, the number of paths from it to a leaf node
+        return self._cached("nr_paths_by_node", self._calculate_nr_paths_by_node)
+
+    def _calculate_nr_paths_by_node(self) -> dict[typing.Any, int]:
+        nr_paths_by_node: dict[typing.Any, int] = {}
+
+        for node in reversed(self._topological_order()):
+            nr_paths_by_node[node] = (
+                sum(nr_paths_by_node[to_node] for to_node in self.to_nodes(node))
+                if self.nr_to_nodes(node) > 0
+                else (1 if self.nr_from_nodes(node) > 0 else 0)
+            )
+
+        return nr_paths_by_node
+
+    def sample_paths(self, k: int, seed: int | None = None) -> list[list[typing.Any]]:
+        """
+        :param k: Number of paths to sample
+        :param seed: Seed of the random number generator. Passing the same seed results in
+            the same sample.
+        :return: Uniform random sample of k different paths from a root node to a leaf node,
+            in the order in which :meth:`iter_paths` yields them. In case the graph contains
+            k paths or less, all paths are returned.
+
+        Paths are not enumerated. Instead, the paths are numbered, k numbers are drawn, and
+        the path corresponding with each number is looked up using the number of paths
+        starting at each node. The cost depends on k and the length of the paths, not on the
+        total number of paths.
+
+        :raises ValueError: In case the graph contains a cycle, or k is negative
+        """
+        if k < 0:
+            raise ValueError(f"Sample size must not be negative: {k}")
+
+        nr_paths = self.count_paths()
+        nr_paths_by_node = self._nr_paths_by_node()
+        path_idxs = sorted(
+            random.Random(seed).sample(range(nr_paths), min(k, nr_paths))
+        )
+
+        return [self._path_by_idx(path_idx, nr_paths_by_node) for path_idx in path_idxs]
+
+    def _path_by_idx(
+        self, path_idx: int, nr_paths_by_node: dict[typing.Any, int]
+    ) -> list[typing.Any]:
+        # Return the path with the index passed in, following the order in which iter_paths
+        # yields paths. Skip the paths starting at the nodes preceding the one containing the
+        # path, at each level.
+        def select(nodes: typing.Sequence[typing.Any]) -> typing.Any:
+            nonlocal path_idx
+
+            for node in nodes:
+                if path_idx < nr_paths_by_node[node]:
+                    return node
+
+                path_idx -= nr_paths_by_node[node]
 
-            root_nodes = [
-                node for node, degree in self._graph.in_degree() if degree == 0
-            ]
-            leaf_nodes = self.leaf_nodes()
+            assert False, "Path index out of range"
 
-            for root_node in root_nodes:
-                cutoff = None
-                result += nx.all_simple_paths(graph, root_node, leaf_nodes, cutoff)
+        path = [select(self._root_nodes())]
+
+        while self.nr_to_nodes(path[-1]) > 0:
+            path.append(select(self.to_nodes(path[-1])))
+
+        return path
+
+    def _topological_order(self) -> list[typing.Any]:
+        # Kahn's algorithm. Each node is positioned after all nodes ending at it.
+        nr_from_nodes = {node: self.nr_from_nodes(node) for node in self._graph.nodes}
+        result = [node for node, count in nr_from_nodes.items() if count == 0]
+        idx = 0
+
+        while idx < len(result):
+            for to_node in self._graph.successors(result[idx]):
+                nr_from_nodes[to_node] -= 1
+
+                if nr_from_nodes[to_node] == 0:
+                    result.append(to_node)
+            idx += 1
+
+        if len(result) != len(nr_from_nodes):
+            raise ValueError("Graph contains a cycle")
 
         return result
+
+
+def _simple_paths(
+    successors: typing.Callable[[typing.Any], typing.Iterable[typing.Any]],
+    from_path: list[typing.Any],
+    to_nodes: set[typing.Any],
+) -> typing.Iterator[list[typing.Any]]:
+    # Depth-first search for all paths from the last node in from_path to any of the to_nodes,
+    # in which no node occurs more than once. Paths are yielded in the same order as
+    # nx.all_simple_paths does, prefixed by the other nodes in from_path.
+    path = list(from_path)
+    nodes_on_path = set(path)
+    to_visit = [iter(successors(path[-1]))]
+
+    while to_visit:
+        node = next(to_visit[-1], None)
+
+        if node is None:
+            to_visit.pop()
+            nodes_on_path.discard(path.pop())
+        elif node not in nodes_on_path:
+            if node in to_nodes:
+                yield path + [node]
+
+            path.append(node)
+            nodes_on_path.add(node)
+            to_visit.append(iter(successors(node)))
+
+
+def _path_prefixes(
+    prefixes: list[list[int]],
+    successor_idxs: list[list[int]],
+    leaf_idxs: set[int],
+    nr_prefixes: int,
+) -> list[list[int]]:
+    # Replace prefixes by their extensions by one node, until there are at least nr_prefixes
+    # of them or they cannot be extended anymore. Enumerating the paths starting with each of
+    # the prefixes returned, in order, results in the same paths, in the same order, as
+    # enumerating the paths starting with the prefixes passed in.
+    while len(prefixes) < nr_prefixes:
+        extended_prefixes = []
+        extended = False
+
+        for prefix in prefixes:
+            if prefix[-1] in leaf_idxs:
+                # A leaf node has no successors. The prefix is a complete path.
+                extended_prefixes.append(prefix)
+            else:
+                for to_idx in successor_idxs[prefix[-1]]:
+                    if to_idx not in prefix:
+                        extended_prefixes.append(prefix + [to_idx])
+                        extended = True
+
+        if not extended:
+            break
+
+        prefixes = extended_prefixes
+
+    return prefixes
+
+
+# State of a worker process enumerating paths, set once per process by _init_path_worker
+_path_worker_successor_idxs: list[list[int]] = []
+_path_worker_leaf_idxs: set[int] = set()
+
+
+def _init_path_worker(successor_idxs: list[list[int]], leaf_idxs: set[int]) -> None:
+    # pylint: disable-next=global-statement
+    global _path_worker_successor_idxs, _path_worker_leaf_idxs
+    _path_worker_successor_idxs = successor_idxs
+    _path_worker_leaf_idxs = leaf_idxs
+
+
+def _enumerate_path_idxs(prefix: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    # Enumerate all paths starting with the prefix. The paths are returned as the offsets of
+    # each path in a single array of node indices, which is much cheaper to send back to the
+    # parent process than a list of lists.
+    if len(prefix) > 1 and prefix[-1] in _path_worker_leaf_idxs:
+        paths = [prefix]
+    else:
+        paths = list(
+            _simple_paths(
+                _path_worker_successor_idxs.__getitem__, prefix, _path_worker_leaf_idxs
+            )
+        )
+
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(path) for path in paths])
+    path_idxs = np.fromiter(
+        (idx for path in paths for idx in path), dtype=np.int64, count=offsets[-1]
+    )
+
+    return offsets, path_idxs
@@ -10,6 +10,8 @@ class MultiRootedGraph(DirectedGraph):
     def root_nodes(self):
         """
         :return: The root nodes
+
+        The root nodes are cached. The cached tuple is returned.
         """
 
-        return [node for node, degree in self._graph.in_degree() if degree == 0]
+        return self._root_nodes()
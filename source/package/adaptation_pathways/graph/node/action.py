@@ -9,15 +9,20 @@ class Action(Node):
     :param action: Action instance represented by the node
     """
 
+    __slots__ = ("_action",)
+
     _action: Action_
 
     def __init__(self, action: Action_) -> None:
-        super().__init__(f"{action.name}")
+        super().__init__()
         self._action = action
 
     def __repr__(self) -> str:
         return f"Action({self._action})"
 
+    def _format_label(self) -> str:
+        return f"{self._action.name}"
+
     @property
     def action(self) -> Action_:
         return self._action
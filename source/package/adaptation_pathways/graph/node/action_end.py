@@ -11,13 +11,20 @@ class ActionEnd(Node):
     See also: :class:`PathwayMap`
     """
 
+    __slots__ = ("_action",)
+
+    _action: Action
+
     def __init__(self, action: Action) -> None:
-        super().__init__(f"{action.name}]")
+        super().__init__()
         self._action = action
 
     def __repr__(self) -> str:
         return f'ActionEnd("{self._action}")'
 
+    def _format_label(self) -> str:
+        return f"{self._action.name}]"
+
     @property
     def action(self) -> Action:
         return self._action
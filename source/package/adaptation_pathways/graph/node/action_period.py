@@ -11,15 +11,20 @@ class ActionPeriod(Node):
     See also: :class:`PathwayGraph`
     """
 
+    __slots__ = ("_action",)
+
     _action: Action
 
     def __init__(self, action: Action) -> None:
-        super().__init__(f"{action.name}")
+        super().__init__()
         self._action = action
 
     def __repr__(self) -> str:
         return f'ActionPeriod("{self._action}")'
 
+    def _format_label(self) -> str:
+        return f"{self._action.name}"
+
     @property
     def action(self) -> Action:
         return self._action
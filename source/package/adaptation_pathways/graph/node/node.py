@@ -1,23 +1,41 @@
-class Node:
+from abc import ABC, abstractmethod
+
+
+class Node(ABC):
     """
     Base class for specialized node types
 
     Nodes are nodes in a graph.
 
-    :param label: Label of the node
+    :param label: Label of the node. In case no label is passed in, it is formatted by
+        :meth:`_format_label` on first access.
+
+    Node is an abstract class. Specialized node types must implement :meth:`_format_label`.
+
+    Node classes use ``__slots__``. Large graphs contain many nodes, and instances without a
+    ``__dict__`` use considerably less memory.
     """
 
-    _label: str
+    __slots__ = ("_label",)
 
-    def __init__(self, label: str) -> None:
+    _label: str | None
+
+    def __init__(self, label: str | None = None) -> None:
         self._label = label
 
     def __str__(self) -> str:
-        return self._label
+        return self.label
 
     def __repr__(self) -> str:
-        return f'Node("{self._label}")'
+        return f'Node("{self.label}")'
+
+    @abstractmethod
+    def _format_label(self) -> str:
+        pass
 
     @property
     def label(self) -> str:
+        if self._label is None:
+            self._label = self._format_label()
+
         return self._label
@@ -22,16 +22,16 @@ class PathwayGraph(RootedGraph):
         Add a conversion, defined by two action periods
         """
         conversion = ActionConversion(from_action_period, to_action_period)
-        self._graph.add_edge(from_action_period, conversion)
-        self._graph.add_edge(conversion, to_action_period)
+        self._add_edge(from_action_period, conversion)
+        self._add_edge(conversion, to_action_period)
 
     def to_conversions(self, from_conversion: ActionPeriod) -> list[ActionConversion]:
         assert isinstance(from_conversion, ActionPeriod), type(from_conversion)
-        return list(self._graph.adj[from_conversion])
+        return self.to_nodes(from_conversion)
 
     def to_action_period(self, conversion: ActionConversion) -> ActionPeriod:
         assert isinstance(conversion, ActionConversion), type(conversion)
-        actions = list(self._graph.adj[conversion])
+        actions = self.to_nodes(conversion)
         assert len(actions) == 1
         assert isinstance(actions[0], ActionPeriod), type(actions[0])
         return actions[0]
@@ -1,3 +1,7 @@
+import typing
+
+import numpy as np
+
 from .. import alias
 from ..action import Action
 from ..action_combination import ActionCombination
@@ -9,25 +13,154 @@ class PathwayMap(MultiRootedGraph):
     """
     A PathwayMap represents a collection of adaptation pathways. These pathways are encoded
     in a directed rooted graph in which the nodes represent...
+
+    Pathways can be stored separately, each in their own rooted graph, or share the nodes of
+    the actions they have in common with other pathways (a prefix tree). In the latter case,
+    the number of nodes is equal to the number of distinct sequences of actions starting at
+    the root action, instead of to the sum of the lengths of all pathways.
+
+    The ``ActionBegin`` and ``ActionEnd`` nodes are indexed by type, action instance and action
+    name when they are added. Looking them up costs time proportional to the number of
+    nodes found. Action names are assumed not to change while the action is part of the map.
     """
 
+    _action_begins: dict[ActionBegin, None]
+    _action_ends: dict[ActionEnd, None]
+    _begins_by_action: dict[Action, dict[ActionBegin, None]]
+    _ends_by_action: dict[Action, dict[ActionEnd, None]]
+    _begins_by_action_name: dict[str, dict[ActionBegin, None]]
+    _ends_by_action_name: dict[str, dict[ActionEnd, None]]
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Dictionaries with values set to None are used as insertion-ordered sets
+        self._action_begins = {}
+        self._action_ends = {}
+        self._begins_by_action = {}
+        self._ends_by_action = {}
+        self._begins_by_action_name = {}
+        self._ends_by_action_name = {}
+
+    def _indexes(self, node: ActionBegin | ActionEnd) -> tuple[dict, dict, dict]:
+        if isinstance(node, ActionBegin):
+            return (
+                self._action_begins,
+                self._begins_by_action,
+                self._begins_by_action_name,
+            )
+
+        assert isinstance(node, ActionEnd), node
+
+        return self._action_ends, self._ends_by_action, self._ends_by_action_name
+
+    def _index(self, node: ActionBegin | ActionEnd) -> None:
+        nodes, nodes_by_action, nodes_by_action_name = self._indexes(node)
+
+        if node not in nodes:
+            nodes[node] = None
+            nodes_by_action.setdefault(node.action, {})[node] = None
+            nodes_by_action_name.setdefault(node.action.name, {})[node] = None
+
+    def _unindex(self, node: ActionBegin | ActionEnd) -> None:
+        nodes, nodes_by_action, nodes_by_action_name = self._indexes(node)
+
+        if node in nodes:
+            del nodes[node]
+
+            for index, key in (
+                (nodes_by_action, node.action),
+                (nodes_by_action_name, node.action.name),
+            ):
+                del index[key][node]
+
+                if not index[key]:
+                    del index[key]
+
+    def _add_node(self, node) -> None:
+        super()._add_node(node)
+        self._index(node)
+
+    def _add_edge(self, from_node, to_node) -> None:
+        super()._add_edge(from_node, to_node)
+        self._index(from_node)
+        self._index(to_node)
+
+    def _add_edges(self, edges: typing.Iterable[tuple[typing.Any, typing.Any]]) -> None:
+        edges = list(edges)
+        super()._add_edges(edges)
+
+        for from_node, to_node in edges:
+            self._index(from_node)
+            self._index(to_node)
+
+    def _remove_nodes(self, nodes: typing.Iterable[typing.Any]) -> None:
+        nodes = list(nodes)
+        super()._remove_nodes(nodes)
+
+        for node in nodes:
+            self._unindex(node)
+
+    def add_node(self, node: ActionBegin | ActionEnd) -> None:
+        """
+        Add a node, without connecting it to other nodes
+        """
+        assert isinstance(node, (ActionBegin, ActionEnd))
+        self._add_node(node)
+
     def add_period(self, begin: ActionBegin, end: ActionEnd) -> None:
         assert isinstance(begin, ActionBegin)
         assert isinstance(end, ActionEnd)
-        self.graph.add_edge(begin, end)
+        self._add_edge(begin, end)
 
     def add_conversion(self, end: ActionEnd, begin: ActionBegin) -> None:
         assert isinstance(end, ActionEnd)
         assert isinstance(begin, ActionBegin)
-        self.graph.add_edge(end, begin)
+        self._add_edge(end, begin)
+
+    def add_pathway(self, actions: typing.Iterable[Action]) -> None:
+        """
+        Add a pathway, consisting of a period for each of the actions passed in, connected by
+        conversions
+
+        All nodes and edges of the pathway are added in one go.
+        """
+        edges: list[tuple[ActionEnd | ActionBegin, ActionBegin | ActionEnd]] = []
+        end = None
+
+        for action in actions:
+            begin = ActionBegin(action)
+
+            if end is not None:
+                edges.append((end, begin))
+
+            end = ActionEnd(action)
+            edges.append((begin, end))
+
+        self._add_edges(edges)
+
+    def remove_periods(self, begin: ActionBegin) -> list[ActionBegin | ActionEnd]:
+        """
+        Remove the period starting at the node passed in, including all periods following it
+
+        :return: The nodes removed
+
+        In case pathways share the nodes of common prefixes, only the periods of the pathways
+        continuing from the node passed in are removed.
+        """
+        assert isinstance(begin, ActionBegin)
+        nodes = [begin] + self.all_to_nodes(begin)
+        self._remove_nodes(nodes)
+
+        return nodes
 
     def action_begins(self, end: ActionEnd) -> list[ActionBegin]:
         assert isinstance(end, ActionEnd)
-        return list(self.graph.adj[end])
+        return self.to_nodes(end)
 
     def action_end(self, begin: ActionBegin) -> ActionEnd:
         assert isinstance(begin, ActionBegin)
-        ends = list(self.graph.adj[begin])
+        ends = self.to_nodes(begin)
         assert len(ends) == 1
         return ends[0]
 
@@ -37,62 +170,47 @@ class PathwayMap(MultiRootedGraph):
         assert isinstance(begin, ActionBegin)
         return self.all_to_nodes(begin)
 
-    def all_action_begins(self) -> list[ActionBegin]:
-        result = []
-
-        for root_node in self.root_nodes:
-            assert isinstance(root_node, ActionBegin)
-
-            result.append(root_node)
-
-            for node in self.all_to_nodes(root_node):
-                if isinstance(node, ActionBegin):
-                    result.append(node)
-
-        return result
-
-    def all_action_ends(self) -> list[ActionEnd]:
-        result = []
+    def all_action_begins(self) -> tuple[ActionBegin, ...]:
+        """
+        Return all ``ActionBegin`` nodes, in the order in which they were added
 
-        for root_node in self.root_nodes:
-            assert isinstance(root_node, ActionBegin)
+        The nodes are cached. The cached tuple is returned.
+        """
+        return self._cached("all_action_begins", lambda: tuple(self._action_begins))
 
-            for node in self.all_to_nodes(root_node):
-                if isinstance(node, ActionEnd):
-                    result.append(node)
+    def all_action_ends(self) -> tuple[ActionEnd, ...]:
+        """
+        Return all ``ActionEnd`` nodes, in the order in which they were added
 
-        return result
+        The nodes are cached. The cached tuple is returned.
+        """
+        return self._cached("all_action_ends", lambda: tuple(self._action_ends))
 
     def actions(self) -> list[Action]:
-        return (
-            list(dict.fromkeys(begin.action for begin in self.all_action_begins()))
-            if self.nr_nodes() > 0
-            else []
-        )
+        return list(dict.fromkeys(begin.action for begin in self.all_action_begins()))
 
     def continued_actions(self, action_combination: ActionCombination) -> list[Action]:
         """
         Return the actions that are continued by the ``action_combination``, if any
         """
         result = []
+        continued_action_names = {action.name for action in action_combination.actions}
 
-        # Find node in map containing the action combination passed in
-
-        action_begin: ActionBegin | None = None
-
-        for action_begin in self.all_action_begins():
-            if action_begin.action.name == action_combination.name:
-                # Current action begin contains the action combination
-
-                for action_end, _ in self.graph.in_edges(action_begin):
-                    assert isinstance(action_end, ActionEnd)
-                    if action_end.action.name in [
-                        action.name for action in action_combination.actions
-                    ]:
-                        result.append(action_end.action)
+        # Nodes in map containing the action combination passed in
+        for action_begin in self.action_begins_by_action_name(action_combination.name):
+            for action_end in self.from_nodes(action_begin):
+                assert isinstance(action_end, ActionEnd)
+                if action_end.action.name in continued_action_names:
+                    result.append(action_end.action)
 
         return result
 
+    def action_begins_by_action(self, action: Action) -> list[ActionBegin]:
+        """
+        Return ``ActionBegin`` nodes associated with the action passed in, if any
+        """
+        return list(self._begins_by_action.get(action, ()))
+
     def action_ends_by_action(self, action: Action) -> list[ActionEnd]:
         """
         Return ``ActionEnd`` nodes associated with the action passed in
@@ -101,16 +219,23 @@ class PathwayMap(MultiRootedGraph):
             the action
         """
         assert isinstance(action, Action), type(action)
-        result = []
-
-        for node in self.graph.nodes:
-            if isinstance(node, ActionEnd) and node.action == action:
-                result.append(node)
 
-        if len(result) == 0:
+        if action not in self._ends_by_action:
             raise LookupError(f"Action {action} is not part of the pathway map")
 
-        return result
+        return list(self._ends_by_action[action])
+
+    def action_begins_by_action_name(self, name: str) -> list[ActionBegin]:
+        """
+        Return ``ActionBegin`` nodes associated with actions with the name passed in, if any
+        """
+        return list(self._begins_by_action_name.get(name, ()))
+
+    def action_ends_by_action_name(self, name: str) -> list[ActionEnd]:
+        """
+        Return ``ActionEnd`` nodes associated with actions with the name passed in, if any
+        """
+        return list(self._ends_by_action_name.get(name, ()))
 
 
 def verify_tipping_points(
@@ -121,24 +246,80 @@ def verify_tipping_points(
 
     :raises KeyError: In case tipping_point_by_action does not contain tipping points for all actions
     :raises ValueError: In case not all tipping points are strictly increasing along a sequence of actions
+
+    Tipping points must increase along each conversion from the end of one action to the
+    end of the next action. Each conversion is checked once, also when it is part of many
+    pathways. All violations found are reported in a single exception.
     """
-    for path in pathway_map.all_paths():
-        action_ends = list(path[1::2])
-        tipping_points = [
-            tipping_point_by_action[action_end.action] for action_end in action_ends
-        ]
+    action_ends = pathway_map.all_action_ends()
+
+    if len(action_ends) == 0:
+        return
+
+    idx_by_action_end = {action_end: idx for idx, action_end in enumerate(action_ends)}
+    tipping_points = np.array(
+        [tipping_point_by_action[action_end.action] for action_end in action_ends],
+        dtype=np.float64,
+    )
+
+    # Per conversion, the indices of the action end converted from and of the action end
+    # following the action begin converted to
+    from_idxs = []
+    to_idxs = []
+
+    for action_begin in pathway_map.all_action_begins():
+        to_idx = idx_by_action_end[pathway_map.action_end(action_begin)]
+
+        for action_end in pathway_map.from_nodes(action_begin):
+            from_idxs.append(idx_by_action_end[action_end])
+            to_idxs.append(to_idx)
+
+    from_idxs_array = np.array(from_idxs, dtype=np.int64)
+    to_idxs_array = np.array(to_idxs, dtype=np.int64)
+
+    # Written as a negation, to also catch tipping points that are not a number
+    invalid = ~(tipping_points[from_idxs_array] < tipping_points[to_idxs_array])
+
+    if np.any(invalid):
+        messages: dict[str, None] = {}
+
+        for from_idx, to_idx in zip(
+            from_idxs_array[invalid].tolist(), to_idxs_array[invalid].tolist()
+        ):
+            messages[
+                f"the tipping point of action {action_ends[to_idx].action} "
+                f"({tipping_points[to_idx]}) must be larger than the tipping point of "
+                f"action {action_ends[from_idx].action} ({tipping_points[from_idx]})"
+            ] = None
+
+        raise ValueError("Given the sequences of actions, " + "; ".join(messages))
+
+
+def sample_pathway_map(
+    pathway_map: PathwayMap, k: int, seed: int | None = None
+) -> PathwayMap:
+    """
+    Return a pathway map containing a uniform random sample of the pathways in the pathway map
+    passed in
+
+    :param k: Number of pathways to sample
+    :param seed: Seed of the random number generator
+    :return: New pathway map, sharing the nodes of the pathways sampled with the pathway map
+        passed in. Information associated with these nodes, like tipping points of their
+        actions, is therefore also valid for the new map.
+
+    See also: :meth:`DirectedGraph.sample_paths`
+    """
+    result = PathwayMap()
+
+    for path in pathway_map.sample_paths(k, seed):
+        for from_node, to_node in zip(path, path[1:]):
+            if isinstance(from_node, ActionBegin):
+                result.add_period(from_node, to_node)
+            else:
+                result.add_conversion(from_node, to_node)
 
-        if len(action_ends) > 1:
-            for tipping_point_idx in range(len(tipping_points) - 1):
-                tipping_point_from = tipping_points[tipping_point_idx]
-                tipping_point_to = tipping_points[tipping_point_idx + 1]
-
-                if not tipping_point_from < tipping_point_to:
-                    raise ValueError(
-                        f"Given the sequences of actions, the tipping point of action "
-                        f"{action_ends[tipping_point_idx + 1].action} ({tipping_point_to}) "
-                        f"must be equal or larger than {tipping_point_from}"
-                    )
+    return result
 
 
 def tipping_point_range(
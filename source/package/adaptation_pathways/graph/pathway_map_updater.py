@@ -0,0 +1,121 @@
+from .convert import _add_pathway_tree
+from .node import ActionBegin
+from .node.action import Action as ActionNode
+from .pathway_map import PathwayMap
+from .sequence_graph import SequenceGraph, SequenceGraphChange
+
+
+class PathwayMapUpdater:
+    """
+    Keep a pathway map up to date with a sequence graph
+
+    :param sequence_graph: Sequence graph to follow
+
+    The pathway map contains the same pathways as the one returned by
+    :func:`sequence_graph_to_pathway_map`, with ``shared_prefixes=True``. Each change made to
+    the sequence graph is applied to the pathway map in place: when a sequence is added or
+    removed, only the periods following the periods of the sequence's from-action are added or
+    removed. The cost of an edit is proportional to the size of the change, not to the size of
+    the pathway map.
+
+    Because nodes are added and removed over time, the order of the nodes in the pathway map may
+    differ from the order in a pathway map converted from scratch. The order of the pathways is
+    the same.
+    """
+
+    _sequence_graph: SequenceGraph
+    _pathway_map: PathwayMap
+    _root_action: ActionNode | None
+    _begins_by_action: dict[ActionNode, dict[ActionBegin, None]]
+    _action_by_begin: dict[ActionBegin, ActionNode]
+
+    def __init__(self, sequence_graph: SequenceGraph) -> None:
+        self._sequence_graph = sequence_graph
+        self._pathway_map = PathwayMap()
+        self._root_action = None
+        self._begins_by_action = {}
+        self._action_by_begin = {}
+
+        if sequence_graph.nr_actions() > 0:
+            self._reset(sequence_graph.root_node)
+
+        sequence_graph.add_listener(self._update)
+
+    @property
+    def pathway_map(self) -> PathwayMap:
+        """
+        :return: The pathway map kept up to date
+        """
+        return self._pathway_map
+
+    def close(self) -> None:
+        """
+        Stop following the sequence graph
+        """
+        self._sequence_graph.remove_listener(self._update)
+
+    def _reset(self, root_action: ActionNode) -> None:
+        # Replace the contents of the pathway map by the pathways starting at the root action
+        for root_node in list(self._pathway_map.root_nodes):
+            self._remove_periods(root_node)
+
+        self._root_action = None
+
+        if self._sequence_graph.nr_to_actions(root_action) > 0:
+            self._root_action = root_action
+            self._add_periods(root_action, None)
+
+    def _add_periods(self, action: ActionNode, from_end) -> None:
+        for action_, begin in _add_pathway_tree(
+            self._pathway_map, action, self._sequence_graph.to_actions, from_end
+        ):
+            self._begins_by_action.setdefault(action_, {})[begin] = None
+            self._action_by_begin[begin] = action_
+
+    def _remove_periods(self, begin: ActionBegin) -> None:
+        for node in self._pathway_map.remove_periods(begin):
+            if isinstance(node, ActionBegin):
+                action = self._action_by_begin.pop(node)
+                begins = self._begins_by_action[action]
+                del begins[node]
+
+                if not begins:
+                    del self._begins_by_action[action]
+
+    def _update(
+        self,
+        change: SequenceGraphChange,
+        from_action: ActionNode,
+        to_action: ActionNode,
+    ) -> None:
+        if change == SequenceGraphChange.ADD_SEQUENCE:
+            if from_action in self._begins_by_action:
+                # Continue each period of the from-action with the to-action and all actions
+                # following it
+                for begin in list(self._begins_by_action[from_action]):
+                    self._add_periods(to_action, self._pathway_map.action_end(begin))
+            elif self._sequence_graph.nr_from_actions(from_action) == 0 and (
+                self._root_action is None or to_action is self._root_action
+            ):
+                # The from-action is the new root action
+                self._reset(from_action)
+        elif change == SequenceGraphChange.REMOVE_SEQUENCE:
+            if from_action in self._begins_by_action:
+                for begin in list(self._begins_by_action[from_action]):
+                    for to_begin in self._pathway_map.action_begins(
+                        self._pathway_map.action_end(begin)
+                    ):
+                        if self._action_by_begin[to_begin] is to_action:
+                            self._remove_periods(to_begin)
+
+                if (
+                    from_action is self._root_action
+                    and self._sequence_graph.nr_to_actions(from_action) == 0
+                ):
+                    # A root action without sequences does not result in pathways. In case the
+                    # to-action is not preceded by other actions anymore, it is the new root
+                    # action, like after removing the former root action itself.
+                    if self._sequence_graph.nr_from_actions(to_action) == 0:
+                        self._reset(to_action)
+                    else:
+                        self._reset(from_action)
@@ -12,7 +12,7 @@ class RootedGraph(DirectedGraph):
         :return: The root node
         """
 
-        root_nodes = [node for node, degree in self._graph.in_degree() if degree == 0]
+        root_nodes = self._root_nodes()
 
         nr_root_nodes = len(root_nodes)
 
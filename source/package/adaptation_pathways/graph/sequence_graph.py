@@ -1,14 +1,42 @@
+import enum
+import typing
+
 from ..action import Action
 from .node.action import Action as ActionNode
 from .rooted_graph import RootedGraph
 
 
+SequenceGraphChange = enum.Enum(
+    "SequenceGraphChange", ["ADD_SEQUENCE", "REMOVE_SEQUENCE"]
+)
+"""
+Kinds of changes made to a sequence graph, passed to its listeners
+
+- ``ADD_SEQUENCE``: A sequence was added
+- ``REMOVE_SEQUENCE``: A sequence was removed
+"""
+
+
+SequenceGraphListener = typing.Callable[
+    [SequenceGraphChange, ActionNode, ActionNode], None
+]
+"""
+Function called after a sequence graph has changed, with the kind of change and the from- and
+to-action of the sequence involved
+"""
+
+
 class SequenceGraph(RootedGraph):
     """
     A SequenceGraph represents the dependencies between actions. Each node represents an action,
     and each edge the fact that one action follows another one.
+
+    Listeners can be added to be notified about each sequence added to or removed from the
+    graph. Listeners are called after the change has been made, once per sequence.
     """
 
+    _listeners: list[SequenceGraphListener]
+
     def __init__(self, sequences: list[tuple[Action, Action]] | None = None) -> None:
         """
         Create a sequence graph, based on a collection of sequences
@@ -17,6 +45,7 @@ class SequenceGraph(RootedGraph):
         The same action is associated with the same node.
         """
         super().__init__()
+        self._listeners = []
 
         if sequences is not None:
             node_by_action: dict[Action, ActionNode] = {}
@@ -33,7 +62,30 @@ class SequenceGraph(RootedGraph):
 
         :param action: ActionNode
         """
-        self._graph.add_node(action)
+        self._add_node(action)
+
+    def add_listener(self, listener: SequenceGraphListener) -> None:
+        """
+        Add a function to call after each change made to the graph
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: SequenceGraphListener) -> None:
+        """
+        Remove a function added earlier using :meth:`add_listener`
+
+        :raises ValueError: In case the listener was not added
+        """
+        self._listeners.remove(listener)
+
+    def _notify(
+        self,
+        change: SequenceGraphChange,
+        from_action: ActionNode,
+        to_action: ActionNode,
+    ) -> None:
+        for listener in self._listeners:
+            listener(change, from_action, to_action)
 
     def add_sequence(self, from_action: ActionNode, to_action: ActionNode) -> None:
         """
@@ -41,8 +93,14 @@ class SequenceGraph(RootedGraph):
 
         :param from_action: First action of the sequence
         :param to_action: Second action of the sequence
+
+        Adding a sequence that is already present does nothing.
         """
-        self._graph.add_edge(from_action, to_action)
+        if self.has_edge(from_action, to_action):
+            return
+
+        self._add_edge(from_action, to_action)
+        self._notify(SequenceGraphChange.ADD_SEQUENCE, from_action, to_action)
 
     def add_sequences(self, actions: list[tuple[ActionNode, ActionNode]]) -> None:
         """
@@ -50,7 +108,45 @@ class SequenceGraph(RootedGraph):
 
         :param actions: List of tuples of ``from_action`` and ``to_action``
         """
-        return self._graph.add_edges_from(actions)
+        if not self._listeners:
+            self._add_edges(actions)
+        else:
+            # Listeners must be able to observe the graph after each individual change
+            for from_action, to_action in actions:
+                self.add_sequence(from_action, to_action)
+
+    def remove_sequence(self, from_action: ActionNode, to_action: ActionNode) -> None:
+        """
+        Remove a sequence of actions
+
+        The actions themselves are not removed.
+
+        :raises LookupError: In case the sequence is not part of the graph
+        """
+        if not self.has_edge(from_action, to_action):
+            raise LookupError(
+                f"Sequence {from_action} -> {to_action} is not part of the graph"
+            )
+
+        self._remove_edge(from_action, to_action)
+        self._notify(SequenceGraphChange.REMOVE_SEQUENCE, from_action, to_action)
+
+    def remove_action(self, action: ActionNode) -> None:
+        """
+        Remove an action, including all sequences starting or ending at it
+
+        :raises LookupError: In case the action is not part of the graph
+        """
+        if action not in self._graph:
+            raise LookupError(f"Action {action} is not part of the graph")
+
+        for from_action in self.from_actions(action):
+            self.remove_sequence(from_action, action)
+
+        for to_action in self.to_actions(action):
+            self.remove_sequence(action, to_action)
+
+        self._remove_nodes([action])
 
     def nr_actions(self) -> int:
         """
@@ -64,7 +160,7 @@ class SequenceGraph(RootedGraph):
 
         In graph-speek, this is the action's in-degree.
         """
-        return self._graph.in_degree(to_action)
+        return self.nr_from_nodes(to_action)
 
     def from_actions(self, to_action: ActionNode) -> list[ActionNode]:
         """
@@ -78,7 +174,7 @@ class SequenceGraph(RootedGraph):
 
         In graph-speek, this is the action's out-degree.
         """
-        return self._graph.out_degree(from_action)
+        return self.nr_to_nodes(from_action)
 
     def to_actions(self, from_action: ActionNode) -> list[ActionNode]:
         """
@@ -90,7 +186,7 @@ class SequenceGraph(RootedGraph):
         """
         :return: Number of sequences
         """
-        return len(self._graph.edges)
+        return self.nr_edges()
 
     def all_to_actions(self, from_action: ActionNode) -> list[ActionNode]:
         return self.all_to_nodes(from_action)
@@ -0,0 +1,43 @@
+import typing
+
+
+Node = typing.TypeVar("Node")
+
+
+def depth_first(
+    root: Node,
+    visit: typing.Callable[[Node], typing.Iterable[Node]],
+    leave: typing.Callable[[Node], None] | None = None,
+) -> None:
+    """
+    Traverse the nodes reachable from a root node, depth-first, without using recursion
+
+    :param root: Node to start the traversal at
+    :param visit: Function called when entering a node. It must return the nodes to visit
+        next. These are traversed before the remaining nodes returned for the node's parent.
+    :param leave: Function called when leaving a node, after all nodes returned by ``visit``
+        have been traversed
+
+    The nodes returned by ``visit`` are consumed one at a time. When ``visit`` is a generator,
+    the code it runs before yielding a node is executed just before that node is visited,
+    as would be the case in the loop of a recursive implementation.
+
+    Instead of Python's call stack, an explicit stack is used. Traversing very deep
+    graphs does not run into the recursion limit.
+
+    Nodes are not marked as visited. Nodes reachable along multiple paths are visited
+    multiple times. It is the responsibility of ``visit`` to prevent cycles.
+    """
+    stack: list[tuple[Node, typing.Iterator[Node]]] = [(root, iter(visit(root)))]
+
+    while stack:
+        node, to_nodes = stack[-1]
+
+        for to_node in to_nodes:
+            stack.append((to_node, iter(visit(to_node))))
+            break
+        else:
+            stack.pop()
+
+            if leave is not None:
+                leave(node)
@@ -0,0 +1,229 @@
+"""
+This module contains code for caching information derived from datasets on disk. Building a
+pathway map from the sequences in a dataset, verifying its tipping points and calculating its
+layout can take a while for large datasets. The results only depend on the contents of the
+dataset and on the layout parameters, and can be reused as long as these don't change.
+
+Cached information is stored in one file per cache key, in a compact binary (NumPy ``.npz``)
+format. Nodes are stored as the index of their action and a flag telling whether they are an
+``ActionBegin`` or an ``ActionEnd``. Edges and positions are stored as arrays. All nodes are
+stored, including nodes that are not connected to other nodes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import typing
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from ..action import Action
+from ..action_combination import ActionCombination
+from ..alias import Sequences, TippingPointByAction
+from ..graph import PathwayMap
+from ..graph.node import ActionBegin, ActionEnd
+from ..plot.alias import PositionByNode
+
+
+# Increment this number when changing the format of cached information. Older cache files
+# will not be used anymore.
+_format_version = 1
+
+
+def _actions(sequences: Sequences) -> list[Action]:
+    # Unique actions, in the order in which they occur in the sequences
+    return list(dict.fromkeys(action for sequence in sequences for action in sequence))
+
+
+def cache_key(
+    sequences: Sequences,
+    tipping_point_by_action: TippingPointByAction,
+    **parameters,
+) -> str:
+    """
+    Return the key identifying information derived from the dataset contents and parameters
+    passed in
+
+    :param sequences: Sequences of actions
+    :param tipping_point_by_action: Tipping point per action
+    :param parameters: Parameters the derived information depends on, like the layout
+        parameters. Values must be convertible to JSON, or have a stable string representation.
+    :return: Hexadecimal SHA-256 hash
+
+    Only the information that determines the pathway map and its layout is used. Information
+    that is only used for styling, like colours, is not part of the key.
+    """
+    actions = _actions(sequences)
+    idx_by_action = {action: idx for idx, action in enumerate(actions)}
+
+    contents = {
+        "format_version": _format_version,
+        "actions": [
+            [
+                action.name,
+                (
+                    [combined_action.name for combined_action in action.actions]
+                    if isinstance(action, ActionCombination)
+                    else None
+                ),
+                tipping_point_by_action.get(action, None),
+            ]
+            for action in actions
+        ],
+        "sequences": [
+            [idx_by_action[from_action], idx_by_action[to_action]]
+            for from_action, to_action in sequences
+        ],
+        "parameters": parameters,
+    }
+
+    return hashlib.sha256(
+        json.dumps(contents, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _cache_pathname(cache_directory: Path | str, key: str) -> Path:
+    return Path(cache_directory).joinpath(f"{key}.npz")
+
+
+def write_pathway_map(
+    cache_directory: Path | str,
+    key: str,
+    sequences: Sequences,
+    pathway_map: PathwayMap,
+    *,
+    position_by_node: PositionByNode | None = None,
+    y_coordinate_by_action_name: dict[str, float] | None = None,
+) -> None:
+    """
+    Store a pathway map, derived from the sequences passed in, and optionally its layout
+
+    :param cache_directory: Directory to store cached information in. It is created if it
+        does not exist.
+    :param key: Key returned by :func:`cache_key`
+    :param sequences: Sequences of actions the pathway map was derived from
+    :param pathway_map: Pathway map to store
+    :param position_by_node: Position of each node in the pathway map
+    :param y_coordinate_by_action_name: Y-coordinate of each action in the layout
+
+    The file is written under a temporary name and renamed afterwards, so concurrent readers
+    never see a partially written file.
+    """
+    idx_by_action = {action: idx for idx, action in enumerate(_actions(sequences))}
+    nodes = pathway_map.nodes()
+    idx_by_node = {node: idx for idx, node in enumerate(nodes)}
+
+    edges = [
+        (idx_by_node[from_node], idx_by_node[to_node])
+        for from_node, to_node in pathway_map.edges()
+    ]
+
+    arrays: dict[str, typing.Any] = {
+        "node_action_idxs": np.array(
+            [idx_by_action[node.action] for node in nodes], dtype=np.int32
+        ),
+        "node_is_end": np.array(
+            [isinstance(node, ActionEnd) for node in nodes], dtype=np.bool_
+        ),
+        "edges": np.array(edges, dtype=np.int32).reshape(-1, 2),
+    }
+
+    if position_by_node is not None:
+        assert y_coordinate_by_action_name is not None
+        arrays["positions"] = np.array(
+            [position_by_node[node] for node in nodes], dtype=np.float64
+        ).reshape(-1, 2)
+        arrays["y_action_names"] = np.array(
+            list(y_coordinate_by_action_name.keys()), dtype=np.str_
+        )
+        arrays["y_coordinates"] = np.array(
+            list(y_coordinate_by_action_name.values()), dtype=np.float64
+        )
+
+    cache_directory = Path(cache_directory)
+    cache_directory.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+        dir=cache_directory, suffix=".tmp", delete=False
+    ) as file:
+        try:
+            np.savez_compressed(file, **arrays)
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
+
+    os.replace(file.name, _cache_pathname(cache_directory, key))
+
+
+def read_pathway_map(
+    cache_directory: Path | str,
+    key: str,
+    sequences: Sequences,
+) -> tuple[PathwayMap, PositionByNode | None, dict[str, float] | None] | None:
+    """
+    Read a pathway map, and its layout if stored, from the cache
+
+    :param cache_directory: Directory containing cached information
+    :param key: Key returned by :func:`cache_key`
+    :param sequences: Sequences of actions the pathway map was derived from. The nodes of the
+        pathway map returned refer to the actions in these sequences.
+    :return: Pathway map, position of each node and y-coordinate of each action, or None in
+        case no (valid) information is cached for the key. Positions and y-coordinates are
+        None in case no layout was stored.
+    """
+    pathname = _cache_pathname(cache_directory, key)
+
+    if not pathname.exists():
+        return None
+
+    actions = _actions(sequences)
+
+    try:
+        with np.load(pathname, allow_pickle=False) as file:
+            arrays = {name: file[name] for name in file.files}
+
+        nodes: list[ActionBegin | ActionEnd] = [
+            (
+                ActionEnd(actions[action_idx])
+                if is_end
+                else ActionBegin(actions[action_idx])
+            )
+            for action_idx, is_end in zip(
+                arrays["node_action_idxs"].tolist(), arrays["node_is_end"].tolist()
+            )
+        ]
+        edges = arrays["edges"].tolist()
+    except (OSError, KeyError, IndexError, ValueError, zipfile.BadZipFile):
+        # Corrupt or outdated file. Treat it as missing, it will be overwritten.
+        return None
+
+    pathway_map = PathwayMap()
+
+    # Adding the nodes first preserves their order, and adds nodes without edges as well
+    for node in nodes:
+        pathway_map.add_node(node)
+
+    for from_idx, to_idx in edges:
+        from_node, to_node = nodes[from_idx], nodes[to_idx]
+
+        if isinstance(from_node, ActionBegin):
+            assert isinstance(to_node, ActionEnd)
+            pathway_map.add_period(from_node, to_node)
+        else:
+            assert isinstance(to_node, ActionBegin)
+            pathway_map.add_conversion(from_node, to_node)
+
+    position_by_node: PositionByNode | None = None
+    y_coordinate_by_action_name: dict[str, float] | None = None
+
+    if "positions" in arrays:
+        position_by_node = dict(zip(nodes, arrays["positions"]))
+        y_coordinate_by_action_name = dict(
+            zip(arrays["y_action_names"].tolist(), arrays["y_coordinates"].tolist())
+        )
+
+    return pathway_map, position_by_node, y_coordinate_by_action_name
@@ -3,7 +3,7 @@ import typing
 import matplotlib.lines as mlines
 
 from ...alias import TippingPointByAction
-from ...graph import PathwayMap, tipping_point_range
+from ...graph import PathwayMap, sample_pathway_map, tipping_point_range
 from ...graph.node import ActionEnd
 from ..alias import (
     ColourByActionName,
@@ -43,18 +43,17 @@ def _configure_x_axes(
 
 def _configure_y_axes(
     axes,
-    paths: list[list[typing.Any]],
+    leaf_action_ends: list[ActionEnd],
     *,
     # label_by_pathway,
     marker_by_pathway: MarkerByPathway,
     marker_style: MarkerStyle,
 ):
-    leaf_action_ends = [path[-1] for path in paths]
     assert all(isinstance(action_end, ActionEnd) for action_end in leaf_action_ends)
     leaf_actions = [action_end.action for action_end in leaf_action_ends]
 
     # labels = [label_by_pathway[action] for action in leaf_actions]
-    y_coordinates = list(range(len(paths)))
+    y_coordinates = list(range(len(leaf_action_ends)))
     axes.set_yticks(y_coordinates, labels="")
 
     markers = [marker_by_pathway.get(action, None) for action in leaf_actions]
@@ -123,7 +122,7 @@ def _configure_legend(
 
 def _plot_annotations(
     axes,
-    paths: list[list[typing.Any]],
+    leaf_action_ends: list[ActionEnd],
     action_names: set[str],
     *,
     colour_by_action_name,
@@ -140,7 +139,7 @@ def _plot_annotations(
     configure_title(axes, title=title)
     _configure_y_axes(
         axes,
-        paths,  # label_by_pathway=label_by_pathway,
+        leaf_action_ends,  # label_by_pathway=label_by_pathway,
         marker_by_pathway=marker_by_pathway,
         marker_style=marker_style,
     )
@@ -170,6 +169,8 @@ def plot_bars(
     marker_by_action_name: MarkerByActionName | None = None,
     marker_by_pathway: MarkerByPathway | None = None,
     marker_style: MarkerStyle | None = None,
+    sample_seed: int | None = None,
+    sample_size: int | None = None,
     show_legend: bool = False,
     stack_bars: bool = False,
     tipping_point_by_action: TippingPointByAction,
@@ -190,6 +191,9 @@ def plot_bars(
     :param marker_by_action_name: For each action a marker, which will be used in the legend
     :param marker_by_pathway: For each pathway a marker, which will be used to annotate the bars
     :param marker_style: The style to use for the markers
+    :param sample_seed: Seed of the random number generator used to sample pathways
+    :param sample_size: Number of pathways to plot. In case it is passed in, a uniform random
+        sample of this size is plotted, instead of all pathways.
     :param bool show_legend: Whether or not to show the legend
     :param bool stack_bars: Whether or not to stack the bars, removing whitespace between them
     :param tipping_point_by_action: For each action instance a tipping point
@@ -233,9 +237,24 @@ def plot_bars(
             "markersize": 10,
         }
 
-    paths = pathway_map.all_paths()
+    if sample_size is not None:
+        # Defaults are based on all pathways, so they don't depend on the sample
+        pathway_map = sample_pathway_map(pathway_map, sample_size, sample_seed)
+
+    # Pathways are positioned by their level. Determining the position of each pathway only
+    # requires its leaf node. The pathways themselves are generated one at a time, when
+    # plotting them.
+    leaf_action_ends = [path[-1] for path in pathway_map.iter_paths()]
+    path_idxs = sorted(
+        range(len(leaf_action_ends)),
+        key=lambda idx: level_by_pathway[leaf_action_ends[idx].action],
+    )
+    y_by_path_idx = [0] * len(path_idxs)
+
+    for y, path_idx in enumerate(path_idxs):
+        y_by_path_idx[path_idx] = y
 
-    paths.sort(key=lambda path: level_by_pathway[path[-1].action])
+    leaf_action_ends = [leaf_action_ends[path_idx] for path_idx in path_idxs]
 
     bar_height = 0.8 if not stack_bars else 1.0
 
@@ -249,8 +268,8 @@ def plot_bars(
     tipping_point_range_ = max_tipping_point - min_tipping_point
     assert tipping_point_range_ >= 0
 
-    for idx, path in enumerate(paths):
-        y = idx
+    for path_idx, path in enumerate(pathway_map.iter_paths()):
+        y = y_by_path_idx[path_idx]
         action_ends = list(path[1::2])
 
         x = [tipping_point_by_action[action_end.action] for action_end in action_ends]
@@ -278,7 +297,7 @@ def plot_bars(
     action_names = {action.name for action in pathway_map.actions()}
     _plot_annotations(
         axes,
-        paths,
+        leaf_action_ends,
         action_names,
         colour_by_action_name=colour_by_action_name,
         # label_by_pathway=label_by_pathway,
@@ -90,9 +90,7 @@ def default_edge_colours(
     For each edge in the graph, return a colour
     """
     colour = nord_palette_dark[3]
-    colours: list[alias.Colour | alias.Colours] = [colour] * len(
-        list(graph.graph.edges)
-    )
+    colours: list[alias.Colour | alias.Colours] = [colour] * graph.nr_edges()
 
     return colours
 
@@ -111,7 +109,7 @@ def default_node_edge_colours(
     For each edge in the graph, return a colour
     """
     colour = nord_palette_dark[3]
-    colours = [colour] * len(list(graph.graph.edges))
+    colours = [colour] * graph.nr_edges()
 
     return colours
 
@@ -21,7 +21,7 @@ def colour_by_node(
 
     # Use the same colour for conversions
     # Colour each unique action unique
-    for node in graph._graph.nodes:
+    for node in graph.nodes():
         assert type(node) in [ActionConversion, ActionPeriod]
         if isinstance(node, ActionPeriod):
             colours.append(colour_by_action_name[node.action.name])
@@ -38,7 +38,7 @@ def colour_by_action_name_pathway_graph(
     result = {}
     idx = 0
 
-    for node in graph._graph.nodes:
+    for node in graph.nodes():
         assert type(node) in [ActionConversion, ActionPeriod]
         if isinstance(node, ActionPeriod):
             if node.action.name not in result:
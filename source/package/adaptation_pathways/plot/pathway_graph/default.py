@@ -5,6 +5,7 @@ import numpy as np
 
 from ...graph import PathwayGraph
 from ...graph.node import Node
+from ...graph.traversal import depth_first
 from .. import alias
 from ..colour import default_nominal_palette
 from ..util import add_position, distribute, plot_graph, sort_horizontally
@@ -16,22 +17,26 @@ def _distribute_horizontally(
     from_node: Node,
     position_by_node: alias.PositionByNode,
 ) -> None:
-    assert isinstance(from_node, Node), type(from_node)
-
     min_distance = 1.0
-    from_x = position_by_node[from_node][0]
 
-    for to_node in pathway_graph.to_nodes(from_node):
-        to_x = from_x + min_distance
+    def visit(from_node: Node) -> list[Node]:
+        assert isinstance(from_node, Node), type(from_node)
+
+        from_x = position_by_node[from_node][0]
+        to_nodes = pathway_graph.to_nodes(from_node)
+
+        for to_node in to_nodes:
+            to_x = from_x + min_distance
 
-        # Push conversion to the right if necessary
-        if to_node in position_by_node:
-            to_x = max(to_x, position_by_node[to_node][0])
+            # Push conversion to the right if necessary
+            if to_node in position_by_node:
+                to_x = max(to_x, position_by_node[to_node][0])
 
-        add_position(position_by_node, to_node, (to_x, np.nan))
+            add_position(position_by_node, to_node, (to_x, np.nan))
 
-    for to_node in pathway_graph.to_nodes(from_node):
-        _distribute_horizontally(pathway_graph, to_node, position_by_node)
+        return to_nodes
+
+    depth_first(from_node, visit)
 
 
 def _distribute_vertically(
@@ -62,25 +67,20 @@ def _distribute_vertically(
 
         # Initialize the y-coordinate with the mean of the y-coordinates of the nodes
         # that end in each node
-        for node in nodes:
+        for node, from_nodes in zip(nodes, pathway_graph.predecessors_of(nodes)):
             # Each node is only visited once
             assert np.isnan(position_by_node[node][1])
 
-            # Calculate the mean y-coordinate of actions that end in the to_action
-            from_nodes = pathway_graph.from_nodes(node)
-
             # Only the root node does not have from_nodes
             assert len(from_nodes) > 0
 
-            y_coordinates = [position_by_node[node][1] for node in from_nodes]
+            # Calculate the mean y-coordinate of actions that end in the to_action
+            y_coordinates = [position_by_node[from_node][1] for from_node in from_nodes]
 
             # All from_nodes must already be positioned
             assert all(not np.isnan(coordinate) for coordinate in y_coordinates)
 
-            mean_y = sum(position_by_node[node][1] for node in from_nodes) / len(
-                from_nodes
-            )
-            position_by_node[node][1] = mean_y
+            position_by_node[node][1] = sum(y_coordinates) / len(y_coordinates)
 
         # If the previous loop resulted in same / similar y-coordinates, we spread them
         # out some more
@@ -2,6 +2,7 @@
 This sub-package contains code related to plotting pathway maps
 """
 
+from .classic import calculate_layout as classic_pathway_map_layout
 from .classic import plot as plot_classic_pathway_map
 from .colour import edge_colours as pathway_map_edge_colours
 from .colour import edge_styles as pathway_map_edge_styles
@@ -9,8 +9,9 @@ import numpy as np
 from ...action import Action
 from ...action_combination import ActionCombination
 from ...alias import TippingPointByAction
-from ...graph import PathwayMap, tipping_point_range
+from ...graph import PathwayMap, sample_pathway_map, tipping_point_range
 from ...graph.node import ActionBegin, ActionEnd
+from ...graph.traversal import depth_first
 from ..alias import (
     ColourByActionName,
     LevelByActionName,
@@ -39,7 +40,14 @@ def _plot_action_lines(
     tipping_point_overshoot,
 ) -> mpl.collections.LineCollection:
 
-    edge_nodes = list(pathway_map.graph.edges())
+    # Order edges by the node they point to. This way, the order in which overlapping edges are
+    # drawn does not depend on whether pathways share the nodes of common prefixes or not.
+    nodes = pathway_map.nodes()
+    edge_nodes = [
+        (from_node, to_node)
+        for to_node, from_nodes in zip(nodes, pathway_map.predecessors_of(nodes))
+        for from_node in from_nodes
+    ]
     edge_collection = mpl.collections.LineCollection([])
 
     if len(edge_nodes) > 0:
@@ -446,22 +454,21 @@ def _distribute_horizontally(
     tipping_point_by_action: TippingPointByAction,
     position_by_node: PositionByNode,
 ) -> None:
-    assert isinstance(action_begin, ActionBegin)
+    def visit(action_begin: ActionBegin) -> typing.Iterator[ActionBegin]:
+        assert isinstance(action_begin, ActionBegin)
 
-    action_end = pathway_map.action_end(action_begin)
-    end_x = tipping_point_by_action[action_end.action]
+        action_end = pathway_map.action_end(action_begin)
+        end_x = tipping_point_by_action[action_end.action]
 
-    add_position(position_by_node, action_end, (end_x, np.nan))
+        add_position(position_by_node, action_end, (end_x, np.nan))
 
-    for action_begin_new in pathway_map.action_begins(
-        pathway_map.action_end(action_begin)
-    ):
-        begin_x = end_x
+        for action_begin_new in pathway_map.action_begins(action_end):
+            begin_x = end_x
 
-        add_position(position_by_node, action_begin_new, (begin_x, np.nan))
-        _distribute_horizontally(
-            pathway_map, action_begin_new, tipping_point_by_action, position_by_node
-        )
+            add_position(position_by_node, action_begin_new, (begin_x, np.nan))
+            yield action_begin_new
+
+    depth_first(action_begin, visit)
 
 
 # pylint: disable-next=too-many-locals
@@ -479,21 +486,18 @@ def _spread_horizontally(
     # Per x-coordinate a list of regions (y-coordinates), action end/begin tuples
     nodes_by_x: dict[float, list[tuple[Region, tuple[ActionEnd, ActionBegin]]]] = {}
 
-    for action_end in pathway_map.all_action_ends():
-        action_begins = pathway_map.action_begins(action_end)
-
-        if action_begins:
+    # Visit the conversions in the order of the action begins. This way, the result does not
+    # depend on whether pathways share the nodes of common prefixes or not.
+    for action_begin in pathway_map.all_action_begins():
+        for action_end in pathway_map.from_nodes(action_begin):
             x_end, y_end = position_by_node[action_end]
+            x_begin, y_begin = position_by_node[action_begin]
+            assert x_end == x_begin
+            region = tuple(sorted([y_end, y_begin]))
 
-            if x_end not in nodes_by_x:
-                nodes_by_x[x_end] = []
-
-            for action_begin in action_begins:
-                x_begin, y_begin = position_by_node[action_begin]
-                assert x_end == x_begin
-                region = tuple(sorted([y_end, y_begin]))
-
-                nodes_by_x[x_end].append((region, (action_end, action_begin)))
+            nodes_by_x.setdefault(x_end, []).append(
+                (region, (action_end, action_begin))
+            )
 
     min_x = min(nodes_by_x.keys())
     max_x = max(
@@ -619,8 +623,10 @@ def _distribute_vertically(
     for root_action_begin in root_actions_begins:
         y_coordinate_by_action_name[root_action_begin.action.name] = 0
 
+    root_actions_begins_set = set(root_actions_begins)
+
     for action_begin in pathway_map.all_action_begins()[1:]:  # Skip root node
-        if action_begin not in root_actions_begins:
+        if action_begin not in root_actions_begins_set:
             action = action_begin.action
 
             if (
@@ -727,6 +733,32 @@ def _layout(
     return position_by_node, y_coordinate_by_action_name
 
 
+def calculate_layout(
+    pathway_map: PathwayMap,
+    *,
+    level_by_action_name: LevelByActionName | None = None,
+    overlapping_lines_spread=(0.0, 0.0),
+    tipping_point_by_action: TippingPointByAction,
+) -> tuple[PositionByNode, dict[str, float]]:
+    """
+    Calculate the layout used by :func:`plot`
+
+    :return: Position of each node and y-coordinate of each action name
+
+    The layout can be calculated once, stored, and passed to :func:`plot` when plotting the
+    same pathway map multiple times, with different styling.
+    """
+    if level_by_action_name is None:
+        level_by_action_name = action_level_by_first_occurrence(pathway_map)
+
+    return _layout(
+        pathway_map,
+        overlapping_lines_spread=overlapping_lines_spread,
+        level_by_action_name=level_by_action_name,
+        tipping_point_by_action=tipping_point_by_action,
+    )
+
+
 def plot(
     axes: mpl.axes.Axes,
     pathway_map: PathwayMap,
@@ -737,6 +769,9 @@ def plot(
     marker_by_action_name: MarkerByActionName | None = None,
     marker_style: MarkerStyle | None = None,
     overlapping_lines_spread=(0.0, 0.0),
+    position_by_node: PositionByNode | None = None,
+    sample_seed: int | None = None,
+    sample_size: int | None = None,
     show_legend: bool = False,
     start_action_marker: mmarkers.MarkerStyle = "o",
     tipping_point_by_action: TippingPointByAction,
@@ -746,7 +781,18 @@ def plot(
     title: str = "",
     use_markers_as_yticks: bool = False,
     x_label: str = "",
+    y_coordinate_by_action_name: dict[str, float] | None = None,
 ) -> None:
+    """
+    Plot a pathway map using the classic layout
+
+    In case ``position_by_node`` and ``y_coordinate_by_action_name`` are passed in, they are
+    used instead of calculating the layout. They must have been calculated by
+    :func:`calculate_layout`, for the same pathway map and layout parameters.
+
+    In case ``sample_size`` is passed in, only a uniform random sample of this number of
+    pathways is plotted. Colours and levels are based on all pathways.
+    """
 
     if colour_by_action_name is None:
         colour_by_action_name = colour_by_action_name_pathway_map(
@@ -779,17 +825,24 @@ def plot(
     if isinstance(tipping_point_marker, str):
         tipping_point_marker = mmarkers.MarkerStyle(tipping_point_marker)
 
-    layout, y_coordinate_by_action_name = _layout(
-        pathway_map,
-        overlapping_lines_spread=overlapping_lines_spread,
-        level_by_action_name=level_by_action_name,
-        tipping_point_by_action=tipping_point_by_action,
-    )
+    if sample_size is not None:
+        assert position_by_node is None, "A layout cannot be reused for a sample"
+        pathway_map = sample_pathway_map(pathway_map, sample_size, sample_seed)
+
+    if position_by_node is None:
+        position_by_node, y_coordinate_by_action_name = _layout(
+            pathway_map,
+            overlapping_lines_spread=overlapping_lines_spread,
+            level_by_action_name=level_by_action_name,
+            tipping_point_by_action=tipping_point_by_action,
+        )
+
+    assert y_coordinate_by_action_name is not None
 
     classic_pathway_map_plotter(
         axes,
         pathway_map,
-        layout,
+        position_by_node,
         y_coordinate_by_action_name,
         colour_by_action_name=colour_by_action_name,
         legend_arguments=legend_arguments,
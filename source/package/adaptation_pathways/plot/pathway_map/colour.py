@@ -18,24 +18,23 @@ def node_colours(
 
     # Colour each action begin / end combo unique
 
-    for path in graph.all_paths():
-        for node in path:
-            assert isinstance(node, (ActionBegin, ActionEnd)), node
+    for node in graph.nodes():
+        assert isinstance(node, (ActionBegin, ActionEnd)), node
 
-            action = node.action
+        action = node.action
 
-            if isinstance(action, ActionCombination):
-                # TODO Handle combinations
-                colours.append(colour_by_action_name[action.name])
-                # Multi-colour node
-                # colours.append(
-                #     list(
-                #         colour_by_action_name[combined_action.name]
-                #         for combined_action in action.actions
-                #     )
-                # )
-            else:
-                colours.append(colour_by_action_name[action.name])
+        if isinstance(action, ActionCombination):
+            # TODO Handle combinations
+            colours.append(colour_by_action_name[action.name])
+            # Multi-colour node
+            # colours.append(
+            #     list(
+            #         colour_by_action_name[combined_action.name]
+            #         for combined_action in action.actions
+            #     )
+            # )
+        else:
+            colours.append(colour_by_action_name[action.name])
 
     return colours
 
@@ -46,27 +45,24 @@ def edge_colours(
     colours: list[alias.Colour | alias.Colours] = []
 
     # Iterate over all edges and use the colour associated with the action associated with the edge
-    for path in graph.all_paths():
-        for from_node in path:
-            assert isinstance(from_node, (ActionBegin, ActionEnd)), from_node
-
-            action = from_node.action
-            # colours.append(colour_by_action_name[action.name])
+    for from_node, _ in graph.edges():
+        assert isinstance(from_node, (ActionBegin, ActionEnd)), from_node
 
-            if isinstance(from_node, ActionBegin) and isinstance(
-                action, ActionCombination
-            ):
-                # TODO Handle combination
-                colours.append(colour_by_action_name[action.actions[0].name])
-                # Multi-colour dash
-                # colours.append(
-                #     list(
-                #         colour_by_action_name[combined_action.name]
-                #         for combined_action in action.actions
-                #     )
-                # )
-            else:
-                colours.append(colour_by_action_name[action.name])
+        action = from_node.action
+        # colours.append(colour_by_action_name[action.name])
+
+        if isinstance(from_node, ActionBegin) and isinstance(action, ActionCombination):
+            # TODO Handle combination
+            colours.append(colour_by_action_name[action.actions[0].name])
+            # Multi-colour dash
+            # colours.append(
+            #     list(
+            #         colour_by_action_name[combined_action.name]
+            #         for combined_action in action.actions
+            #     )
+            # )
+        else:
+            colours.append(colour_by_action_name[action.name])
 
     return colours
 
@@ -91,7 +87,7 @@ def _node_style_by_action(
 ) -> dict[ActionBegin, alias.FillStyle | alias.FillStyles]:
     result: dict[ActionBegin, alias.FillStyle | alias.FillStyles] = {}
 
-    for node in graph._graph.nodes:
+    for node in graph.nodes():
         assert type(node) in (ActionBegin, ActionEnd), node
         assert not node in result, node
         action = node.action
@@ -109,7 +105,7 @@ def node_styles(graph: PathwayMap) -> list[alias.FillStyle | alias.FillStyles]:
     styles_by_action_begin = _node_style_by_action(graph)
     styles: list[alias.FillStyle | alias.FillStyles] = []
 
-    for node in graph._graph.nodes:
+    for node in graph.nodes():
         styles.append(styles_by_action_begin[node])
 
     return styles
@@ -127,7 +123,7 @@ def _styles_by_action_begin(
 ) -> dict[ActionBegin, alias.Style | alias.Styles]:
     result: dict[ActionBegin, alias.Style | alias.Styles] = {}
 
-    for from_node, _ in graph._graph.edges:
+    for from_node, _ in graph.edges():
         assert type(from_node) in [ActionBegin, ActionEnd], from_node
 
         if isinstance(from_node, ActionBegin):
@@ -152,7 +148,7 @@ def edge_styles(graph: PathwayMap) -> list[alias.Style | alias.Styles]:
     styles_by_action_begin = _styles_by_action_begin(graph)
     styles: list[alias.Style | alias.Styles] = []
 
-    for from_node, _ in graph._graph.edges:
+    for from_node, _ in graph.edges():
         assert isinstance(from_node, (ActionBegin, ActionEnd)), from_node
 
         if isinstance(from_node, ActionBegin):
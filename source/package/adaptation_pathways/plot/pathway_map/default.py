@@ -16,35 +16,31 @@ def _distribute_horizontally(
     Assign x-coordinates to all action_{begin,end} nodes in the pathway map
     """
 
-    paths = pathway_map.all_paths()
-
-    if len(paths) > 0:
-        min_distance = 1.0
+    min_distance = 1.0
 
-        for path in paths:
-            begin_x = 0.0
+    for path in pathway_map.iter_paths():
+        begin_x = 0.0
+        end_x = begin_x + min_distance
+
+        for action_begin_idx in range(0, len(path), 2):
+            action_begin, action_end = (
+                path[action_begin_idx],
+                path[action_begin_idx + 1],
+            )
+            add_position(position_by_node, action_begin, (begin_x, np.nan))
+            add_position(position_by_node, action_end, (end_x, np.nan))
+            begin_x = end_x + min_distance
             end_x = begin_x + min_distance
 
-            for action_begin_idx in range(0, len(path), 2):
-                action_begin, action_end = (
-                    path[action_begin_idx],
-                    path[action_begin_idx + 1],
-                )
-                add_position(position_by_node, action_begin, (begin_x, np.nan))
-                add_position(position_by_node, action_end, (end_x, np.nan))
-                begin_x = end_x + min_distance
-                end_x = begin_x + min_distance
-
 
 def _distribute_vertically(
     pathway_map: PathwayMap,
     position_by_node: alias.PositionByNode,
 ) -> None:
-    paths = pathway_map.all_paths()
     min_distance = 1.0
-    y_coordinates = distribute([0.0] * len(paths), min_distance)
+    y_coordinates = distribute([0.0] * pathway_map.count_paths(), min_distance)
 
-    for path_idx, path in enumerate(paths):
+    for path_idx, path in enumerate(pathway_map.iter_paths()):
         y_coordinate = y_coordinates[path_idx]
 
         for node in path:
@@ -17,7 +17,7 @@ def colour_by_node(
     # pylint: disable=redefined-outer-name
     colours: list[alias.Colour | alias.Colours] = []
 
-    for node in graph._graph.nodes:
+    for node in graph.nodes():
         assert isinstance(node, ActionNode)
         assert node.action.name in colour_by_action_name, node.action
         colours.append(colour_by_action_name[node.action.name])
@@ -33,7 +33,7 @@ def colour_by_action_name_sequence_graph(
 
     idx = 0
 
-    for node in graph._graph.nodes:
+    for node in graph.nodes():
         assert isinstance(node, ActionNode)
         if node.action.name not in result:
             result[node.action.name] = palette[idx % palette_size]
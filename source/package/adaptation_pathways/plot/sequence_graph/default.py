@@ -5,6 +5,7 @@ import numpy as np
 
 from ...graph import SequenceGraph
 from ...graph.node import Action
+from ...graph.traversal import depth_first
 from .. import alias
 from ..colour import default_nominal_palette
 from ..util import add_position, distribute, plot_graph, sort_horizontally
@@ -17,19 +18,23 @@ def _distribute_horizontally(
     nodes: alias.PositionByNode,
 ) -> None:
     min_distance = 1.0
-    from_x = nodes[from_action][0]
 
-    for to_action in sequence_graph.to_actions(from_action):
-        to_x = from_x + min_distance
+    def visit(from_action: Action) -> list[Action]:
+        from_x = nodes[from_action][0]
+        to_actions = sequence_graph.to_actions(from_action)
 
-        # Push action to the right if necessary
-        if to_action in nodes:
-            to_x = max(to_x, nodes[to_action][0])
+        for to_action in to_actions:
+            to_x = from_x + min_distance
 
-        add_position(nodes, to_action, (to_x, np.nan))
+            # Push action to the right if necessary
+            if to_action in nodes:
+                to_x = max(to_x, nodes[to_action][0])
 
-    for to_action in sequence_graph.to_actions(from_action):
-        _distribute_horizontally(sequence_graph, to_action, nodes)
+            add_position(nodes, to_action, (to_x, np.nan))
+
+        return to_actions
+
+    depth_first(from_action, visit)
 
 
 def _distribute_vertically(
@@ -55,25 +60,22 @@ def _distribute_vertically(
 
         # Initialize the y-coordinate with the mean of the y-coordinates of the from_actions
         # that end in each action
-        for action in actions:
+        for action, from_actions in zip(
+            actions, sequence_graph.predecessors_of(actions)
+        ):
             # Each action is only visited once
             assert np.isnan(nodes[action][1]), f"action {action}: {nodes[action]}"
 
-            # Calculate the mean y-coordinate of actions that end in the to_action
-            from_actions = sequence_graph.from_actions(action)
-
             # Only the root action does not have from_actions
             assert len(from_actions) > 0
 
-            y_coordinates = [nodes[action][1] for action in from_actions]
+            # Calculate the mean y-coordinate of actions that end in the to_action
+            y_coordinates = [nodes[from_action][1] for from_action in from_actions]
 
             # All from_actions must already be positioned
             assert all(not np.isnan(coordinate) for coordinate in y_coordinates)
 
-            mean_y = sum(nodes[action][1] for action in from_actions) / len(
-                from_actions
-            )
-            nodes[action][1] = mean_y
+            nodes[action][1] = sum(y_coordinates) / len(y_coordinates)
 
         # If the previous loop resulted in same / similar y-coordinates, we spread them
         # out some more
@@ -10,7 +10,6 @@ from adaptation_pathways.app.model.action import Action
 from ..action_icon import ActionIcon
 from ..editable_cell import EditableTextCell
 from ..metric_effect import MetricEffectCell
-from ..metric_value import MetricValueCell
 from ..styled_table import StyledTable, TableCell, TableColumn, TableRow
 
 
@@ -50,8 +49,8 @@ class ActionsEditor(ft.Column):
     def on_name_edited(self, _):
         self.app.notify_actions_changed()
 
-    def on_cell_edited(self, cell: MetricValueCell):
-        self.app.project.update_pathway_values(cell.metric.id)
+    def on_cell_edited(self, action: Action, cell: MetricEffectCell):
+        self.app.project.update_action_values(action.id, [cell.metric])
         self.app.notify_actions_changed()
 
     def on_delete_actions(self, rows: list[TableRow]):
@@ -164,7 +163,11 @@ class ActionsEditor(ft.Column):
                 effect = action.metric_data[metric.id]
                 metric_cells.append(
                     MetricEffectCell(
-                        metric, effect, on_finished_editing=self.on_cell_edited
+                        metric,
+                        effect,
+                        on_finished_editing=lambda cell, a=action: self.on_cell_edited(
+                            a, cell
+                        ),
                     )
                 )
 
@@ -78,11 +78,13 @@ class PathwaysEditor(ft.Container):
         children = [*self.app.project.get_children(pathway.id)]
         pathway_action = self.app.project.get_action(pathway.action_id)
 
+        used_action_ids = {ancestor.action_id for ancestor in ancestors}
+        used_action_ids.update(child.action_id for child in children)
+
         unused_action_ids = [
             action.id
             for action in self.app.project.all_actions
-            if not any(ancestor.action_id == action.id for ancestor in ancestors)
-            and not any(child.action_id == action.id for child in children)
+            if action.id not in used_action_ids
         ]
 
         row_controls = [
@@ -142,7 +144,7 @@ class PathwaysEditor(ft.Container):
                             controls=row_controls,
                         ),
                     ),
-                    sort_value=pathway.id,
+                    sort_value=self.app.project.get_pathway_path(pathway),
                 ),
                 *(
                     MetricValueCell(
@@ -1,12 +1,10 @@
 import datetime
-from functools import partial
 
 import flet as ft
 from src.pathways_app import PathwaysApp
-from src.utils import find_index
 
 from adaptation_pathways.app.model.metric import Metric
-from adaptation_pathways.app.model.scenario import YearDataPoint
+from adaptation_pathways.app.model.scenario import Scenario, YearDataPoint
 
 from ..editable_cell import EditableIntCell, EditableTextCell
 from ..header import SmallHeader
@@ -151,10 +149,10 @@ class ScenariosEditor(ft.Column):
         )
 
     def on_year_edited(self, _):
-        for metric in self.app.project.all_conditions:
-            self.app.project.values_scenario.recalculate_values(metric.id)
+        Scenario.recalculate_all_values(
+            [self.app.project.values_scenario], self.app.project.condition_ids
+        )
 
-        self.app.project.values_scenario.sort_yearly_data()
         self.app.notify_scenarios_changed()
 
     def on_metric_value_edited(self, cell: MetricValueCell):
@@ -176,31 +174,18 @@ class ScenariosEditor(ft.Column):
         scenario = self.app.project.values_scenario
 
         year = datetime.datetime.now().year
-        year_count = len(scenario.yearly_data)
 
-        if year_count > 0:
-            year = scenario.yearly_data[year_count - 1].year + 1
+        if len(scenario.years) > 0:
+            year = int(scenario.years[-1]) + 1
 
         scenario.get_or_add_year(year)
-        for metric in self.app.project.all_conditions:
-            scenario.recalculate_values(metric.id)
+        Scenario.recalculate_all_values([scenario], self.app.project.condition_ids)
 
         self.app.notify_scenarios_changed()
 
     def on_delete_years(self, rows: list[TableRow]):
-        def is_year(data: YearDataPoint, year: int):
-            return data.year == year
-
         for row in rows:
-            row_year = int(row.row_id)
-
-            data_index = find_index(
-                self.app.project.values_scenario.yearly_data,
-                partial(is_year, year=row_year),
-            )
-            if data_index is None:
-                continue
-            self.app.project.values_scenario.yearly_data.pop(data_index)
+            self.app.project.values_scenario.remove_year(int(row.row_id))
 
         self.app.notify_scenarios_changed()
 
@@ -43,7 +43,7 @@ class TableCell:
 
 
 class TableRow:
-    def __init__(self, row_id: str, cells: list[TableCell], can_be_deleted=True):
+    def __init__(self, row_id: str | int, cells: list[TableCell], can_be_deleted=True):
         self.row_id = row_id
         self.cells = cells
         self.can_be_deleted = can_be_deleted
@@ -156,7 +156,7 @@ class StyledTable(ft.Container):
         self.on_copy = on_copy
         self.on_delete = on_delete
 
-        self.selected_row_ids: set[str] = set()
+        self.selected_row_ids: set[str | int] = set()
         self.add_button = StyledButton(
             add_label,
             ft.Icons.ADD_CIRCLE_OUTLINE,
@@ -24,3 +24,8 @@ class ActionCombinationTest(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             ActionCombination("b", [a, a])
+
+    def test_slots(self):
+        c = ActionCombination("c", [Action("a"), Action("b")])
+
+        self.assertFalse(hasattr(c, "__dict__"))
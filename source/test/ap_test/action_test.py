@@ -9,3 +9,8 @@ class ActionTest(unittest.TestCase):
         action = Action(name)
 
         self.assertEqual(action.name, name)
+
+    def test_slots(self):
+        action = Action("a")
+
+        self.assertFalse(hasattr(action, "__dict__"))
@@ -0,0 +1,124 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from adaptation_pathways.app.model.metric import (
+    MetricEffect,
+    MetricOperation,
+    apply_clamped_affine,
+    apply_clamped_affine_to_value,
+    compose_clamped_affine,
+)
+
+
+class ClampedAffineTest(unittest.TestCase):
+    def assert_same_value(self, value_we_got: float, value_we_want: float):
+        if math.isnan(value_we_want):
+            self.assertTrue(math.isnan(value_we_got))
+        else:
+            self.assertEqual(value_we_got, value_we_want)
+
+    def test_apply(self):
+        values = [-math.inf, -2.5, 0.0, 3.0, math.inf, math.nan]
+
+        for operation in MetricOperation:
+            for effect_value in [-2.0, 0.0, 1.5]:
+                effect = MetricEffect(effect_value, operation)
+                scale, offset, lower_bound, upper_bound = effect.clamped_affine()
+                results = apply_clamped_affine(
+                    np.full(len(values), scale),
+                    np.full(len(values), offset),
+                    np.full(len(values), lower_bound),
+                    np.full(len(values), upper_bound),
+                    np.array(values),
+                ).tolist()
+
+                for value, result in zip(values, results):
+                    # The scalar version gives the same results
+                    self.assert_same_value(
+                        apply_clamped_affine_to_value(
+                            (scale, offset, lower_bound, upper_bound), value
+                        ),
+                        result,
+                    )
+
+                    if (
+                        operation == MetricOperation.MULTIPLY
+                        and effect_value == 0
+                        and not math.isfinite(value)
+                    ):
+                        # Multiplying by zero always results in zero
+                        self.assertEqual(result, 0)
+                    else:
+                        self.assert_same_value(result, effect.apply_to(value))
+
+    def test_replace_non_finite_values(self):
+        scale, offset, lower_bound, upper_bound = MetricEffect(
+            4, MetricOperation.REPLACE
+        ).clamped_affine()
+
+        self.assertEqual(
+            apply_clamped_affine(
+                np.array([scale] * 3),
+                np.array([offset] * 3),
+                np.array([lower_bound] * 3),
+                np.array([upper_bound] * 3),
+                np.array([math.inf, -math.inf, math.nan]),
+            ).tolist(),
+            [4, 4, 4],
+        )
+
+
+class ComposeClampedAffineTest(unittest.TestCase):
+    def test_compare_with_sequential(self):
+        rng = random.Random(0)
+        values = [-math.inf, -7.5, -1.0, 0.0, 0.5, 3.0, 12.0, math.inf, math.nan]
+
+        for _ in range(500):
+            effects = [
+                MetricEffect(
+                    rng.choice([-2.0, -0.5, 0.0, 1.0, 1.5, 4.0]),
+                    rng.choice(list(MetricOperation)),
+                )
+                for _ in range(rng.randint(0, 6))
+            ]
+            composed_effect = MetricEffect(0, MetricOperation.NONE).clamped_affine()
+
+            for effect in effects:
+                composed_effect = compose_clamped_affine(
+                    composed_effect, effect.clamped_affine()
+                )
+
+            scale, offset, lower_bound, upper_bound = composed_effect
+            results = apply_clamped_affine(
+                np.full(len(values), scale),
+                np.full(len(values), offset),
+                np.full(len(values), lower_bound),
+                np.full(len(values), upper_bound),
+                np.array(values),
+            ).tolist()
+
+            for value, result in zip(values, results):
+                value_we_want = value
+
+                for effect in effects:
+                    value_we_want = effect.apply_to(value_we_want)
+
+                if not math.isfinite(value) and any(
+                    effect.operation == MetricOperation.MULTIPLY and effect.value == 0
+                    for effect in effects
+                ):
+                    # Multiplying by zero results in zero, or in an effect applied to zero
+                    continue
+
+                if math.isnan(value_we_want):
+                    self.assertTrue(math.isnan(result))
+                else:
+                    self.assertTrue(
+                        math.isclose(
+                            result, value_we_want, rel_tol=1e-12, abs_tol=1e-12
+                        ),
+                        (effects, value, result, value_we_want),
+                    )
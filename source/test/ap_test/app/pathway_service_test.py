@@ -0,0 +1,350 @@
+import itertools
+import operator
+import random
+import unittest
+
+from adaptation_pathways.app.model.action import Action
+from adaptation_pathways.app.model.comparisons import (
+    NumberComparison,
+    SequenceComparison,
+)
+from adaptation_pathways.app.model.filter import (
+    ActionFilter,
+    GenerationConstraints,
+    MetricFilter,
+)
+from adaptation_pathways.app.model.metric import (
+    Metric,
+    MetricEffect,
+    MetricOperation,
+    MetricValueState,
+)
+from adaptation_pathways.app.model.pathways_project import PathwaysProject
+from adaptation_pathways.app.service.pathway_service import (
+    PathwayService,
+    _sequence_matches,
+)
+
+
+_operator_by_relation = {
+    NumberComparison.EQUAL: operator.eq,
+    NumberComparison.DOESNT_EQUAL: operator.ne,
+    NumberComparison.LESS_THAN: operator.lt,
+    NumberComparison.LESS_THAN_OR_EQUAL: operator.le,
+    NumberComparison.GREATER_THAN: operator.gt,
+    NumberComparison.GREATER_THAN_OR_EQUAL: operator.ge,
+}
+
+
+def create_actions(rng: random.Random, metrics: list[Metric], nr_actions: int):
+    current = Action("current", "current", "#000000", "icon", {})
+    actions = [
+        Action(
+            f"{idx}",
+            f"Action {idx}",
+            "#000000",
+            "icon",
+            {
+                metric.id: MetricEffect(
+                    rng.randint(-3, 3),
+                    rng.choice(
+                        [
+                            MetricOperation.ADD,
+                            MetricOperation.MULTIPLY,
+                            MetricOperation.MINIMUM,
+                            MetricOperation.MAXIMUM,
+                        ]
+                    ),
+                )
+                for metric in metrics
+            },
+        )
+        for idx in range(nr_actions)
+    ]
+
+    return current, actions
+
+
+def random_action_filter(rng: random.Random, actions: list[Action]) -> ActionFilter:
+    return ActionFilter(
+        rng.choice(list(SequenceComparison)),
+        rng.sample(actions, rng.randint(1, 2)),
+        rng.random() < 0.5,
+    )
+
+
+def random_metric_filter(rng: random.Random, metrics: list[Metric]) -> MetricFilter:
+    return MetricFilter(
+        rng.choice(metrics),
+        rng.choice(list(NumberComparison)),
+        rng.randint(-4, 4),
+    )
+
+
+def value_matches(value: float, metric_filter: MetricFilter) -> bool:
+    return _operator_by_relation[metric_filter.relation](value, metric_filter.value)
+
+
+class GeneratePathwaysTest(unittest.TestCase):
+    def test_no_constraints(self):
+        metric = Metric("metric", "Metric", "")
+        current, actions = create_actions(random.Random(0), [metric], 3)
+
+        pathways = list(
+            PathwayService.generate_pathways(
+                current, [current, *actions], [metric], GenerationConstraints([], [])
+            )
+        )
+
+        # The current situation, followed by all sequences of distinct actions
+        self.assertEqual(len(pathways), 1 + 3 + 3 * 2 + 3 * 2 * 1)
+        self.assertEqual(pathways[0].action_id, current.id)
+        self.assertIsNone(pathways[0].parent_id)
+
+    def test_compare_with_permutations(self):
+        rng = random.Random(1)
+        metrics = [Metric("1", "Metric 1", ""), Metric("2", "Metric 2", "")]
+
+        for _ in range(100):
+            current, actions = create_actions(rng, metrics, 4)
+            constraints = GenerationConstraints(
+                [random_action_filter(rng, actions) for _ in range(rng.randint(0, 2))],
+                [random_metric_filter(rng, metrics) for _ in range(rng.randint(0, 2))],
+                rng.choice([None, 2, 3]),
+            )
+            max_sequence_length = (
+                len(actions)
+                if constraints.max_sequence_length is None
+                else constraints.max_sequence_length
+            )
+
+            # Admissible sequences, by checking all permutations of actions
+            sequences_we_want = set()
+
+            for length in range(max_sequence_length + 1):
+                for sequence in itertools.permutations(actions, length):
+                    action_ids = [action.id for action in sequence]
+                    value_by_metric_id = {}
+
+                    for metric in metrics:
+                        value = 0.0
+
+                        for action in sequence:
+                            value = action.apply_effect(metric.id, value)
+
+                        value_by_metric_id[metric.id] = value
+
+                    if all(
+                        _sequence_matches(action_ids, action_filter)
+                        for action_filter in constraints.action_constraints
+                    ) and all(
+                        value_matches(
+                            value_by_metric_id[metric_filter.metric.id], metric_filter
+                        )
+                        for metric_filter in constraints.metric_constraints
+                    ):
+                        sequences_we_want.add(tuple(action_ids))
+
+            pathways = list(
+                PathwayService.generate_pathways(
+                    current, [current, *actions], metrics, constraints
+                )
+            )
+            action_ids_by_pathway_id: dict[int, tuple[str, ...]] = {}
+
+            for pathway in pathways:
+                # The parent of each pathway precedes it
+                if pathway.parent_id is None:
+                    action_ids_by_pathway_id[pathway.id] = ()
+                else:
+                    self.assertIn(pathway.parent_id, action_ids_by_pathway_id)
+                    action_ids_by_pathway_id[pathway.id] = action_ids_by_pathway_id[
+                        pathway.parent_id
+                    ] + (pathway.action_id,)
+
+            sequences = set(action_ids_by_pathway_id.values())
+            self.assertEqual(len(sequences), len(pathways))
+
+            # All admissible sequences are generated, and all others lead to one
+            self.assertTrue(sequences_we_want.issubset(sequences))
+
+            for sequence in sequences:
+                self.assertTrue(
+                    any(
+                        sequence_we_want[: len(sequence)] == sequence
+                        for sequence_we_want in sequences_we_want
+                    )
+                )
+
+    def test_estimated_values(self):
+        metric = Metric("metric", "Metric", "")
+        current = Action("current", "current", "#000000", "icon", {})
+        a = Action("a", "a", "#000000", "icon", {metric.id: MetricEffect(2)})
+        b = Action(
+            "b",
+            "b",
+            "#000000",
+            "icon",
+            {metric.id: MetricEffect(3, MetricOperation.MULTIPLY)},
+        )
+
+        pathways = list(
+            PathwayService.generate_pathways(
+                current,
+                [current, a, b],
+                [metric],
+                GenerationConstraints(
+                    [ActionFilter(SequenceComparison.STARTS_WITH, [a, b], True)],
+                    [],
+                ),
+            )
+        )
+
+        self.assertEqual(
+            [pathway.action_id for pathway in pathways], ["current", "a", "b"]
+        )
+        self.assertEqual(
+            [pathway.metric_data[metric.id].value for pathway in pathways],
+            [0, 2, 6],
+        )
+
+
+def create_project(rng: random.Random, nr_actions: int, nr_pathways: int):
+    project = PathwaysProject("project", "Project", "Organization", 2020, 2100)
+    metrics = [project.create_condition(), project.create_criteria()]
+    current = project.create_action("#000000", "icon", "current")
+    actions = [
+        project.create_action("#000000", "icon", f"Action {idx}")
+        for idx in range(nr_actions)
+    ]
+
+    for action in actions:
+        for metric in metrics:
+            action.metric_data[metric.id] = MetricEffect(rng.randint(-3, 3))
+
+    root_pathway = project.create_pathway(current.id)
+    project.root_pathway_id = root_pathway.id
+    pathways = [root_pathway]
+
+    while len(pathways) < nr_pathways:
+        parent = rng.choice(pathways)
+        used_action_ids = {
+            pathway.action_id for pathway in project.get_ancestors_and_self(parent)
+        }
+        unused_actions = [
+            action for action in actions if action.id not in used_action_ids
+        ]
+
+        if unused_actions:
+            pathway = project.create_pathway(rng.choice(unused_actions).id, parent.id)
+
+            if pathway not in pathways:
+                pathways.append(pathway)
+
+    return project, metrics, actions
+
+
+def filter_by_scan(
+    project: PathwaysProject,
+    action_filters: list[ActionFilter],
+    metric_filters: list[MetricFilter],
+) -> list:
+    result = []
+
+    for pathway in project.all_pathways:
+        action_ids = [
+            ancestor.action_id
+            for ancestor in reversed(list(project.get_ancestors_and_self(pathway)))
+        ][1:]
+
+        if all(
+            _sequence_matches(action_ids, action_filter)
+            for action_filter in action_filters
+        ) and all(
+            metric_filter.metric.id in pathway.metric_data
+            and value_matches(
+                pathway.metric_data[metric_filter.metric.id].value, metric_filter
+            )
+            for metric_filter in metric_filters
+        ):
+            result.append(pathway)
+
+    return result
+
+
+class FilterPathwaysTest(unittest.TestCase):
+    def test_compare_with_scan(self):
+        rng = random.Random(2)
+
+        for _ in range(10):
+            project, metrics, actions = create_project(rng, 5, 60)
+
+            for _ in range(50):
+                action_filters = [
+                    random_action_filter(rng, actions) for _ in range(rng.randint(0, 2))
+                ]
+                metric_filters = [
+                    random_metric_filter(rng, metrics) for _ in range(rng.randint(0, 2))
+                ]
+
+                self.assertEqual(
+                    PathwayService.filter_pathways(
+                        project, action_filters, metric_filters
+                    ),
+                    filter_by_scan(project, action_filters, metric_filters),
+                )
+
+    def test_negated_and_unordered(self):
+        project, _, actions = create_project(random.Random(3), 4, 40)
+        a, b = actions[:2]
+
+        for relation in SequenceComparison:
+            for actions_in_order in [False, True]:
+                action_filters = [ActionFilter(relation, [a, b], actions_in_order)]
+
+                self.assertEqual(
+                    PathwayService.filter_pathways(project, action_filters, []),
+                    filter_by_scan(project, action_filters, []),
+                )
+
+    def test_changes(self):
+        rng = random.Random(4)
+        project, metrics, actions = create_project(rng, 5, 60)
+        metric_filters = [MetricFilter(metrics[0], NumberComparison.GREATER_THAN, 2)]
+
+        self.assertEqual(
+            PathwayService.filter_pathways(project, [], metric_filters),
+            filter_by_scan(project, [], metric_filters),
+        )
+
+        # Values updated through the project are sorted again
+        root_value = project.root_pathway.metric_data[metrics[0].id]
+        root_value.value = 10
+        project.update_pathway_values(metrics[0].id)
+
+        self.assertEqual(
+            PathwayService.filter_pathways(project, [], metric_filters),
+            filter_by_scan(project, [], metric_filters),
+        )
+
+        pathway = list(project.all_pathways)[-1]
+        pathway.metric_data[metrics[0].id].state = MetricValueState.OVERRIDE
+        pathway.metric_data[metrics[0].id].value = -10
+        project.update_pathway_values(metrics[0].id)
+
+        self.assertNotIn(
+            pathway, PathwayService.filter_pathways(project, [], metric_filters)
+        )
+
+        # Pathways created or deleted are indexed again
+        project.delete_pathways([pathway.id])
+        new_pathway = project.create_pathway(actions[0].id, project.root_pathway_id)
+        action_filters = [ActionFilter(SequenceComparison.CONTAINS, [actions[0]], True)]
+
+        self.assertIn(
+            new_pathway, PathwayService.filter_pathways(project, action_filters, [])
+        )
+        self.assertEqual(
+            PathwayService.filter_pathways(project, action_filters, metric_filters),
+            filter_by_scan(project, action_filters, metric_filters),
+        )
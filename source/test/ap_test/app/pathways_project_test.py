@@ -0,0 +1,470 @@
+import math
+import random
+import unittest
+
+from adaptation_pathways.app.model.metric import (
+    MetricEffect,
+    MetricOperation,
+    MetricValueState,
+)
+from adaptation_pathways.app.model.pathway import Pathway
+from adaptation_pathways.app.model.pathways_project import PathwaysProject
+from adaptation_pathways.app.service.project_service import ProjectService
+
+
+def create_project(rng: random.Random, nr_actions: int, nr_pathways: int):
+    project = PathwaysProject("project", "Project", "Organization", 2020, 2100)
+    metrics = [project.create_condition(), project.create_criteria()]
+    current = project.create_action("#000000", "icon", "current")
+    actions = [
+        project.create_action("#000000", "icon", f"Action {idx}")
+        for idx in range(nr_actions)
+    ]
+
+    for action in actions:
+        for metric in metrics:
+            action.metric_data[metric.id] = MetricEffect(
+                rng.choice([-2, 0, 0.5, 3]), rng.choice(list(MetricOperation))
+            )
+
+    root_pathway = project.create_pathway(current.id)
+    project.root_pathway_id = root_pathway.id
+    pathways = [root_pathway]
+
+    for _ in range(nr_pathways - 1):
+        parent = rng.choice(pathways)
+        pathways.append(project.create_pathway(rng.choice(actions).id, parent.id))
+
+    return project, metrics, actions
+
+
+def values_by_scan(project: PathwaysProject, metric_id: str) -> dict[int, float]:
+    # Value of each pathway, calculated pathway by pathway, from the root down
+    values: dict[int, float] = {}
+
+    def value(pathway) -> float:
+        if pathway.id not in values:
+            metric_value = pathway.metric_data[metric_id]
+
+            if metric_value.is_estimate:
+                parent = project.get_pathway(pathway.parent_id)
+                values[pathway.id] = project.get_action(pathway.action_id).apply_effect(
+                    metric_id, 0 if parent is None else value(parent)
+                )
+            else:
+                values[pathway.id] = metric_value.value
+
+        return values[pathway.id]
+
+    for pathway in project.all_pathways:
+        value(pathway)
+
+    return values
+
+
+def all_values(project: PathwaysProject, metrics) -> list[float]:
+    return [
+        pathway.metric_data[metric.id].value
+        for pathway in project.all_pathways
+        for metric in metrics
+    ]
+
+
+class UpdatePathwayValuesTest(unittest.TestCase):
+    def assert_same_value(self, value_we_got: float, value_we_want: float):
+        if math.isnan(value_we_want):
+            self.assertTrue(math.isnan(value_we_got))
+        else:
+            self.assertEqual(value_we_got, value_we_want)
+
+    def assert_values(self, project: PathwaysProject, metrics):
+        for metric in metrics:
+            values_we_want = values_by_scan(project, metric.id)
+
+            for pathway in project.all_pathways:
+                self.assert_same_value(
+                    pathway.metric_data[metric.id].value, values_we_want[pathway.id]
+                )
+
+    def test_update_all_pathway_values(self):
+        rng = random.Random(0)
+
+        for _ in range(20):
+            project, metrics, _ = create_project(rng, 5, 80)
+
+            for pathway in rng.sample(list(project.all_pathways), 10):
+                metric_value = pathway.metric_data[rng.choice(metrics).id]
+                metric_value.state = MetricValueState.OVERRIDE
+                metric_value.value = rng.uniform(-5, 5)
+
+            project.update_all_pathway_values()
+            self.assert_values(project, metrics)
+
+    def test_non_finite_values(self):
+        project, metrics, actions = create_project(random.Random(1), 3, 20)
+        actions[0].metric_data[metrics[0].id] = MetricEffect(7, MetricOperation.REPLACE)
+        actions[1].metric_data[metrics[0].id] = MetricEffect(2, MetricOperation.ADD)
+        actions[2].metric_data[metrics[0].id] = MetricEffect(1, MetricOperation.MINIMUM)
+
+        for root_value in [math.inf, -math.inf, math.nan]:
+            project.root_pathway.metric_data[metrics[0].id].value = root_value
+            project.update_all_pathway_values()
+            self.assert_values(project, metrics[:1])
+
+    def test_non_finite_values_in_all_updates(self):
+        rng = random.Random(9)
+
+        for root_value in [math.inf, -math.inf, math.nan]:
+            project, metrics, actions = create_project(rng, 5, 1)
+            actions[0].metric_data[metrics[0].id] = MetricEffect(
+                0, MetricOperation.MULTIPLY
+            )
+            actions[1].metric_data[metrics[0].id] = MetricEffect(
+                3, MetricOperation.REPLACE
+            )
+            root_metric_value = project.root_pathway.metric_data[metrics[0].id]
+            root_metric_value.state = MetricValueState.BASE
+            root_metric_value.value = root_value
+
+            # Pathways created one by one, and in one go, are updated pathway by pathway
+            pathways = [project.root_pathway]
+
+            for _ in range(20):
+                pathways.append(
+                    project.create_pathway(
+                        rng.choice(actions).id, rng.choice(pathways).id
+                    )
+                )
+
+            project.create_pathways(
+                (rng.choice(actions).id, pathway.id) for pathway in list(pathways)
+            )
+
+            values_created = all_values(project, metrics)
+
+            for action in actions:
+                project.update_action_values(action.id)
+
+            values_updated_per_action = all_values(project, metrics)
+            project.update_all_pathway_values()
+            values_updated = all_values(project, metrics)
+
+            for value_created, value_updated_per_action, value_updated in zip(
+                values_created, values_updated_per_action, values_updated
+            ):
+                self.assert_same_value(value_created, value_updated)
+                self.assert_same_value(value_updated_per_action, value_updated)
+
+            self.assert_values(project, metrics[1:])
+
+    def test_update_action_values(self):
+        rng = random.Random(2)
+
+        for _ in range(20):
+            project, metrics, actions = create_project(rng, 5, 80)
+
+            for pathway in rng.sample(list(project.all_pathways), 10):
+                metric_value = pathway.metric_data[rng.choice(metrics).id]
+                metric_value.state = MetricValueState.OVERRIDE
+                metric_value.value = rng.uniform(-5, 5)
+
+            project.update_all_pathway_values()
+
+            # Only the effects of a single action change, for a single metric or for all
+            action = rng.choice(actions)
+            metric = rng.choice(metrics)
+            action.metric_data[metric.id] = MetricEffect(
+                rng.uniform(-3, 3), rng.choice(list(MetricOperation))
+            )
+
+            if rng.random() < 0.5:
+                project.update_action_values(action.id, [metric])
+            else:
+                project.update_action_values(action.id)
+
+            self.assert_values(project, metrics)
+
+
+class CreatePathwaysTest(unittest.TestCase):
+    def test_create_pathways(self):
+        rng = random.Random(3)
+        project, metrics, actions = create_project(rng, 5, 30)
+
+        for pathway in rng.sample(list(project.all_pathways), 5):
+            metric_value = pathway.metric_data[metrics[0].id]
+            metric_value.state = MetricValueState.OVERRIDE
+            metric_value.value = rng.uniform(-5, 5)
+
+        project.update_all_pathway_values()
+
+        # New pathways extend existing ones, and each other
+        parent_ids = list(project.pathway_ids)
+        new_pathways = project.create_pathways(
+            (rng.choice(actions).id, rng.choice(parent_ids)) for _ in range(10)
+        )
+        new_pathways += project.create_pathways(
+            (rng.choice(actions).id, new_pathway.id) for new_pathway in new_pathways
+        )
+
+        # Pathways created again replace the ones created before
+        for new_pathway in {pathway.id: pathway for pathway in new_pathways}.values():
+            self.assertIs(project.get_pathway(new_pathway.id), new_pathway)
+
+        for metric in metrics:
+            values_we_want = values_by_scan(project, metric.id)
+
+            for pathway in project.all_pathways:
+                self.assertEqual(
+                    pathway.metric_data[metric.id].value, values_we_want[pathway.id]
+                )
+
+    def test_create_pathway_again(self):
+        project, _, actions = create_project(random.Random(4), 3, 1)
+        root_pathway = project.root_pathway
+        pathway = project.create_pathway(actions[0].id, root_pathway.id)
+        nr_pathways = len(project.pathway_ids)
+
+        # Creating a pathway with the same action and parent keeps its ID
+        pathway_again = project.create_pathway(actions[0].id, root_pathway.id)
+
+        self.assertEqual(pathway_again.id, pathway.id)
+        self.assertIs(project.get_pathway(pathway.id), pathway_again)
+        self.assertEqual(len(project.pathway_ids), nr_pathways)
+
+
+class PathwayTreeTest(unittest.TestCase):
+    def assert_relations(self, project: PathwaysProject):
+        pathways = list(project.all_pathways)
+
+        for pathway in pathways:
+            self.assertEqual(
+                [child.id for child in project.get_children(pathway.id)],
+                [
+                    child.id
+                    for child in pathways
+                    if child.parent_id == pathway.id and child.id != pathway.id
+                ],
+            )
+
+            ancestor_ids = {ancestor.id for ancestor in project.get_ancestors(pathway)}
+
+            for other_pathway in pathways:
+                self.assertEqual(
+                    project.is_ancestor(other_pathway.id, pathway.id),
+                    other_pathway.id in ancestor_ids,
+                )
+
+    def test_delete_pathways(self):
+        rng = random.Random(5)
+
+        for _ in range(10):
+            project, _, _ = create_project(rng, 4, 40)
+            self.assert_relations(project)
+
+            pathway_ids = rng.sample(list(project.pathway_ids)[1:], 3)
+            ids_to_delete = {
+                pathway.id
+                for pathway in project.all_pathways
+                if any(
+                    ancestor.id in pathway_ids
+                    for ancestor in project.get_ancestors_and_self(pathway)
+                )
+            }
+            remaining_ids = [
+                pathway_id
+                for pathway_id in project.pathway_ids
+                if pathway_id not in ids_to_delete
+            ]
+            project.delete_pathways(pathway_ids)
+
+            # The pathways and all their descendants are deleted, leaving no orphans. The
+            # order of the remaining pathways is kept.
+            self.assertEqual(list(project.pathway_ids), remaining_ids)
+            self.assertEqual(set(project.pathway_ids), set(project.pathways_by_id))
+
+            for pathway in project.all_pathways:
+                self.assertTrue(
+                    pathway.parent_id is None
+                    or pathway.parent_id in project.pathways_by_id
+                )
+
+            self.assert_relations(project)
+
+    def test_save_and_load(self):
+        project, _, actions = create_project(random.Random(6), 4, 20)
+        self.assert_relations(project)
+
+        # The relations between the pathways are not saved
+        project_json = ProjectService.to_json(project)
+        self.assertNotIn("_PathwayTree", project_json)
+
+        project = ProjectService.from_json(project_json)
+        self.assertIsInstance(project.pathway_ids, dict)
+        self.assert_relations(project)
+
+        pathway_ids = list(project.pathway_ids)
+        pathway = project.create_pathway(actions[0].id, pathway_ids[-1])
+
+        self.assertNotIn(pathway.id, pathway_ids)
+        self.assertEqual(
+            [child.id for child in project.get_children(pathway_ids[-1])],
+            [pathway.id],
+        )
+        self.assert_relations(project)
+
+
+class EstimatePathwayValueTest(unittest.TestCase):
+    def assert_close(self, value_we_got: float, value_we_want: float):
+        if math.isnan(value_we_want):
+            self.assertTrue(math.isnan(value_we_got))
+        else:
+            self.assertTrue(
+                math.isclose(value_we_got, value_we_want, rel_tol=1e-9, abs_tol=1e-9),
+                (value_we_got, value_we_want),
+            )
+
+    def test_compare_with_update(self):
+        rng = random.Random(7)
+
+        for _ in range(10):
+            project, metrics, _ = create_project(rng, 5, 60)
+            project.root_pathway.metric_data[metrics[0].id].state = (
+                MetricValueState.BASE
+            )
+
+            for pathway in rng.sample(list(project.all_pathways), 10):
+                metric_value = pathway.metric_data[rng.choice(metrics).id]
+                metric_value.state = MetricValueState.OVERRIDE
+                metric_value.value = rng.uniform(-5, 5)
+
+            project.update_all_pathway_values()
+
+            for pathway in project.all_pathways:
+                for metric in metrics:
+                    self.assert_close(
+                        project.estimate_pathway_value(pathway, metric),
+                        pathway.metric_data[metric.id].value,
+                    )
+
+            # Estimates for another value of the root pathway equal the values assigned
+            # after changing the root pathway's value
+            root_value = rng.uniform(-5, 5)
+            estimates = [
+                project.estimate_pathway_value(pathway, metrics[0], root_value)
+                for pathway in project.all_pathways
+            ]
+            project.root_pathway.metric_data[metrics[0].id].value = root_value
+            project.update_pathway_values(metrics[0].id)
+
+            for pathway, estimate in zip(project.all_pathways, estimates):
+                self.assert_close(estimate, pathway.metric_data[metrics[0].id].value)
+
+    def assert_estimates(self, project: PathwaysProject, metrics):
+        for pathway in project.all_pathways:
+            for metric in metrics:
+                value = pathway.metric_data[metric.id].value
+                estimate = project.estimate_pathway_value(pathway, metric)
+
+                if math.isnan(value):
+                    self.assertTrue(math.isnan(estimate))
+                else:
+                    self.assert_close(estimate, value)
+
+    def test_non_finite_root_value(self):
+        rng = random.Random(8)
+
+        for root_value in [math.inf, -math.inf, math.nan]:
+            project, metrics, actions = create_project(rng, 4, 1)
+            metric = metrics[0]
+            actions[0].metric_data[metric.id] = MetricEffect(
+                0, MetricOperation.MULTIPLY
+            )
+            actions[1].metric_data[metric.id] = MetricEffect(3, MetricOperation.ADD)
+            root_pathway = project.root_pathway
+            root_pathway.metric_data[metric.id].state = MetricValueState.BASE
+            root_pathway.metric_data[metric.id].value = root_value
+
+            # Multiplying by zero results in zero, also for infinite and NaN values
+            pathway = project.create_pathway(actions[0].id, root_pathway.id)
+            pathway = project.create_pathway(actions[1].id, pathway.id)
+            self.assertEqual(pathway.metric_data[metric.id].value, 3)
+            self.assertEqual(project.estimate_pathway_value(pathway, metric), 3)
+            self.assertEqual(
+                project.estimate_pathway_value(pathway, metric, root_value), 3
+            )
+
+            # Estimates equal the values stored by each of the updates
+            pathways = list(project.all_pathways)
+
+            for _ in range(20):
+                pathways.append(
+                    project.create_pathway(
+                        rng.choice(actions).id, rng.choice(pathways).id
+                    )
+                )
+
+            self.assert_estimates(project, metrics)
+
+            actions[2].metric_data[metric.id] = MetricEffect(
+                0, MetricOperation.MULTIPLY
+            )
+            project.update_action_values(actions[2].id, [metric])
+            self.assert_estimates(project, metrics)
+
+            project.update_all_pathway_values()
+            self.assert_estimates(project, metrics)
+
+
+class MigrateTest(unittest.TestCase):
+    def test_legacy_pathway_ids(self):
+        project = PathwaysProject("project", "Project", "Organization", 2020, 2100)
+        current = project.create_action("#000000", "icon", "current")
+        a = project.create_action("#000000", "icon", "a")
+        b = project.create_action("#000000", "icon", "b")
+
+        # Projects saved by earlier versions identified pathways by the IDs of their
+        # actions, and were restored without a counter of pathway IDs
+        legacy_pathways = [
+            Pathway(current.id, current.id),
+            Pathway(f"{current.id}->{a.id}", a.id, current.id),
+            Pathway(f"{current.id}->{b.id}", b.id, current.id),
+            Pathway(f"{current.id}->{a.id}->{b.id}", b.id, f"{current.id}->{a.id}"),
+        ]
+        project.pathway_ids = [pathway.id for pathway in legacy_pathways]
+        project.pathways_by_id = {pathway.id: pathway for pathway in legacy_pathways}
+        project.root_pathway_id = current.id
+        del project._current_pathway_id
+        del project._tree
+        legacy_ids = list(project.pathway_ids)
+
+        project.migrate()
+
+        self.assertIsInstance(project.pathway_ids, dict)
+        self.assertEqual(list(project.pathway_ids), [1, 2, 3, 4])
+        self.assertEqual(list(project.pathways_by_id), [1, 2, 3, 4])
+        self.assertEqual(
+            [pathway.parent_id for pathway in project.all_pathways], [None, 1, 1, 2]
+        )
+        self.assertEqual(project.root_pathway_id, 1)
+        self.assertEqual(
+            [project.get_pathway_path(pathway) for pathway in project.all_pathways],
+            legacy_ids,
+        )
+        self.assertTrue(project.is_ancestor(2, 4))
+
+        # New pathways are given IDs following the migrated ones
+        pathway = project.create_pathway(a.id, 3)
+        self.assertEqual(pathway.id, 5)
+        self.assertEqual([child.id for child in project.get_children(3)], [5])
+
+        # Migrating again has no effect
+        project.migrate()
+        self.assertEqual(list(project.pathway_ids), [1, 2, 3, 4, 5])
+        self.assertEqual(project.create_pathway(a.id, 4).id, 6)
+
+        # Pathway IDs used to be stored in a list
+        project.pathway_ids = list(project.pathway_ids)
+        project.migrate()
+        self.assertEqual(project.pathway_ids, dict.fromkeys([1, 2, 3, 4, 5, 6]))
+        project.delete_pathway(2)
+        self.assertEqual(list(project.pathway_ids), [1, 3, 4, 5, 6])
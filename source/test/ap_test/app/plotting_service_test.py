@@ -0,0 +1,45 @@
+import unittest
+
+from adaptation_pathways.app.model.metric import MetricEffect
+from adaptation_pathways.app.model.pathways_project import PathwaysProject
+from adaptation_pathways.app.service.plotting_service import (
+    PlottingService,
+    _MetroMap,
+)
+
+
+class MetroMapTest(unittest.TestCase):
+    def test_rename_action(self):
+        project = PathwaysProject("project", "Project", "Organization", 2020, 2100)
+        metric = project.create_condition()
+        current = project.create_action("#ff0000", "icon", "current")
+        a = project.create_action("#00ff00", "icon", "a")
+        a.metric_data[metric.id] = MetricEffect(10)
+        root_pathway = project.create_pathway(current.id)
+        project.root_pathway_id = root_pathway.id
+        project.create_pathway(a.id, root_pathway.id)
+
+        metro_map = _MetroMap()
+        metro_map.update(project)
+        pathway_map = metro_map.updater.pathway_map
+        self.assertEqual(
+            [str(begin) for begin in pathway_map.all_action_begins()],
+            ["[current", "[a"],
+        )
+
+        # Nodes are labelled, and looked up, by the new name of a renamed action
+        a.name = "b"
+        metro_map.update(project)
+        pathway_map = metro_map.updater.pathway_map
+        self.assertEqual(
+            [str(begin) for begin in pathway_map.all_action_begins()],
+            ["[current", "[b"],
+        )
+        self.assertEqual(len(pathway_map.action_begins_by_action_name("b")), 1)
+        self.assertEqual(len(pathway_map.action_begins_by_action_name("a")), 0)
+
+        _, axes = PlottingService.draw_metro_map(project, for_export=True)
+        self.assertEqual(
+            [text.get_text() for text in axes.get_legend().get_texts()],
+            ["current", "b"],
+        )
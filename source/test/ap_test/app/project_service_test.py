@@ -0,0 +1,394 @@
+import unittest
+
+from adaptation_pathways.app.model.metric import MetricValue, MetricValueState
+from adaptation_pathways.app.service.project_service import ProjectService
+
+
+# Project saved by an earlier version, which identified pathways by strings and stored
+# the data of scenarios as a list of points per year
+legacy_project_json = """
+{
+    "py/object": "adaptation_pathways.app.model.pathways_project.PathwaysProject",
+    "id": "test-id",
+    "name": "Sea Level Rise Adaptation",
+    "organization": "Deltares",
+    "start_year": 2024,
+    "end_year": 2054,
+    "_current_id": 7,
+    "condition_ids": ["1"],
+    "conditions_by_id": {
+        "1": {
+            "py/object": "adaptation_pathways.app.model.metric.Metric",
+            "id": "1",
+            "name": "Sea Level Rise",
+            "unit_or_default": "cm"
+        }
+    },
+    "criteria_ids": ["2"],
+    "criteria_by_id": {
+        "2": {
+            "py/object": "adaptation_pathways.app.model.metric.Metric",
+            "id": "2",
+            "name": "Cost",
+            "unit_or_default": "€"
+        }
+    },
+    "scenario_ids": ["6", "7"],
+    "scenarios_by_id": {
+        "6": {
+            "py/object": "adaptation_pathways.app.model.scenario.Scenario",
+            "id": "6",
+            "name": "Best Case",
+            "yearly_data": [
+                {
+                    "py/object": "adaptation_pathways.app.model.scenario.YearDataPoint",
+                    "year": 2025,
+                    "metric_data": {
+                        "1": {
+                            "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                            "value": 0,
+                            "state": {
+                                "py/reduce": [
+                                    {
+                                        "py/type": "adaptation_pathways.app.model.metric.MetricValueState"
+                                    },
+                                    {"py/tuple": [2]}
+                                ]
+                            }
+                        }
+                    }
+                },
+                {
+                    "py/object": "adaptation_pathways.app.model.scenario.YearDataPoint",
+                    "year": 2040,
+                    "metric_data": {
+                        "1": {
+                            "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                            "value": 6.0,
+                            "state": {
+                                "py/reduce": [
+                                    {
+                                        "py/type": "adaptation_pathways.app.model.metric.MetricValueState"
+                                    },
+                                    {"py/tuple": [{"py/tuple": [1]}]}
+                                ]
+                            }
+                        }
+                    }
+                },
+                {
+                    "py/object": "adaptation_pathways.app.model.scenario.YearDataPoint",
+                    "year": 2050,
+                    "metric_data": {
+                        "1": {
+                            "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                            "value": 10,
+                            "state": {"py/id": 14}
+                        }
+                    }
+                }
+            ]
+        },
+        "7": {
+            "py/object": "adaptation_pathways.app.model.scenario.Scenario",
+            "id": "7",
+            "name": "Best Case (Copy)",
+            "yearly_data": [
+                {
+                    "py/object": "adaptation_pathways.app.model.scenario.YearDataPoint",
+                    "year": 2025,
+                    "metric_data": {
+                        "1": {
+                            "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                            "value": 0,
+                            "state": {"py/id": 14}
+                        }
+                    }
+                },
+                {
+                    "py/object": "adaptation_pathways.app.model.scenario.YearDataPoint",
+                    "year": 2040,
+                    "metric_data": {
+                        "1": {
+                            "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                            "value": 6.0,
+                            "state": {"py/id": 18}
+                        }
+                    }
+                },
+                {
+                    "py/object": "adaptation_pathways.app.model.scenario.YearDataPoint",
+                    "year": 2050,
+                    "metric_data": {
+                        "1": {
+                            "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                            "value": 10,
+                            "state": {"py/id": 14}
+                        }
+                    }
+                }
+            ]
+        }
+    },
+    "action_ids": ["3", "4", "5"],
+    "actions_by_id": {
+        "3": {
+            "py/object": "adaptation_pathways.app.model.action.Action",
+            "id": "3",
+            "name": "Current",
+            "color": "#999999",
+            "icon": "home",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricEffect",
+                    "value": 0,
+                    "operation": {
+                        "py/reduce": [
+                            {
+                                "py/type": "adaptation_pathways.app.model.metric.MetricOperation"
+                            },
+                            {"py/tuple": ["Add"]}
+                        ]
+                    }
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricEffect",
+                    "value": 0,
+                    "operation": {"py/id": 38}
+                }
+            }
+        },
+        "4": {
+            "py/object": "adaptation_pathways.app.model.action.Action",
+            "id": "4",
+            "name": "Sea Wall",
+            "color": "#5a81db",
+            "icon": "water",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricEffect",
+                    "value": 10,
+                    "operation": {"py/id": 38}
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricEffect",
+                    "value": 100000,
+                    "operation": {"py/id": 38}
+                }
+            }
+        },
+        "5": {
+            "py/object": "adaptation_pathways.app.model.action.Action",
+            "id": "5",
+            "name": "Pump",
+            "color": "#44c1e1",
+            "icon": "water_drop",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricEffect",
+                    "value": 5,
+                    "operation": {"py/id": 38}
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricEffect",
+                    "value": 2,
+                    "operation": {
+                        "py/reduce": [
+                            {
+                                "py/type": "adaptation_pathways.app.model.metric.MetricOperation"
+                            },
+                            {"py/tuple": ["Multiply"]}
+                        ]
+                    }
+                }
+            }
+        }
+    },
+    "pathway_ids": ["3", "3->5", "3->4", "3->5->4", "3->4->5"],
+    "pathways_by_id": {
+        "3": {
+            "py/object": "adaptation_pathways.app.model.pathway.Pathway",
+            "id": "3",
+            "action_id": "3",
+            "parent_id": null,
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 0,
+                    "state": {
+                        "py/reduce": [
+                            {
+                                "py/type": "adaptation_pathways.app.model.metric.MetricValueState"
+                            },
+                            {"py/tuple": [0]}
+                        ]
+                    }
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 1000,
+                    "state": {"py/id": 54}
+                }
+            }
+        },
+        "3->5": {
+            "py/object": "adaptation_pathways.app.model.pathway.Pathway",
+            "id": "3->5",
+            "action_id": "5",
+            "parent_id": "3",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 5,
+                    "state": {"py/id": 18}
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 2000,
+                    "state": {"py/id": 18}
+                }
+            }
+        },
+        "3->4": {
+            "py/object": "adaptation_pathways.app.model.pathway.Pathway",
+            "id": "3->4",
+            "action_id": "4",
+            "parent_id": "3",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 10,
+                    "state": {"py/id": 18}
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 50000,
+                    "state": {"py/id": 14}
+                }
+            }
+        },
+        "3->5->4": {
+            "py/object": "adaptation_pathways.app.model.pathway.Pathway",
+            "id": "3->5->4",
+            "action_id": "4",
+            "parent_id": "3->5",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 15,
+                    "state": {"py/id": 18}
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 102000,
+                    "state": {"py/id": 18}
+                }
+            }
+        },
+        "3->4->5": {
+            "py/object": "adaptation_pathways.app.model.pathway.Pathway",
+            "id": "3->4->5",
+            "action_id": "5",
+            "parent_id": "3->4",
+            "metric_data": {
+                "1": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 15,
+                    "state": {"py/id": 18}
+                },
+                "2": {
+                    "py/object": "adaptation_pathways.app.model.metric.MetricValue",
+                    "value": 100000,
+                    "state": {"py/id": 18}
+                }
+            }
+        }
+    },
+    "root_pathway_id": "3",
+    "root_action_id": "3",
+    "values_scenario_id": "6",
+    "graph_metric_id": "1",
+    "graph_scenario_id": "6",
+    "graph_is_time": false
+}
+"""
+
+
+class LoadProjectTest(unittest.TestCase):
+    def assert_project(self, project):
+        self.assertEqual(
+            [metric.name for metric in project.all_metrics()],
+            ["Sea Level Rise", "Cost"],
+        )
+        self.assertEqual(
+            [action.name for action in project.all_actions],
+            ["Current", "Sea Wall", "Pump"],
+        )
+
+        self.assertEqual(list(project.pathway_ids), [1, 2, 3, 4, 5])
+        self.assertEqual(project.root_pathway_id, 1)
+        self.assertEqual(
+            [project.get_pathway_path(pathway) for pathway in project.all_pathways],
+            ["3", "3->5", "3->4", "3->5->4", "3->4->5"],
+        )
+        self.assertEqual(
+            [pathway.metric_data["2"] for pathway in project.all_pathways],
+            [
+                MetricValue(1000, MetricValueState.BASE),
+                MetricValue(2000, MetricValueState.ESTIMATE),
+                MetricValue(50000, MetricValueState.OVERRIDE),
+                MetricValue(102000, MetricValueState.ESTIMATE),
+                MetricValue(100000, MetricValueState.ESTIMATE),
+            ],
+        )
+
+        self.assertEqual(
+            [scenario.name for scenario in project.all_scenarios],
+            ["Best Case", "Best Case (Copy)"],
+        )
+
+        for scenario in project.all_scenarios:
+            self.assertEqual(scenario.years.tolist(), [2025, 2040, 2050])
+            self.assertEqual(
+                [
+                    scenario.get_metric_value(year, "1")
+                    for year in scenario.years.tolist()
+                ],
+                [
+                    MetricValue(0, MetricValueState.OVERRIDE),
+                    MetricValue(6, MetricValueState.ESTIMATE),
+                    MetricValue(10, MetricValueState.OVERRIDE),
+                ],
+            )
+
+    def test_legacy_project(self):
+        project = ProjectService.from_json(legacy_project_json)
+        self.assert_project(project)
+
+        # The project can be edited as usual
+        project.update_all_pathway_values()
+        self.assertEqual(
+            [pathway.metric_data["2"].value for pathway in project.all_pathways],
+            [1000, 2000, 50000, 102000, 100000],
+        )
+
+        action = project.create_action("#000000", "icon", "Dike")
+        pathway = project.create_pathway(action.id, 3)
+        self.assertEqual(pathway.id, 6)
+        self.assertEqual(project.get_pathway_path(pathway), "3->4->8")
+        self.assertEqual(pathway.metric_data["2"].value, 50000)
+
+        scenario = project.get_scenario("7")
+        scenario.set_data(2030, "1", MetricValue(3, MetricValueState.OVERRIDE))
+        scenario.recalculate_values("1")
+
+        self.assertEqual(scenario.years.tolist(), [2025, 2030, 2040, 2050])
+        self.assertEqual(scenario.get_metric_value(2040, "1").value, 6.5)
+        self.assertEqual(project.get_scenario("6").years.tolist(), [2025, 2040, 2050])
+
+    def test_save_and_load(self):
+        project = ProjectService.from_json(
+            ProjectService.to_json(ProjectService.from_json(legacy_project_json))
+        )
+        self.assert_project(project)
+        self.assertEqual(project.create_pathway("5", 4).id, 6)
@@ -0,0 +1,351 @@
+import random
+import unittest
+
+import numpy as np
+
+from adaptation_pathways.app.model.metric import MetricValue, MetricValueState
+from adaptation_pathways.app.model.pathways_project import PathwaysProject
+from adaptation_pathways.app.model.scenario import Scenario
+
+
+def scenario_data(scenario: Scenario, metric_id: str) -> list:
+    return [
+        (point.year, scenario.get_metric_value(point.year, metric_id))
+        for point in scenario.yearly_data
+    ]
+
+
+def reference_values(
+    years: list[int], values: list[float], is_known: list[bool]
+) -> list[float]:
+    # Values with the estimates recalculated one by one, by searching the nearest known
+    # values before and after each of them
+    result = list(values)
+    known_idxs = [idx for idx in range(len(years)) if is_known[idx]]
+
+    def estimate(year: int, idx_1: int, idx_2: int) -> float:
+        slope = (values[idx_2] - values[idx_1]) / (years[idx_2] - years[idx_1])
+        return slope * (year - years[idx_1]) + values[idx_1]
+
+    for idx, year in enumerate(years):
+        if is_known[idx]:
+            continue
+
+        previous_idxs = [known_idx for known_idx in known_idxs if known_idx < idx]
+        next_idxs = [known_idx for known_idx in known_idxs if known_idx > idx]
+
+        if previous_idxs and next_idxs:
+            result[idx] = estimate(year, previous_idxs[-1], next_idxs[0])
+        elif len(next_idxs) > 1:
+            result[idx] = estimate(year, next_idxs[0], next_idxs[1])
+        elif next_idxs:
+            result[idx] = values[next_idxs[0]]
+        elif len(previous_idxs) > 1:
+            result[idx] = estimate(year, previous_idxs[-2], previous_idxs[-1])
+        elif previous_idxs:
+            result[idx] = values[previous_idxs[-1]]
+
+    return result
+
+
+class RecalculateValuesTest(unittest.TestCase):
+    def recalculate(self, data: list[tuple[int, float | None]]) -> list[float]:
+        # Values are known, or estimated in case they are None
+        scenario = Scenario("scenario", "Scenario")
+
+        for year, value in data:
+            scenario.set_data(
+                year,
+                "metric",
+                (
+                    MetricValue(0, MetricValueState.ESTIMATE)
+                    if value is None
+                    else MetricValue(value, MetricValueState.OVERRIDE)
+                ),
+            )
+
+        scenario.recalculate_values("metric")
+
+        return [scenario.get_metric_value(year, "metric").value for year, _ in data]
+
+    def test_reference_cases(self):
+        # Interpolation between the nearest known values
+        self.assertEqual(
+            self.recalculate([(2020, 0), (2030, None), (2035, None), (2040, 10)]),
+            [0, 5, 7.5, 10],
+        )
+
+        # Extrapolation from the first two and the last two known values
+        self.assertEqual(
+            self.recalculate(
+                [(2010, None), (2020, 0), (2030, 10), (2040, 30), (2050, None)]
+            ),
+            [-10, 0, 10, 30, 50],
+        )
+
+        # A single known value is copied
+        self.assertEqual(
+            self.recalculate([(2010, None), (2020, 4), (2030, None)]), [4, 4, 4]
+        )
+
+        # Without known values, estimates are left alone
+        self.assertEqual(self.recalculate([(2010, None), (2020, None)]), [0, 0])
+
+    def test_years_without_value(self):
+        scenario = Scenario("scenario", "Scenario")
+        scenario.set_data(2020, "a", MetricValue(2, MetricValueState.BASE))
+        scenario.set_data(2030, "b", MetricValue(1, MetricValueState.BASE))
+        scenario.set_data(2040, "a", MetricValue(6, MetricValueState.BASE))
+
+        scenario.recalculate_values("a")
+
+        # Years without a value are given an estimate, for the metric recalculated only
+        self.assertEqual(
+            scenario.get_metric_value(2030, "a"),
+            MetricValue(4, MetricValueState.ESTIMATE),
+        )
+        self.assertIsNone(scenario.get_metric_value(2020, "b"))
+
+    def test_compare_with_reference(self):
+        rng = random.Random(0)
+        project = PathwaysProject("project", "Project", "Organization", 2020, 2100)
+        metric_ids = [project.create_condition().id for _ in range(3)]
+
+        for _ in range(20):
+            scenario = project.create_scenario("Scenario")
+
+            for year in rng.sample(range(2000, 2100), rng.randint(0, 12)):
+                for metric_id in metric_ids:
+                    if rng.random() < 0.8:
+                        scenario.set_data(
+                            year,
+                            metric_id,
+                            MetricValue(
+                                rng.uniform(-10, 10),
+                                rng.choice(list(MetricValueState)),
+                            ),
+                        )
+
+        data_by_scenario = {
+            scenario: {
+                metric_id: [
+                    scenario.get_metric_value(year, metric_id)
+                    for year in scenario.years.tolist()
+                ]
+                for metric_id in metric_ids
+            }
+            for scenario in project.all_scenarios
+        }
+
+        # All metrics of all scenarios are recalculated in one go
+        project.update_all_scenario_values()
+
+        for scenario, data_by_metric_id in data_by_scenario.items():
+            years = scenario.years.tolist()
+
+            for metric_id, data in data_by_metric_id.items():
+                values_we_want = reference_values(
+                    years,
+                    [0.0 if value is None else value.value for value in data],
+                    [value is not None and not value.is_estimate for value in data],
+                )
+
+                for year, value, value_we_want in zip(years, data, values_we_want):
+                    metric_value = scenario.get_metric_value(year, metric_id)
+                    self.assertEqual(metric_value.value, value_we_want)
+                    self.assertEqual(
+                        metric_value.state,
+                        MetricValueState.ESTIMATE if value is None else value.state,
+                    )
+
+
+def reference_tipping_point(
+    years: list[int], values: list[float | None], metric_value: float
+) -> float:
+    # Year in which the metric reaches the value, found by scanning the years. Years
+    # without a value are None.
+    known = [(year, value) for year, value in zip(years, values) if value is not None]
+    result: float = 0
+
+    if len(years) == 1:
+        result = years[0]
+    elif known:
+        min_year, min_value = min(known, key=lambda year_value: year_value[1])
+        max_year, max_value = max(known, key=lambda year_value: year_value[1])
+
+        if metric_value <= min_value:
+            result = min_year
+        elif metric_value >= max_value:
+            result = max_year
+        else:
+            for idx in range(len(years) - 1):
+                value_1, value_2 = values[idx], values[idx + 1]
+
+                if value_1 is None or value_2 is None:
+                    continue
+
+                if value_1 <= value_2:
+                    min_year, min_value, max_year, max_value = (
+                        years[idx],
+                        value_1,
+                        years[idx + 1],
+                        value_2,
+                    )
+                else:
+                    min_year, min_value, max_year, max_value = (
+                        years[idx + 1],
+                        value_2,
+                        years[idx],
+                        value_1,
+                    )
+
+                if min_value <= metric_value <= max_value:
+                    if min_value == max_value:
+                        result = min_year
+                    else:
+                        slope = (max_year - min_year) / (max_value - min_value)
+                        result = slope * (metric_value - min_value) + min_year
+
+                    break
+
+    return result
+
+
+class EstimateTippingPointTest(unittest.TestCase):
+    def create_scenario(self, data: list[tuple[int, float | None]]) -> Scenario:
+        # Years without a value are None
+        scenario = Scenario("scenario", "Scenario")
+
+        for year, value in data:
+            if value is None:
+                scenario.get_or_add_year(year)
+            else:
+                scenario.set_data(
+                    year, "metric", MetricValue(value, MetricValueState.BASE)
+                )
+
+        return scenario
+
+    def test_reference_cases(self):
+        scenario = self.create_scenario([(2020, 0), (2030, 10), (2040, 5), (2050, 20)])
+
+        # Values are interpolated in the first segment containing them, and values
+        # beyond the smallest or largest value are mapped to its year
+        self.assertEqual(scenario.estimate_tipping_point("metric", 5), 2025)
+        self.assertEqual(scenario.estimate_tipping_point("metric", 7.5), 2025 + 2.5)
+        self.assertEqual(scenario.estimate_tipping_point("metric", 15), 2050 - 10 / 3)
+        self.assertEqual(scenario.estimate_tipping_point("metric", -1), 2020)
+        self.assertEqual(scenario.estimate_tipping_point("metric", 25), 2050)
+        self.assertEqual(
+            scenario.estimate_tipping_points("metric", np.array([0, 10, 20])).tolist(),
+            [2020, 2030, 2050],
+        )
+
+        # Values within a segment along which the value does not change map to its
+        # first year
+        scenario = self.create_scenario([(2020, 0), (2030, 5), (2040, 5), (2050, 10)])
+        self.assertEqual(scenario.estimate_tipping_point("metric", 5), 2030)
+
+        # Years without a value do not connect segments
+        scenario = self.create_scenario(
+            [(2020, 0), (2030, 4), (2040, None), (2050, 2), (2060, 10)]
+        )
+        self.assertEqual(
+            scenario.estimate_tipping_point("metric", 5), 2060 - 5 * 10 / 8
+        )
+
+        # Without enough data, the single year or zero is returned
+        self.assertEqual(
+            self.create_scenario([(2030, 4)]).estimate_tipping_point("metric", 1), 2030
+        )
+        self.assertEqual(
+            self.create_scenario([]).estimate_tipping_point("metric", 1), 0
+        )
+        self.assertEqual(
+            self.create_scenario([(2030, None), (2040, None)]).estimate_tipping_point(
+                "metric", 1
+            ),
+            0,
+        )
+
+    def test_compare_with_reference(self):
+        rng = random.Random(1)
+
+        for _ in range(200):
+            data = [
+                (year, rng.choice([None, *range(-3, 4)]))
+                for year in sorted(rng.sample(range(2000, 2100), rng.randint(0, 8)))
+            ]
+            scenario = self.create_scenario(data)
+            years = [year for year, _ in data]
+            values = [value for _, value in data]
+            metric_values = [rng.uniform(-4, 4) for _ in range(10)] + list(range(-4, 5))
+
+            self.assertEqual(
+                scenario.estimate_tipping_points(
+                    "metric", np.array(metric_values)
+                ).tolist(),
+                [
+                    reference_tipping_point(years, values, metric_value)
+                    for metric_value in metric_values
+                ],
+            )
+
+    def test_changes(self):
+        scenario = self.create_scenario([(2020, 0), (2030, 10)])
+        self.assertEqual(scenario.estimate_tipping_point("metric", 5), 2025)
+
+        # Changes to the data are taken into account
+        scenario.set_data(2040, "metric", MetricValue(20, MetricValueState.BASE))
+        scenario.set_data(2030, "metric", MetricValue(0, MetricValueState.BASE))
+        self.assertEqual(scenario.estimate_tipping_point("metric", 5), 2030 + 2.5)
+
+        scenario.remove_year(2040)
+        self.assertEqual(scenario.estimate_tipping_point("metric", 5), 2020)
+
+
+class CopyScenarioTest(unittest.TestCase):
+    def test_edit_after_copy(self):
+        project = PathwaysProject("project", "Project", "Organization", 2020, 2100)
+        metric = project.create_condition()
+        scenario = project.create_scenario("Scenario")
+        scenario.set_data(2030, metric.id, MetricValue(1, MetricValueState.OVERRIDE))
+        scenario.set_data(2050, metric.id, MetricValue(5, MetricValueState.OVERRIDE))
+        data = scenario_data(scenario, metric.id)
+
+        copy = project.copy_scenario(scenario.id)
+        copy_of_copy = project.copy_scenario(copy.id)
+
+        self.assertEqual(copy.name, "Scenario (Copy)")
+        self.assertEqual(scenario_data(copy, metric.id), data)
+        self.assertEqual(scenario_data(copy_of_copy, metric.id), data)
+
+        # Edits of a copy do not change the scenario copied, or other copies
+        copy.get_data(2030).metric_data[metric.id].value = 2
+        copy.get_or_add_year(2040)
+        copy.recalculate_values(metric.id)
+        copy.get_data(2050).year = 2060
+
+        self.assertEqual(
+            scenario_data(copy, metric.id),
+            [
+                (2030, MetricValue(2, MetricValueState.OVERRIDE)),
+                (2040, MetricValue(3.5, MetricValueState.ESTIMATE)),
+                (2060, MetricValue(5, MetricValueState.OVERRIDE)),
+            ],
+        )
+        self.assertEqual(scenario_data(scenario, metric.id), data)
+        self.assertEqual(scenario_data(copy_of_copy, metric.id), data)
+
+        # Edits of the scenario copied do not change its copies
+        scenario.remove_year(2030)
+        other_metric = project.create_condition()
+        scenario.set_data(2050, other_metric.id, MetricValue(7, MetricValueState.BASE))
+
+        self.assertEqual(
+            scenario_data(scenario, metric.id),
+            [(2050, MetricValue(5, MetricValueState.OVERRIDE))],
+        )
+        self.assertEqual(scenario_data(copy_of_copy, metric.id), data)
+        self.assertIsNone(copy_of_copy.get_metric_value(2050, other_metric.id))
+        self.assertEqual(len(copy.years), 3)
@@ -0,0 +1,109 @@
+import unittest
+
+import networkx as nx
+
+from adaptation_pathways.action import Action
+from adaptation_pathways.graph import (
+    GraphBackend,
+    SequenceGraph,
+    sequence_graph_to_pathway_map,
+)
+from adaptation_pathways.graph.compact_graph import CompactGraph
+from adaptation_pathways.graph.node import Action as ActionNode
+from adaptation_pathways.graph.node import ActionBegin, ActionEnd
+
+
+class CompactGraphTest(unittest.TestCase):
+    def test_empty(self):
+        graph = CompactGraph([], [])
+
+        self.assertEqual(graph.number_of_nodes(), 0)
+        self.assertEqual(graph.number_of_edges(), 0)
+        self.assertEqual(list(graph.edges()), [])
+
+    def test_round_trip(self):
+        nx_graph = nx.DiGraph()
+        nx_graph.add_edges_from([("a", "c"), ("a", "b"), ("b", "d"), ("c", "d")])
+        nx_graph.add_node("e")
+
+        graph = CompactGraph.from_networkx(nx_graph)
+
+        self.assertEqual(graph.number_of_nodes(), 5)
+        self.assertEqual(graph.number_of_edges(), 4)
+        self.assertEqual(graph.nodes, ["a", "c", "b", "d", "e"])
+        self.assertEqual(graph.successors("a"), ["c", "b"])
+        self.assertEqual(graph.predecessors("d"), ["c", "b"])
+        self.assertEqual(graph.successors("e"), [])
+        self.assertEqual(graph.in_degree("d"), 2)
+        self.assertEqual(graph.out_degree("d"), 0)
+        self.assertEqual(list(graph.edges()), list(nx_graph.edges()))
+        self.assertIn("e", graph)
+        self.assertNotIn("f", graph)
+
+        nx_graph_we_got = graph.to_networkx()
+
+        self.assertEqual(list(nx_graph_we_got.nodes), list(nx_graph.nodes))
+        self.assertEqual(list(nx_graph_we_got.edges), list(nx_graph.edges))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            CompactGraph(["a", "a"], [[], []])
+
+        with self.assertRaises(ValueError):
+            CompactGraph(["a", "b"], [[1]])
+
+        with self.assertRaises(ValueError):
+            CompactGraph(["a", "b"], [[2], []])
+
+
+class DirectedGraphBackendTest(unittest.TestCase):
+    def test_pathway_map(self):
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+
+        sequence_graph = SequenceGraph()
+        sequence_graph.add_sequences([(current, a), (current, b), (a, c), (b, c)])
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+
+        self.assertEqual(pathway_map.backend, GraphBackend.NETWORKX)
+
+        nodes = pathway_map.nodes()
+        edges = pathway_map.edges()
+        root_nodes = pathway_map.root_nodes
+        leaf_nodes = pathway_map.leaf_nodes()
+        paths = pathway_map.all_paths()
+        action_begins = pathway_map.all_action_begins()
+
+        pathway_map.set_backend(GraphBackend.COMPACT)
+
+        self.assertEqual(pathway_map.backend, GraphBackend.COMPACT)
+        self.assertEqual(pathway_map.nodes(), nodes)
+        self.assertEqual(pathway_map.edges(), edges)
+        self.assertEqual(pathway_map.nr_nodes(), len(nodes))
+        self.assertEqual(pathway_map.nr_edges(), len(edges))
+        self.assertEqual(pathway_map.root_nodes, root_nodes)
+        self.assertEqual(pathway_map.leaf_nodes(), leaf_nodes)
+        self.assertEqual(pathway_map.all_paths(), paths)
+        self.assertEqual(pathway_map.all_action_begins(), action_begins)
+
+        for node in nodes:
+            self.assertEqual(
+                pathway_map.to_nodes(node), list(pathway_map.graph.adj[node])
+            )
+
+        # Compact graphs are read-only
+        with self.assertRaises(RuntimeError):
+            pathway_map.add_period(ActionBegin(Action("d")), ActionEnd(Action("d")))
+
+        pathway_map.set_backend(GraphBackend.NETWORKX)
+
+        self.assertEqual(pathway_map.backend, GraphBackend.NETWORKX)
+        self.assertEqual(pathway_map.nodes(), nodes)
+        self.assertEqual(pathway_map.edges(), edges)
+        self.assertEqual(pathway_map.all_paths(), paths)
+
+        d = Action("d")
+        pathway_map.add_period(ActionBegin(d), ActionEnd(d))
+        self.assertEqual(pathway_map.nr_nodes(), len(nodes) + 2)
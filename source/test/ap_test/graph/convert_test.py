@@ -0,0 +1,129 @@
+import unittest
+
+from adaptation_pathways.action import Action
+from adaptation_pathways.graph import (
+    SequenceGraph,
+    pathway_graph_to_pathway_map,
+    sequence_graph_to_pathway_graph,
+    sequence_graph_to_pathway_map,
+)
+from adaptation_pathways.graph.node import Action as ActionNode
+
+
+def _summary(pathway_map):
+    nodes = pathway_map.nodes()
+    idx_by_node = {node: idx for idx, node in enumerate(nodes)}
+
+    return (
+        [(type(node), node.action) for node in nodes],
+        [(idx_by_node[from_], idx_by_node[to]) for from_, to in pathway_map.edges()],
+    )
+
+
+class SequenceGraphToPathwayMapTest(unittest.TestCase):
+    def assert_same_as_two_step_conversion(self, sequence_graph):
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+        pathway_map_we_want = pathway_graph_to_pathway_map(
+            sequence_graph_to_pathway_graph(sequence_graph)
+        )
+
+        self.assertEqual(_summary(pathway_map), _summary(pathway_map_we_want))
+
+    def test_empty_graph(self):
+        self.assert_same_as_two_step_conversion(SequenceGraph())
+
+    def test_single_sequence(self):
+        sequence_graph = SequenceGraph()
+        sequence_graph.add_sequence(
+            ActionNode(Action("current")), ActionNode(Action("a"))
+        )
+
+        self.assert_same_as_two_step_conversion(sequence_graph)
+
+    def test_use_case(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+        d = ActionNode(Action("d"))
+
+        sequence_graph.add_sequences(
+            [
+                (current, a),
+                (current, b),
+                (current, c),
+                (a, c),
+                (b, c),
+                (c, d),
+                (a, d),
+            ]
+        )
+
+        self.assert_same_as_two_step_conversion(sequence_graph)
+        self.assertEqual(
+            sequence_graph_to_pathway_map(sequence_graph).count_paths(),
+            sequence_graph.count_paths(),
+        )
+
+    def test_shared_prefixes(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+
+        sequence_graph.add_sequences([(current, a), (current, b), (a, c), (b, c)])
+
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+        shared_pathway_map = sequence_graph_to_pathway_map(
+            sequence_graph, shared_prefixes=True
+        )
+
+        # One period per distinct prefix: current, current → a, current → a → c,
+        # current → b, current → b → c
+        self.assertEqual(pathway_map.nr_nodes(), 2 * 6)
+        self.assertEqual(shared_pathway_map.nr_nodes(), 2 * 5)
+        self.assertEqual(len(shared_pathway_map.root_nodes), 1)
+        self.assertEqual(
+            [
+                [node.action for node in path]
+                for path in shared_pathway_map.iter_paths()
+            ],
+            [[node.action for node in path] for path in pathway_map.iter_paths()],
+        )
+        self.assertEqual(
+            _summary(shared_pathway_map),
+            _summary(
+                pathway_graph_to_pathway_map(
+                    sequence_graph_to_pathway_graph(sequence_graph),
+                    shared_prefixes=True,
+                )
+            ),
+        )
+
+    def test_shared_prefixes_empty_graph(self):
+        self.assertEqual(
+            sequence_graph_to_pathway_map(
+                SequenceGraph(), shared_prefixes=True
+            ).nr_nodes(),
+            0,
+        )
+
+    def test_workers(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        actions = [ActionNode(Action(name)) for name in "abcde"]
+
+        # Each action can follow each action preceding it in the list
+        for idx, to_action in enumerate(actions):
+            sequence_graph.add_sequence(current, to_action)
+
+            for from_action in actions[:idx]:
+                sequence_graph.add_sequence(from_action, to_action)
+
+        for workers in [2, 3]:
+            self.assertEqual(
+                list(sequence_graph.iter_paths(workers=workers)),
+                list(sequence_graph.iter_paths()),
+            )
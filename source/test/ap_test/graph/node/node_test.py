@@ -0,0 +1,54 @@
+import unittest
+
+from adaptation_pathways.action import Action
+from adaptation_pathways.graph.node import Action as ActionNode
+from adaptation_pathways.graph.node import (
+    ActionBegin,
+    ActionConversion,
+    ActionEnd,
+    ActionPeriod,
+    Node,
+)
+
+
+class NodeTest(unittest.TestCase):
+    def test_labels(self):
+        action = Action("a")
+        period_a = ActionPeriod(action)
+        period_b = ActionPeriod(Action("b"))
+
+        self.assertEqual(ActionNode(action).label, "a")
+        self.assertEqual(ActionBegin(action).label, "[a")
+        self.assertEqual(ActionEnd(action).label, "a]")
+        self.assertEqual(period_a.label, "a")
+        self.assertEqual(str(ActionConversion(period_a, period_b)), "a | b")
+
+    def test_lazy_label(self):
+        action = Action("a")
+        begin = ActionBegin(action)
+
+        # The label is formatted on first access, and reused afterwards
+        action.name = "b"
+        self.assertEqual(begin.label, "[b")
+        self.assertIs(begin.label, begin.label)
+
+    def test_slots(self):
+        action = Action("a")
+        period = ActionPeriod(action)
+
+        for node in [
+            ActionNode(action),
+            ActionBegin(action),
+            ActionEnd(action),
+            period,
+            ActionConversion(period, period),
+        ]:
+            self.assertFalse(hasattr(node, "__dict__"), type(node))
+
+    def test_abstract(self):
+        # Plain nodes cannot format a label, and cannot be created
+        with self.assertRaises(TypeError):
+            Node()  # pylint: disable=abstract-class-instantiated
+
+        with self.assertRaises(TypeError):
+            Node("a")  # pylint: disable=abstract-class-instantiated
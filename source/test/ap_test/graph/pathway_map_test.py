@@ -4,6 +4,7 @@ from adaptation_pathways.action import Action
 from adaptation_pathways.graph import (
     PathwayMap,
     SequenceGraph,
+    sample_pathway_map,
     sequence_graph_to_pathway_map,
     verify_tipping_points,
 )
@@ -125,3 +126,257 @@ class VerifyTippingPointsTest(unittest.TestCase):
         tipping_point_by_action[f] = 2040.0  # All OK now
 
         verify_tipping_points(pathway_map, tipping_point_by_action)
+
+    def test_all_violations_reported(self):
+        sequence_graph = SequenceGraph()
+        current = Action("current")
+        a = Action("a")
+        b = Action("b")
+        c = Action("c")
+
+        current_node = ActionNode(current)
+        a_node = ActionNode(a)
+        b_node = ActionNode(b)
+        c_node = ActionNode(c)
+
+        sequence_graph.add_sequences(
+            [
+                (current_node, a_node),
+                (a_node, c_node),
+                (current_node, b_node),
+                (b_node, c_node),
+            ]
+        )
+
+        for shared_prefixes in [False, True]:
+            pathway_map = sequence_graph_to_pathway_map(
+                sequence_graph, shared_prefixes=shared_prefixes
+            )
+
+            tipping_point_by_action = {
+                current: 2024.0,
+                a: 2024.0,  # <-- must be larger than current's
+                b: 2030.0,
+                c: 2030.0,  # <-- must be larger than b's
+            }
+
+            with self.assertRaises(ValueError) as context:
+                verify_tipping_points(pathway_map, tipping_point_by_action)
+
+            message = str(context.exception)
+            self.assertIn("action a (2024.0)", message)
+            self.assertIn("action c (2030.0)", message)
+            self.assertNotIn("action b (2030.0) must", message)
+
+            del tipping_point_by_action[c]
+
+            with self.assertRaises(KeyError):
+                verify_tipping_points(pathway_map, tipping_point_by_action)
+
+
+class PathsTest(unittest.TestCase):
+    def test_empty_graph(self):
+        graph = PathwayMap()
+
+        self.assertEqual(list(graph.iter_paths()), [])
+        self.assertEqual(graph.count_paths(), 0)
+
+    def test_use_case(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+        d = ActionNode(Action("d"))
+
+        sequence_graph.add_sequences(
+            [
+                (current, a),
+                (current, b),
+                (a, c),
+                (b, c),
+                (c, d),
+                (a, d),
+            ]
+        )
+
+        # current → a → c → d, current → a → d, current → b → c → d
+        self.assertEqual(sequence_graph.count_paths(), 3)
+        self.assertEqual(
+            list(sequence_graph.iter_paths()),
+            [[current, a, c, d], [current, a, d], [current, b, c, d]],
+        )
+
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+        paths = pathway_map.all_paths()
+
+        self.assertEqual(pathway_map.count_paths(), 3)
+        self.assertEqual(list(pathway_map.iter_paths()), [list(path) for path in paths])
+        self.assertEqual(
+            [[node.action.name for node in path[::2]] for path in paths],
+            [
+                ["current", "a", "c", "d"],
+                ["current", "a", "d"],
+                ["current", "b", "c", "d"],
+            ],
+        )
+
+    def test_sample_paths(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        actions = [ActionNode(Action(name)) for name in "abcde"]
+
+        # Each action can follow each action preceding it in the list. All paths end at e: 2⁴
+        # paths.
+        for idx, to_action in enumerate(actions):
+            sequence_graph.add_sequence(current, to_action)
+
+            for from_action in actions[:idx]:
+                sequence_graph.add_sequence(from_action, to_action)
+
+        paths = [list(path) for path in sequence_graph.all_paths()]
+        self.assertEqual(sequence_graph.count_paths(), 16)
+        self.assertEqual(len(paths), 16)
+
+        sample = sequence_graph.sample_paths(10, seed=5)
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(sample, sequence_graph.sample_paths(10, seed=5))
+
+        # Sampled paths are different, and ordered like all paths
+        idxs = [paths.index(path) for path in sample]
+        self.assertEqual(idxs, sorted(set(idxs)))
+
+        self.assertEqual(sequence_graph.sample_paths(0), [])
+        self.assertEqual(sequence_graph.sample_paths(16), paths)
+        self.assertEqual(sequence_graph.sample_paths(100), paths)
+
+        with self.assertRaises(ValueError):
+            sequence_graph.sample_paths(-1)
+
+        # Each path is about equally likely to be sampled
+        nr_samples_by_path_idx = [0] * len(paths)
+
+        for seed in range(1000):
+            for path in sequence_graph.sample_paths(1, seed=seed):
+                nr_samples_by_path_idx[paths.index(path)] += 1
+
+        self.assertGreater(min(nr_samples_by_path_idx), 30)
+        self.assertLess(max(nr_samples_by_path_idx), 100)
+
+        # A sampled pathway map shares the nodes of the pathways sampled
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+        sampled_pathway_map = sample_pathway_map(pathway_map, 4, seed=1)
+
+        self.assertEqual(
+            [list(path) for path in sampled_pathway_map.all_paths()],
+            pathway_map.sample_paths(4, seed=1),
+        )
+
+        for shared_prefixes in [False, True]:
+            pathway_map = sequence_graph_to_pathway_map(
+                sequence_graph, shared_prefixes=shared_prefixes
+            )
+            self.assertEqual(
+                [
+                    [node.action for node in path[::2]]
+                    for path in pathway_map.sample_paths(7, seed=2)
+                ],
+                [
+                    [node.action for node in path]
+                    for path in sequence_graph.sample_paths(7, seed=2)
+                ],
+            )
+
+
+class CacheTest(unittest.TestCase):
+    def test_invalidation(self):
+        pathway_map = PathwayMap()
+        a = Action("a")
+        b = Action("b")
+        a_begin, a_end = ActionBegin(a), ActionEnd(a)
+        b_begin, b_end = ActionBegin(b), ActionEnd(b)
+        pathway_map.add_period(a_begin, a_end)
+
+        version = pathway_map.version
+        statistics = pathway_map.cache_statistics
+
+        self.assertEqual(pathway_map.leaf_nodes(), (a_end,))
+        self.assertEqual((statistics.hits, statistics.misses), (0, 1))
+
+        # Repeated queries on an unchanged graph are answered from the cache, with the
+        # cached tuples, which cannot be changed
+        self.assertIs(pathway_map.leaf_nodes(), pathway_map.leaf_nodes())
+        self.assertEqual((statistics.hits, statistics.misses), (2, 1))
+
+        pathway_map.add_conversion(a_end, b_begin)
+        pathway_map.add_period(b_begin, b_end)
+
+        self.assertGreater(pathway_map.version, version)
+        self.assertEqual(pathway_map.leaf_nodes(), (b_end,))
+        self.assertEqual((statistics.hits, statistics.misses), (2, 2))
+
+        self.assertEqual(pathway_map.all_action_begins(), (a_begin, b_begin))
+        self.assertEqual(pathway_map.all_action_ends(), (a_end, b_end))
+        self.assertEqual(pathway_map.all_paths(), ((a_begin, a_end, b_begin, b_end),))
+        self.assertEqual(pathway_map.root_nodes, (a_begin,))
+        self.assertEqual(pathway_map.count_paths(), 1)
+
+        for query in [
+            pathway_map.all_action_begins,
+            pathway_map.all_action_ends,
+            pathway_map.all_paths,
+            lambda: pathway_map.root_nodes,
+        ]:
+            self.assertIs(query(), query())
+
+
+class IndexTest(unittest.TestCase):
+    def test_lookups(self):
+        pathway_map = PathwayMap()
+        current = Action("current")
+        a = Action("a")
+        b = Action("b")
+        a_copy = Action("a")
+
+        # current ─> a
+        # current ─> b ─> a_copy
+        pathway_map.add_pathway([current, a])
+        pathway_map.add_pathway([current, b, a_copy])
+
+        current_begins = pathway_map.action_begins_by_action(current)
+        a_begins = pathway_map.action_begins_by_action(a)
+        a_copy_begins = pathway_map.action_begins_by_action(a_copy)
+        b_begins = pathway_map.action_begins_by_action(b)
+
+        self.assertEqual(len(current_begins), 2)
+        self.assertEqual(len(a_begins), 1)
+        self.assertEqual(len(a_copy_begins), 1)
+        self.assertEqual(len(b_begins), 1)
+        self.assertEqual(len(pathway_map.action_ends_by_action(current)), 2)
+
+        self.assertEqual(
+            pathway_map.action_begins_by_action_name("a"), a_begins + a_copy_begins
+        )
+        self.assertEqual(
+            pathway_map.action_ends_by_action_name("a"),
+            pathway_map.action_ends_by_action(a)
+            + pathway_map.action_ends_by_action(a_copy),
+        )
+        self.assertEqual(pathway_map.action_begins_by_action_name("c"), [])
+        self.assertEqual(pathway_map.action_ends_by_action_name("c"), [])
+        self.assertEqual(pathway_map.actions(), [current, a, b, a_copy])
+
+        # Removing periods removes their nodes from the indexes
+        pathway_map.remove_periods(b_begins[0])
+
+        self.assertEqual(pathway_map.action_begins_by_action(b), [])
+        self.assertEqual(pathway_map.action_begins_by_action_name("a"), a_begins)
+        self.assertEqual(len(pathway_map.action_ends_by_action_name("a")), 1)
+        self.assertEqual(pathway_map.actions(), [current, a])
+        self.assertEqual(
+            pathway_map.all_action_begins(),
+            (current_begins[0], a_begins[0], current_begins[1]),
+        )
+
+        with self.assertRaises(LookupError):
+            pathway_map.action_ends_by_action(a_copy)
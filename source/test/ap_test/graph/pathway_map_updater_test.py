@@ -0,0 +1,149 @@
+import random
+import unittest
+
+from adaptation_pathways.action import Action
+from adaptation_pathways.graph import (
+    PathwayMapUpdater,
+    SequenceGraph,
+    SequenceGraphChange,
+    sequence_graph_to_pathway_map,
+)
+from adaptation_pathways.graph.node import Action as ActionNode
+
+
+def _pathways(pathway_map):
+    return [[node.action for node in path] for path in pathway_map.iter_paths()]
+
+
+class PathwayMapUpdaterTest(unittest.TestCase):
+    def assert_up_to_date(self, updater, sequence_graph):
+        pathway_map_we_want = sequence_graph_to_pathway_map(
+            sequence_graph, shared_prefixes=True
+        )
+
+        self.assertEqual(updater.pathway_map.nr_nodes(), pathway_map_we_want.nr_nodes())
+        self.assertEqual(_pathways(updater.pathway_map), _pathways(pathway_map_we_want))
+
+    def test_listener(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        changes = []
+
+        def listener(change, from_action, to_action):
+            changes.append((change, from_action, to_action))
+
+        sequence_graph.add_listener(listener)
+        sequence_graph.add_sequence(current, a)
+        sequence_graph.add_sequence(current, a)
+        sequence_graph.remove_action(a)
+        sequence_graph.remove_listener(listener)
+        sequence_graph.add_sequence(current, a)
+
+        self.assertEqual(
+            changes,
+            [
+                (SequenceGraphChange.ADD_SEQUENCE, current, a),
+                (SequenceGraphChange.REMOVE_SEQUENCE, current, a),
+            ],
+        )
+
+        with self.assertRaises(LookupError):
+            sequence_graph.remove_sequence(a, current)
+
+    def test_use_case(self):
+        sequence_graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+
+        updater = PathwayMapUpdater(sequence_graph)
+        pathway_map = updater.pathway_map
+        self.assertEqual(pathway_map.nr_nodes(), 0)
+
+        sequence_graph.add_sequences([(current, a), (current, b)])
+        self.assert_up_to_date(updater, sequence_graph)
+
+        # c follows both a and b, so two periods are added for it
+        nr_nodes = pathway_map.nr_nodes()
+        sequence_graph.add_sequences([(a, c), (b, c)])
+        self.assert_up_to_date(updater, sequence_graph)
+        self.assertEqual(pathway_map.nr_nodes(), nr_nodes + 2 * 2)
+
+        sequence_graph.remove_sequence(b, c)
+        self.assert_up_to_date(updater, sequence_graph)
+
+        sequence_graph.remove_action(c)
+        self.assert_up_to_date(updater, sequence_graph)
+
+        sequence_graph.remove_action(a)
+        self.assert_up_to_date(updater, sequence_graph)
+
+        sequence_graph.remove_action(b)
+        self.assert_up_to_date(updater, sequence_graph)
+        self.assertEqual(pathway_map.nr_nodes(), 0)
+
+        # New root action
+        sequence_graph.add_sequence(c, current)
+        self.assert_up_to_date(updater, sequence_graph)
+        self.assertIs(updater.pathway_map, pathway_map)
+
+        updater.close()
+        sequence_graph.add_sequence(current, a)
+        self.assertEqual(len(_pathways(pathway_map)), 1)
+
+    def test_remove_root_action(self):
+        sequence_graph = SequenceGraph()
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+        d = ActionNode(Action("d"))
+        sequence_graph.add_sequences([(a, b), (b, c), (b, d)])
+        updater = PathwayMapUpdater(sequence_graph)
+
+        # The action following the root action becomes the new root action
+        sequence_graph.remove_action(a)
+        self.assert_up_to_date(updater, sequence_graph)
+        self.assertEqual(updater.pathway_map.nr_nodes(), 6)
+
+        sequence_graph.remove_action(b)
+        self.assertEqual(updater.pathway_map.nr_nodes(), 0)
+
+        # A root action without sequences, followed by an action without sequences
+        sequence_graph = SequenceGraph()
+        sequence_graph.add_sequence(a, b)
+        updater = PathwayMapUpdater(sequence_graph)
+        sequence_graph.remove_action(a)
+        self.assert_up_to_date(updater, sequence_graph)
+
+        sequence_graph.add_sequence(b, c)
+        self.assert_up_to_date(updater, sequence_graph)
+        self.assertEqual(updater.pathway_map.nr_nodes(), 4)
+
+    def test_random_edits(self):
+        random_ = random.Random(5)
+        actions = [ActionNode(Action(f"{idx}")) for idx in range(8)]
+        sequence_graph = SequenceGraph()
+        sequence_graph.add_sequence(actions[0], actions[1])
+        updater = PathwayMapUpdater(sequence_graph)
+
+        for _ in range(100):
+            # Only add sequences from lower to higher indices, to prevent cycles. Keep all
+            # actions reachable from the root action, by never removing the last sequence
+            # ending at an action.
+            from_idx = random_.randrange(0, len(actions) - 1)
+            to_idx = random_.randrange(from_idx + 1, len(actions))
+            from_action, to_action = actions[from_idx], actions[to_idx]
+
+            if sequence_graph.has_edge(from_action, to_action):
+                if sequence_graph.nr_from_actions(to_action) > 1:
+                    sequence_graph.remove_sequence(from_action, to_action)
+            elif from_action in sequence_graph.graph and (
+                from_idx == 0 or sequence_graph.nr_from_actions(from_action) > 0
+            ):
+                sequence_graph.add_sequence(from_action, to_action)
+
+            self.assert_up_to_date(updater, sequence_graph)
+
+        self.assertGreater(updater.pathway_map.count_paths(), 1)
@@ -23,3 +23,20 @@ class SequenceGraphTest(unittest.TestCase):
         self.assertEqual(graph.root_node, current)
         self.assertEqual(graph.nr_from_actions(current), 0)
         self.assertEqual(graph.nr_to_actions(current), 0)
+
+    def test_from_actions(self):
+        graph = SequenceGraph()
+        current = ActionNode(Action("current"))
+        a = ActionNode(Action("a"))
+        b = ActionNode(Action("b"))
+        c = ActionNode(Action("c"))
+
+        graph.add_sequences([(current, a), (current, b), (a, c), (b, c)])
+
+        self.assertEqual(graph.from_actions(current), [])
+        self.assertEqual(graph.from_actions(a), [current])
+        self.assertEqual(graph.from_actions(c), [a, b])
+        self.assertEqual(graph.nr_from_actions(c), 2)
+        self.assertEqual(
+            graph.predecessors_of([c, current, b]), [[a, b], [], [current]]
+        )
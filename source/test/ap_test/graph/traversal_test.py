@@ -0,0 +1,55 @@
+import sys
+import unittest
+
+from adaptation_pathways.action import Action
+from adaptation_pathways.graph import (
+    SequenceGraph,
+    sequence_graph_to_pathway_graph,
+    sequence_graph_to_pathway_map,
+)
+from adaptation_pathways.graph.node import Action as ActionNode
+from adaptation_pathways.graph.traversal import depth_first
+
+
+class DepthFirstTest(unittest.TestCase):
+    def test_order(self):
+        to_nodes_by_node = {"a": ["b", "c"], "b": ["d"], "c": [], "d": []}
+        visited = []
+        left = []
+
+        def visit(node):
+            visited.append(node)
+            return to_nodes_by_node[node]
+
+        depth_first("a", visit, left.append)
+
+        self.assertEqual(visited, ["a", "b", "d", "c"])
+        self.assertEqual(left, ["d", "b", "c", "a"])
+
+    def test_interleaved_generator(self):
+        events = []
+
+        def visit(node):
+            events.append(f"visit {node}")
+
+            for to_node in range(node + 1, 3) if node < 2 else []:
+                events.append(f"yield {to_node}")
+                yield to_node
+
+        depth_first(1, visit)
+
+        self.assertEqual(events, ["visit 1", "yield 2", "visit 2"])
+
+    def test_deep_sequence(self):
+        nr_actions = 2 * sys.getrecursionlimit()
+        actions = [ActionNode(Action(f"{idx}")) for idx in range(nr_actions)]
+
+        sequence_graph = SequenceGraph()
+        sequence_graph.add_sequences(zip(actions[:-1], actions[1:]))
+        pathway_graph = sequence_graph_to_pathway_graph(sequence_graph)
+        pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+
+        self.assertEqual(pathway_graph.nr_nodes(), 2 * nr_actions - 1)
+
+        self.assertEqual(pathway_map.nr_nodes(), 2 * nr_actions)
+        self.assertEqual(pathway_map.count_paths(), 1)
@@ -0,0 +1,174 @@
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import numpy.testing as npt
+
+from adaptation_pathways.graph import (
+    PathwayMap,
+    SequenceGraph,
+    sequence_graph_to_pathway_map,
+)
+from adaptation_pathways.graph.node import ActionBegin
+from adaptation_pathways.io.cache import cache_key, read_pathway_map, write_pathway_map
+from adaptation_pathways.io.text import read_actions, read_sequences
+from adaptation_pathways.plot.pathway_map import classic_pathway_map_layout
+
+
+def read_dataset():
+    actions, _ = read_actions(
+        StringIO(
+            """
+            current
+            a
+            b
+            c
+            """
+        )
+    )
+    sequences, tipping_point_by_action = read_sequences(
+        StringIO(
+            """
+            current     current     2030
+            current     a[1]        2100
+            current     b[1]        2040
+            b[1]        a[2]        2100
+            b[1]        c[1]        2050
+            c[1]        a[3]        2100
+            """
+        ),
+        actions,
+    )
+
+    return sequences, tipping_point_by_action
+
+
+class CacheTest(unittest.TestCase):
+    def test_key(self):
+        sequences, tipping_point_by_action = read_dataset()
+        key = cache_key(sequences, tipping_point_by_action, spread=0.1)
+
+        self.assertEqual(key, cache_key(*read_dataset(), spread=0.1))
+        self.assertNotEqual(key, cache_key(*read_dataset(), spread=0.2))
+        self.assertNotEqual(key, cache_key(*read_dataset()))
+
+        tipping_point_by_action[sequences[-1][1]] += 1
+        self.assertNotEqual(
+            key, cache_key(sequences, tipping_point_by_action, spread=0.1)
+        )
+
+    def test_round_trip(self):
+        sequences, tipping_point_by_action = read_dataset()
+
+        for shared_prefixes in [False, True]:
+            pathway_map = sequence_graph_to_pathway_map(
+                SequenceGraph(sequences), shared_prefixes=shared_prefixes
+            )
+            position_by_node, y_coordinate_by_action_name = classic_pathway_map_layout(
+                pathway_map,
+                overlapping_lines_spread=0.05,
+                tipping_point_by_action=tipping_point_by_action,
+            )
+            key = cache_key(
+                sequences, tipping_point_by_action, shared_prefixes=shared_prefixes
+            )
+
+            with tempfile.TemporaryDirectory() as directory:
+                self.assertIsNone(read_pathway_map(directory, key, sequences))
+
+                write_pathway_map(
+                    directory,
+                    key,
+                    sequences,
+                    pathway_map,
+                    position_by_node=position_by_node,
+                    y_coordinate_by_action_name=y_coordinate_by_action_name,
+                )
+
+                # The nodes read refer to the actions of a dataset read again
+                sequences_read, _ = read_dataset()
+                cached = read_pathway_map(directory, key, sequences_read)
+
+            assert cached is not None
+            pathway_map_read, position_by_node_read, y_coordinates_read = cached
+            assert position_by_node_read is not None
+
+            # Nodes are added in the same order, and positions match node by node
+            self.assertEqual(
+                [repr(node) for node in pathway_map_read.nodes()],
+                [repr(node) for node in pathway_map.nodes()],
+            )
+            self.assertEqual(
+                [len(path) for path in pathway_map_read.all_paths()],
+                [len(path) for path in pathway_map.all_paths()],
+            )
+            self.assertEqual(y_coordinates_read, y_coordinate_by_action_name)
+
+            action_read_by_action = dict(
+                zip(
+                    [action for sequence in sequences for action in sequence],
+                    [action for sequence in sequences_read for action in sequence],
+                )
+            )
+
+            for node_read, node in zip(pathway_map_read.nodes(), pathway_map.nodes()):
+                self.assertIs(node_read.action, action_read_by_action[node.action])
+                npt.assert_array_equal(
+                    position_by_node_read[node_read], position_by_node[node]
+                )
+
+    def test_map_without_layout(self):
+        sequences, tipping_point_by_action = read_dataset()
+        pathway_map = sequence_graph_to_pathway_map(SequenceGraph(sequences))
+        key = cache_key(sequences, tipping_point_by_action)
+
+        with tempfile.TemporaryDirectory() as directory:
+            write_pathway_map(directory, key, sequences, pathway_map)
+            cached = read_pathway_map(directory, key, sequences)
+
+        assert cached is not None
+        self.assertEqual(cached[0].nr_nodes(), pathway_map.nr_nodes())
+        self.assertIsNone(cached[1])
+        self.assertIsNone(cached[2])
+
+    def test_node_without_edges(self):
+        sequences, tipping_point_by_action = read_dataset()
+        key = cache_key(sequences, tipping_point_by_action)
+        current = sequences[0][0]
+        pathway_map = PathwayMap()
+        pathway_map.add_node(ActionBegin(current))
+
+        with tempfile.TemporaryDirectory() as directory:
+            write_pathway_map(directory, key, sequences, pathway_map)
+            cached = read_pathway_map(directory, key, sequences)
+
+        assert cached is not None
+        self.assertEqual(
+            [repr(node) for node in cached[0].nodes()],
+            [repr(node) for node in pathway_map.nodes()],
+        )
+        self.assertEqual(cached[0].nr_edges(), 0)
+
+    def test_failed_write(self):
+        sequences, tipping_point_by_action = read_dataset()
+        pathway_map = sequence_graph_to_pathway_map(SequenceGraph(sequences))
+        key = cache_key(sequences, tipping_point_by_action)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch("numpy.savez_compressed", side_effect=OSError("Disk full")):
+                with self.assertRaises(OSError):
+                    write_pathway_map(directory, key, sequences, pathway_map)
+
+            # No partially written files are left behind
+            self.assertEqual(list(Path(directory).iterdir()), [])
+
+    def test_corrupt_file(self):
+        sequences, tipping_point_by_action = read_dataset()
+        key = cache_key(sequences, tipping_point_by_action)
+
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory).joinpath(f"{key}.npz").write_bytes(b"garbage")
+
+            self.assertIsNone(read_pathway_map(directory, key, sequences))
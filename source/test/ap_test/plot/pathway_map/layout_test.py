@@ -25,7 +25,7 @@ from adaptation_pathways.plot.util import action_level_by_first_occurrence
 
 
 def configure_pathway_map(
-    actions_str: str, sequences_str: str
+    actions_str: str, sequences_str: str, *, shared_prefixes: bool = False
 ) -> tuple[PathwayMap, dict[str, typing.Any]]:
     actions, _ = read_actions(StringIO(actions_str))
     sequences, tipping_point_by_action = read_sequences(
@@ -33,7 +33,9 @@ def configure_pathway_map(
     )
 
     sequence_graph = SequenceGraph(sequences)
-    pathway_map = sequence_graph_to_pathway_map(sequence_graph)
+    pathway_map = sequence_graph_to_pathway_map(
+        sequence_graph, shared_prefixes=shared_prefixes
+    )
 
     arguments = {
         "level_by_action_name": action_level_by_first_occurrence(pathway_map),
@@ -1686,3 +1688,72 @@ class PathwayMapClassicLayoutTest(PathwayLayoutTestBase):
         }
 
         self.assert_equal_y_coordinates(positions, y_coordinates_we_want)
+
+
+class PathwayMapClassicLayoutSharedPrefixesTest(PathwayLayoutTestBase):
+    def test_use_case_02(self):
+        actions = """
+            current #ff4c566a
+            a #ffbf616a
+            b #ffd08770
+            c #ffebcb8b
+            d #ffa3be8c
+            """
+        sequences = """
+            current     current     2030
+
+            current     a[1]        2100
+
+            current     b[1]        2040
+            b[1]        a[2]        2100
+            b[1]        c[2]        2050
+            c[2]        b[2]        2070
+            b[2]        a[3]        2100
+            c[2]        a[4]        2100
+            c[2]        d[3]        2100
+            b[1]        d[2]        2100
+
+            current     c[1]        2050
+            c[1]        b[3]        2070
+            b[3]        a[5]        2100
+            c[1]        a[6]        2100
+            c[1]        d[4]        2100
+
+            current     d[1]        2100
+            """
+
+        for overlapping_lines_spread in [(0.0, 0.0), (0.05, 0.05)]:
+            pathway_map, arguments = configure_pathway_map(actions, sequences)
+            shared_pathway_map, shared_arguments = configure_pathway_map(
+                actions, sequences, shared_prefixes=True
+            )
+            self.assertEqual(shared_pathway_map.nr_nodes(), 32)
+            self.assertEqual(pathway_map.nr_nodes(), 66)
+
+            positions, y_coordinate_by_action_name = classic_layout(
+                pathway_map,
+                overlapping_lines_spread=overlapping_lines_spread,
+                **arguments,
+            )
+            shared_positions, shared_y_coordinate_by_action_name = classic_layout(
+                shared_pathway_map,
+                overlapping_lines_spread=overlapping_lines_spread,
+                **shared_arguments,
+            )
+
+            self.assertEqual(
+                shared_y_coordinate_by_action_name, y_coordinate_by_action_name
+            )
+
+            # Each node in the shared pathway map must be positioned at the same location as
+            # all its copies in the pathway map
+            paths = list(pathway_map.iter_paths())
+            shared_paths = list(shared_pathway_map.iter_paths())
+            self.assertEqual(len(shared_paths), len(paths))
+
+            for path, shared_path in zip(paths, shared_paths):
+                self.assert_equal_positions(
+                    shared_positions,
+                    shared_path,
+                    [(node.label, positions[node]) for node in path],
+                )